@@ -1,10 +1,116 @@
-import os
-from dotenv import load_dotenv
-from pathlib import Path
-
-env_path = Path(__file__).resolve().parent.parent.parent / '.env'
-load_dotenv(dotenv_path=env_path)
-
-SECRET_KEY = os.getenv("SECRET_KEY", "a_super_secret_key_for_dev_only_change_it_in_production")
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
\ No newline at end of file
+import os
+from dotenv import load_dotenv
+from pathlib import Path
+
+env_path = Path(__file__).resolve().parent.parent.parent / '.env'
+load_dotenv(dotenv_path=env_path)
+
+SECRET_KEY = os.getenv("SECRET_KEY", "a_super_secret_key_for_dev_only_change_it_in_production")
+ALGORITHM = "HS256"
+ACCESS_TOKEN_EXPIRE_MINUTES = 30
+
+# Custo do bcrypt (log2 das iterações). Hashes com outro custo são refeitos no próximo login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Executor dedicado ao hash/verificação de senhas: threads e limite de operações pendentes
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+# Cache em processo do usuário autenticado (tokens decodificados e registros de usuário)
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "30"))
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+
+# Cache de complexidade do WordInfoService (número máximo de entradas no LRU)
+COMPLEXITY_CACHE_SIZE = int(os.getenv("COMPLEXITY_CACHE_SIZE", "1000"))
+
+# Intervalo (s) entre verificações do mtime do modelo de dificuldade para recarga automática
+MODEL_RELOAD_CHECK_SECONDS = float(os.getenv("MODEL_RELOAD_CHECK_SECONDS", "5"))
+
+# Treinamento em streaming do modelo de dificuldade (linhas de UserProgress por lote e passadas de SGD)
+TRAINING_CHUNK_SIZE = int(os.getenv("TRAINING_CHUNK_SIZE", "1000"))
+TRAINING_EPOCHS = int(os.getenv("TRAINING_EPOCHS", "5"))
+# Job ativo sem notícia do worker (heartbeat) há mais que isto (s) é dado como abandonado
+TRAINING_JOB_STALE_SECONDS = float(os.getenv("TRAINING_JOB_STALE_SECONDS", "600"))
+
+# Coeficientes aprendidos do score composto de complexidade (gerados por
+# `python -m backend.app.services.complexity_calibration`); sem o arquivo, valem os pesos padrão
+COMPLEXITY_COEFFICIENTS_PATH = os.getenv(
+    "COMPLEXITY_COEFFICIENTS_PATH",
+    str(Path(__file__).resolve().parent.parent.parent / 'complexity_coefficients.json'),
+)
+
+# Cache em memória do estado cognitivo: número de usuários e intervalo (s) de sincronização
+# com o contador de alterações no banco (invalidação entre workers)
+COGNITIVE_STATE_CACHE_SIZE = int(os.getenv("COGNITIVE_STATE_CACHE_SIZE", "5000"))
+COGNITIVE_STATE_SYNC_SECONDS = float(os.getenv("COGNITIVE_STATE_SYNC_SECONDS", "1.0"))
+# Tentativas de atualizar o estado cognitivo quando outra requisição o alterou (conflito de versão)
+COGNITIVE_STATE_UPDATE_ATTEMPTS = int(os.getenv("COGNITIVE_STATE_UPDATE_ATTEMPTS", "3"))
+
+# Seleção do próximo exercício: tamanho do top-k mantido (alternativas para pré-carregamento)
+# e estratégia de exploração ('greedy', 'epsilon', 'softmax' ou 'thompson')
+SELECTION_TOP_K = int(os.getenv("SELECTION_TOP_K", "5"))
+SELECTION_STRATEGY = os.getenv("SELECTION_STRATEGY", "epsilon")
+
+# Pré-carregamento: quantas alternativas acompanham /next_exercise/ e limite de palavras por pedido de aquecimento
+PREFETCH_HINTS_COUNT = int(os.getenv("PREFETCH_HINTS_COUNT", "1"))
+PREFETCH_WARM_MAX_WORDS = int(os.getenv("PREFETCH_WARM_MAX_WORDS", "10"))
+
+# GET condicional em /api/v1/word_info/{word}: por quanto tempo o ETag conhecido de uma palavra
+# responde 304 sem refazer o enriquecimento
+WORD_INFO_ETAG_TTL_SECONDS = float(os.getenv("WORD_INFO_ETAG_TTL_SECONDS", "300"))
+
+# URLs base das APIs externas (injetáveis: ex. servidores locais de backend/benchmarks/fake_upstreams.py)
+DICTIONARY_API_BASE_URL = os.getenv("DICTIONARY_API_BASE_URL", "https://api.dicionario-aberto.net")
+PIXABAY_API_URL = os.getenv("PIXABAY_API_URL", "https://pixabay.com/api/")
+TTS_BASE_URL = os.getenv("TTS_BASE_URL") or None # None = endpoint padrão do Google Translate usado pelo gTTS
+
+# Timeouts (s) das etapas do enriquecimento de palavras; em timeout a resposta sai sem o item (resultado parcial)
+DEFINITION_STAGE_TIMEOUT_SECONDS = float(os.getenv("DEFINITION_STAGE_TIMEOUT_SECONDS", "8"))
+IMAGE_STAGE_TIMEOUT_SECONDS = float(os.getenv("IMAGE_STAGE_TIMEOUT_SECONDS", "8"))
+AUDIO_STAGE_TIMEOUT_SECONDS = float(os.getenv("AUDIO_STAGE_TIMEOUT_SECONDS", "15"))
+
+# Resiliência das chamadas ao dicionário e ao Pixabay: timeout por tentativa e prazo total (s),
+# novas tentativas com jitter para falhas transitórias e disjuntor por backend
+DICTIONARY_TIMEOUT_SECONDS = float(os.getenv("DICTIONARY_TIMEOUT_SECONDS", "3"))
+DICTIONARY_DEADLINE_SECONDS = float(os.getenv("DICTIONARY_DEADLINE_SECONDS", "6"))
+IMAGE_TIMEOUT_SECONDS = float(os.getenv("IMAGE_TIMEOUT_SECONDS", "3"))
+IMAGE_DEADLINE_SECONDS = float(os.getenv("IMAGE_DEADLINE_SECONDS", "6"))
+UPSTREAM_RETRY_ATTEMPTS = int(os.getenv("UPSTREAM_RETRY_ATTEMPTS", "3"))
+UPSTREAM_RETRY_BASE_DELAY_MS = float(os.getenv("UPSTREAM_RETRY_BASE_DELAY_MS", "100"))
+UPSTREAM_RETRY_MAX_DELAY_MS = float(os.getenv("UPSTREAM_RETRY_MAX_DELAY_MS", "1000"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+# Últimos resultados bons por backend, servidos enquanto o circuito está aberto
+UPSTREAM_FALLBACK_CACHE_SIZE = int(os.getenv("UPSTREAM_FALLBACK_CACHE_SIZE", "1000"))
+# Definições e imagens encontradas, reaproveitadas por palavra até expirar (o aquecimento as preenche).
+# O Pixabay pede que as respostas fiquem em cache por 24 h.
+UPSTREAM_RESULT_CACHE_SIZE = int(os.getenv("UPSTREAM_RESULT_CACHE_SIZE", "2000"))
+UPSTREAM_RESULT_CACHE_TTL_SECONDS = float(os.getenv("UPSTREAM_RESULT_CACHE_TTL_SECONDS", "86400"))
+
+# Limite de taxa do Pixabay, compartilhado por chave de API: chamadas por minuto, rajada máxima,
+# fichas reservadas às requisições interativas (o aquecimento não as usa) e orçamento diário (0 = sem limite)
+PIXABAY_RATE_PER_MINUTE = float(os.getenv("PIXABAY_RATE_PER_MINUTE", "100"))
+PIXABAY_BURST = int(os.getenv("PIXABAY_BURST", "10"))
+PIXABAY_INTERACTIVE_RESERVE = int(os.getenv("PIXABAY_INTERACTIVE_RESERVE", "2"))
+PIXABAY_DAILY_BUDGET = int(os.getenv("PIXABAY_DAILY_BUDGET", "0"))
+
+# Espelho local das imagens do Pixabay em static/images (todas as imagens da busca, com miniaturas;
+# WebP e miniaturas redimensionadas exigem o Pillow, opcional)
+IMAGE_MIRROR_ENABLED = os.getenv("IMAGE_MIRROR_ENABLED", "false").lower() in ("1", "true", "yes")
+IMAGE_MIRROR_MAX_BYTES = int(os.getenv("IMAGE_MIRROR_MAX_BYTES", str(5 * 1024 * 1024)))
+IMAGE_MIRROR_THUMBNAIL_SIZE = int(os.getenv("IMAGE_MIRROR_THUMBNAIL_SIZE", "200"))
+
+# Banco de dados (ex: "sqlite:////tmp/carga.db" para testes de carga isolados)
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./app_data.db")
+
+# Métricas no formato do Prometheus em /metrics (latência por rota, backends externos, caches, consultas ao banco)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Perfilamento amostrado de requisições (opt-in): fração perfilada (0 desativa), intervalo de
+# amostragem das pilhas e relatórios mantidos por rota (consultados em /api/v1/admin/profiles)
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_INTERVAL_MS = float(os.getenv("PROFILING_INTERVAL_MS", "5"))
+PROFILING_MAX_REPORTS_PER_ROUTE = int(os.getenv("PROFILING_MAX_REPORTS_PER_ROUTE", "20"))
+
+# Spans das etapas do enriquecimento de palavras: 'none', 'console' (log) ou 'file' (JSON lines em TRACING_FILE)
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "none")
+TRACING_FILE = os.getenv("TRACING_FILE", str(Path(__file__).resolve().parent.parent.parent / 'traces.jsonl'))
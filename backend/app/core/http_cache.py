@@ -0,0 +1,97 @@
+# backend/app/core/http_cache.py
+"""
+Cache HTTP: ETag/304 (GET condicional), parciais HTML pré-renderizadas em memória e
+arquivos estáticos endereçados por conteúdo servidos como imutáveis.
+"""
+import hashlib
+import os
+import threading
+from typing import Dict, Optional, Pattern, Tuple
+
+from fastapi import Request, Response
+from fastapi.staticfiles import StaticFiles
+from fastapi.templating import Jinja2Templates
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, HTMLResponse
+from starlette.staticfiles import NotModifiedResponse
+
+# O cliente guarda a resposta, mas revalida (If-None-Match) antes de usá-la
+REVALIDATE_CACHE_CONTROL = "no-cache"
+# Conteúdo que nunca muda sob a mesma URL (o nome do arquivo deriva do conteúdo)
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def compute_etag(content: bytes) -> str:
+    """ETag forte (entre aspas) derivado do conteúdo."""
+    return '"' + hashlib.blake2b(content, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True se o If-None-Match da requisição contém o ETag (comparação fraca, como no RFC 9110)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    bare_etag = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == bare_etag:
+            return True
+    return False
+
+
+def not_modified_response(etag: str, cache_control: str = REVALIDATE_CACHE_CONTROL) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+class PrecompiledTemplates:
+    """
+    Renderiza cada template estático (sem variáveis além de `request`) uma única vez por
+    processo e serve o HTML da memória, com ETag e 304. Alterações no template exigem
+    reiniciar o servidor.
+    """
+
+    def __init__(self, templates: Jinja2Templates, cache_control: str = REVALIDATE_CACHE_CONTROL):
+        self.templates = templates
+        self.cache_control = cache_control
+        self._rendered: Dict[str, Tuple[bytes, str]] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, request: Request, name: str) -> Tuple[bytes, str]:
+        rendered = self._rendered.get(name)
+        if rendered is None:
+            with self._lock:
+                rendered = self._rendered.get(name)
+                if rendered is None:
+                    body = self.templates.get_template(name).render({"request": request}).encode("utf-8")
+                    rendered = (body, compute_etag(body))
+                    self._rendered[name] = rendered
+        return rendered
+
+    def response(self, request: Request, name: str) -> Response:
+        body, etag = self._get(request, name)
+        if etag_matches(request, etag):
+            return not_modified_response(etag, self.cache_control)
+        return HTMLResponse(content=body, headers={"ETag": etag, "Cache-Control": self.cache_control})
+
+
+class ContentAddressedStaticFiles(StaticFiles):
+    """
+    StaticFiles que marca como imutáveis os arquivos cujo nome casa com `immutable_pattern`
+    (nomes derivados do conteúdo); os demais mantêm o comportamento padrão (ETag/Last-Modified).
+    """
+
+    def __init__(self, *args, immutable_pattern: Optional[Pattern[str]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.immutable_pattern = immutable_pattern
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200) -> Response:
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        if self.immutable_pattern is not None and self.immutable_pattern.search(os.path.basename(full_path)):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
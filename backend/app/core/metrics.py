@@ -0,0 +1,360 @@
+# backend/app/core/metrics.py
+"""
+Métricas no formato de exposição de texto do Prometheus (servidas em /metrics).
+
+Implementação mínima e thread-safe de contadores, histogramas e gauges calculados na
+coleta, sem dependências externas. Inclui:
+- latência por rota (histograma) e número de consultas ao banco por requisição,
+  medidos por `MetricsMiddleware` + eventos do motor do SQLAlchemy;
+- latência, resultado, erros e novas tentativas por backend externo (dicionário, imagens,
+  TTS), estado dos disjuntores e limite de taxa/orçamento diário das APIs com chave;
+- tamanho, hits, misses e taxa de acerto dos caches registrados com `register_cache`.
+"""
+import contextvars
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _check_labels(self, labels: Sequence[str]) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name}: esperados os rótulos {self.labelnames}, recebidos {tuple(labels)}.")
+        return tuple(str(label) for label in labels)
+
+    def samples(self) -> Iterable[Tuple[str, Sequence[str], Sequence[str], float]]:
+        """(sufixo do nome, nomes dos rótulos, valores dos rótulos, valor)."""
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, names, values, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(names, values)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        key = self._check_labels(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(tuple(str(label) for label in labels), 0.0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for values, value in items:
+            yield "", self.labelnames, values, value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Por conjunto de rótulos: [contagens por bucket (não cumulativas)..., +Inf], soma
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        key = self._check_labels(labels)
+        index = len(self.buckets)
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = position
+                break
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            entry = self._values.get(tuple(str(label) for label in labels))
+            return sum(entry[0]) if entry else 0
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._values.items())
+        bucket_names = self.labelnames + ("le",)
+        for values, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield "_bucket", bucket_names, values + (_format_value(bound),), cumulative
+            yield "_sum", self.labelnames, values, total
+            yield "_count", self.labelnames, values, cumulative
+
+
+class CallbackMetric(_Metric):
+    """Métrica calculada na coleta (gauge ou contador mantido por outro objeto): `collect()` devolve pares (valores dos rótulos, valor)."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], collect: Callable[[], Iterable[Tuple[LabelValues, float]]], kind: str = "gauge"):
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+        self._collect = collect
+
+    def samples(self):
+        for values, value in self._collect():
+            yield "", self.labelnames, tuple(str(v) for v in values), value
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Métrica já registrada: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(self, name: str, documentation: str, labelnames: Sequence[str], collect: Callable[[], Iterable[Tuple[LabelValues, float]]], kind: str = "gauge") -> CallbackMetric:
+        return self.register(CallbackMetric(name, documentation, labelnames, collect, kind))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Registro compartilhado pelo processo
+registry = MetricsRegistry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "Latência das requisições HTTP por rota.", ("method", "route", "status"))
+db_queries_per_request = registry.histogram(
+    "http_request_db_queries", "Consultas ao banco por requisição HTTP.", ("method", "route"), buckets=QUERY_COUNT_BUCKETS)
+db_queries = registry.counter("db_queries_total", "Consultas executadas no banco (eventos do motor do SQLAlchemy).")
+upstream_request_duration = registry.histogram(
+    "upstream_request_duration_seconds", "Latência das chamadas aos serviços externos.", ("backend", "outcome"))
+upstream_errors = registry.counter(
+    "upstream_errors_total", "Erros nas chamadas aos serviços externos.", ("backend", "kind"))
+upstream_retries = registry.counter(
+    "upstream_retries_total", "Novas tentativas de chamadas aos serviços externos (falhas transitórias).", ("backend",))
+
+# Backends externos (rótulo `backend`)
+DICTIONARY_BACKEND = "dictionary"
+IMAGE_BACKEND = "image"
+TTS_BACKEND = "tts"
+
+
+def observe_upstream(backend: str, started_at: float, outcome: str) -> None:
+    """Registra a latência de uma chamada externa iniciada em `started_at` (time.perf_counter())."""
+    upstream_request_duration.observe(time.perf_counter() - started_at, backend, outcome)
+
+
+# --- Caches --------------------------------------------------------------------------------
+
+_cache_sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+_cache_sources_lock = threading.Lock()
+
+
+def register_cache(name: str, stats: Callable[[], Dict[str, Any]]) -> None:
+    """Expõe um cache nas métricas. `stats()` devolve ao menos 'hits', 'misses' e 'size' (ver LRUCache.stats)."""
+    with _cache_sources_lock:
+        _cache_sources[name] = stats
+
+
+def _cache_stat(field: str) -> Callable[[], Iterable[Tuple[LabelValues, float]]]:
+    def collect():
+        with _cache_sources_lock:
+            sources = sorted(_cache_sources.items())
+        for name, stats in sources:
+            values = stats()
+            if field == "hit_ratio":
+                lookups = values.get("hits", 0) + values.get("misses", 0)
+                yield (name,), (values.get("hits", 0) / lookups) if lookups else 0.0
+            else:
+                yield (name,), values.get(field, 0)
+    return collect
+
+
+registry.callback("cache_hits_total", "Hits acumulados por cache.", ("cache",), _cache_stat("hits"), kind="counter")
+registry.callback("cache_misses_total", "Misses acumulados por cache.", ("cache",), _cache_stat("misses"), kind="counter")
+registry.callback("cache_hit_ratio", "Taxa de acerto acumulada por cache.", ("cache",), _cache_stat("hit_ratio"))
+registry.callback("cache_entries", "Entradas atualmente em cada cache.", ("cache",), _cache_stat("size"))
+
+
+# --- Disjuntores dos backends externos ----------------------------------------------------
+
+_breaker_sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+_breaker_sources_lock = threading.Lock()
+
+
+def register_circuit_breaker(backend: str, stats: Callable[[], Dict[str, Any]]) -> None:
+    """Expõe o estado de um disjuntor. `stats()` devolve 'state_code', 'times_opened' e 'short_circuits' (ver CircuitBreaker.stats)."""
+    with _breaker_sources_lock:
+        _breaker_sources[backend] = stats
+
+
+def _breaker_stat(field: str) -> Callable[[], Iterable[Tuple[LabelValues, float]]]:
+    def collect():
+        with _breaker_sources_lock:
+            sources = sorted(_breaker_sources.items())
+        for backend, stats in sources:
+            yield (backend,), stats().get(field, 0)
+    return collect
+
+
+registry.callback("upstream_circuit_state", "Estado do disjuntor por backend (0 = fechado, 1 = meio-aberto, 2 = aberto).", ("backend",), _breaker_stat("state_code"))
+registry.callback("upstream_circuit_opened_total", "Vezes que o disjuntor abriu por backend.", ("backend",), _breaker_stat("times_opened"), kind="counter")
+registry.callback("upstream_short_circuits_total", "Chamadas respondidas sem acessar o backend (circuito aberto).", ("backend",), _breaker_stat("short_circuits"), kind="counter")
+
+
+# --- Limites de taxa e orçamento diário das APIs com chave ---------------------------------
+
+_limiter_sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+_limiter_sources_lock = threading.Lock()
+
+
+def register_rate_limiter(name: str, stats: Callable[[], Dict[str, Any]]) -> None:
+    """Expõe um limitador de taxa (ver RateLimiter.stats: fichas, fila/esperas por faixa e orçamento do dia)."""
+    with _limiter_sources_lock:
+        _limiter_sources[name] = stats
+
+
+def _limiter_stat(field: str, by_lane: bool = False) -> Callable[[], Iterable[Tuple[LabelValues, float]]]:
+    def collect():
+        with _limiter_sources_lock:
+            sources = sorted(_limiter_sources.items())
+        for name, stats in sources:
+            value = stats().get(field)
+            if by_lane:
+                for lane, lane_value in sorted((value or {}).items()):
+                    yield (name, lane), lane_value
+            elif value is not None:
+                yield (name,), value
+    return collect
+
+
+registry.callback("upstream_rate_limit_tokens", "Fichas disponíveis no balde do limitador.", ("limiter",), _limiter_stat("tokens"))
+registry.callback("upstream_rate_limit_waiting", "Chamadas esperando ficha, por faixa de prioridade.", ("limiter", "lane"), _limiter_stat("waiting", by_lane=True))
+registry.callback("upstream_rate_limit_waits_total", "Chamadas que esperaram por ficha, por faixa.", ("limiter", "lane"), _limiter_stat("waits", by_lane=True), kind="counter")
+registry.callback("upstream_rate_limit_wait_seconds_total", "Tempo total de espera por ficha, por faixa.", ("limiter", "lane"), _limiter_stat("wait_seconds", by_lane=True), kind="counter")
+registry.callback("upstream_budget_used", "Chamadas feitas hoje (UTC).", ("limiter",), _limiter_stat("budget_used"))
+registry.callback("upstream_budget_remaining", "Chamadas restantes no orçamento diário (só com limite configurado).", ("limiter",), _limiter_stat("budget_remaining"))
+
+
+# --- Requisições HTTP e banco -------------------------------------------------------------
+
+class _RequestStats:
+    __slots__ = ("db_queries",)
+
+    def __init__(self):
+        self.db_queries = 0
+
+
+# Objeto mutável por requisição: as cópias do contexto (tarefas, threads do threadpool) apontam para o mesmo objeto
+_current_request: contextvars.ContextVar[Optional[_RequestStats]] = contextvars.ContextVar("metrics_request", default=None)
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    db_queries.inc()
+    stats = _current_request.get()
+    if stats is not None:
+        stats.db_queries += 1
+
+
+def instrument_engine(engine) -> None:
+    """Conta as consultas executadas pelo motor (total e por requisição)."""
+    if not event.contains(engine, "before_cursor_execute", _count_query):
+        event.listen(engine, "before_cursor_execute", _count_query)
+
+
+def route_label(scope) -> str:
+    # Rótulo pelo template da rota (ex: /api/v1/word_info/{word_text}), não pelo caminho, para limitar a cardinalidade
+    route = scope.get("route")
+    if route is not None and getattr(route, "path", None):
+        return route.path
+    if scope.get("endpoint") is not None and scope.get("root_path"):
+        return scope["root_path"]  # Aplicação montada (ex: /static)
+    return "<unmatched>"
+
+
+class MetricsMiddleware:
+    """Middleware ASGI: latência por rota e consultas ao banco por requisição."""
+
+    def __init__(self, app, exclude_paths: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = set(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path") in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        stats = _RequestStats()
+        token = _current_request.set(stats)
+        status_code = 500
+        started_at = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_request.reset(token)
+            route = route_label(scope)
+            http_request_duration.observe(time.perf_counter() - started_at, scope["method"], route, str(status_code))
+            db_queries_per_request.observe(stats.db_queries, scope["method"], route)
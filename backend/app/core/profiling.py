@@ -0,0 +1,202 @@
+# backend/app/core/profiling.py
+"""
+Perfilamento amostrado por requisição (opt-in, PROFILING_SAMPLE_RATE > 0).
+
+Uma fração das requisições é perfilada por um amostrador de pilhas próprio: uma thread
+lê `sys._current_frames()` a cada PROFILING_INTERVAL_MS enquanto a requisição está em
+andamento. Diferente do cProfile (que só vê a thread onde foi ativado), a amostragem
+cobre o event loop e as threads do threadpool (endpoints síncronos, consultas ao banco);
+o event loop parado em `select` indica espera de I/O (APIs externas). Threads ociosas do
+threadpool são ignoradas.
+
+As pilhas são guardadas no formato "folded" (uma pilha por linha, quadros separados por
+";" seguidos da contagem), aceito por flamegraph.pl e speedscope. Por ser no nível do
+processo, amostras de requisições concorrentes também entram no relatório; por isso
+apenas uma requisição é perfilada por vez.
+"""
+import asyncio
+import itertools
+import random
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Deque, Dict, List, Optional
+
+from .metrics import route_label
+
+# Módulos cujo quadro no topo da pilha indica thread ociosa (worker do threadpool esperando tarefa)
+_IDLE_MODULES = ("threading.py", "queue.py")
+TOP_FRAMES_LIMIT = 25
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename.replace("\\", "/")
+    short = "/".join(filename.rsplit("/", 2)[-2:])
+    return f"{code.co_name} ({short}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Amostra as pilhas de todas as threads (exceto a própria) em intervalos fixos."""
+
+    def __init__(self, interval_s: float):
+        self.interval_s = interval_s
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="profiling-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.stacks
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval_s):
+            self.sample(exclude_ident=own_ident)
+
+    def sample(self, exclude_ident: Optional[int] = None) -> None:
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == exclude_ident or frame.f_code.co_filename.endswith(_IDLE_MODULES):
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            labels.append(thread_names.get(ident, f"thread-{ident}"))
+            self.stacks[";".join(reversed(labels))] += 1
+        self.samples += 1
+
+
+@dataclass
+class ProfileReport:
+    report_id: int
+    route: str
+    method: str
+    path: str
+    status_code: int
+    duration_ms: float
+    interval_ms: float
+    samples: int
+    started_at: datetime = field(default_factory=datetime.utcnow)
+    stacks: Dict[str, int] = field(default_factory=dict)
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+    def top_frames(self, limit: int = TOP_FRAMES_LIMIT) -> List[Dict[str, object]]:
+        """Quadros com mais amostras: `self_samples` (no topo da pilha) e `total_samples` (em qualquer nível)."""
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")[1:]  # Sem o nome da thread
+            if not frames:
+                continue
+            self_counts[frames[-1]] += count
+            for frame in set(frames):
+                total_counts[frame] += count
+        return [
+            {"frame": frame, "self_samples": self_counts[frame], "total_samples": total}
+            for frame, total in total_counts.most_common(limit)
+        ]
+
+
+class ProfileStore:
+    """Últimos relatórios por rota (memória do processo)."""
+
+    def __init__(self, max_per_route: int):
+        self.max_per_route = max_per_route
+        self._by_route: "OrderedDict[str, Deque[ProfileReport]]" = OrderedDict()
+        self._by_id: Dict[int, ProfileReport] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    def add(self, report: ProfileReport) -> None:
+        with self._lock:
+            reports = self._by_route.setdefault(report.route, deque())
+            reports.append(report)
+            self._by_id[report.report_id] = report
+            while len(reports) > self.max_per_route:
+                self._by_id.pop(reports.popleft().report_id, None)
+
+    def get(self, report_id: int) -> Optional[ProfileReport]:
+        with self._lock:
+            return self._by_id.get(report_id)
+
+    def list(self, route: Optional[str] = None) -> List[ProfileReport]:
+        with self._lock:
+            if route is not None:
+                return list(self._by_route.get(route, ()))
+            return [report for reports in self._by_route.values() for report in reports]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_route.clear()
+            self._by_id.clear()
+
+
+class ProfilingMiddleware:
+    """Middleware ASGI: perfila uma fração `sample_rate` das requisições HTTP (uma de cada vez)."""
+
+    def __init__(self, app, store: ProfileStore, sample_rate: float, interval_ms: float,
+                 exclude_prefixes=("/metrics", "/static", "/api/v1/admin/profiles")):
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate
+        self.interval_s = interval_ms / 1000.0
+        self.exclude_prefixes = tuple(exclude_prefixes)
+        self._busy = threading.Lock()
+        self._rng = random.Random()
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or scope.get("path", "").startswith(self.exclude_prefixes)
+                or self._rng.random() >= self.sample_rate or not self._busy.acquire(blocking=False)):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        sampler = StackSampler(self.interval_s)
+        started_wall = datetime.utcnow()
+        started_at = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = (time.perf_counter() - started_at) * 1000
+            try:
+                # O join espera a amostra em andamento terminar: fora do event loop
+                stacks = await asyncio.to_thread(sampler.stop)
+            finally:
+                self._busy.release()
+            self.store.add(ProfileReport(
+                report_id=self.store.next_id(),
+                route=route_label(scope),
+                method=scope["method"],
+                path=scope.get("path", ""),
+                status_code=status_code,
+                duration_ms=duration_ms,
+                interval_ms=self.interval_s * 1000,
+                samples=sampler.samples,
+                started_at=started_wall,
+                stacks=dict(stacks),
+            ))
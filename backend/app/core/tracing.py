@@ -0,0 +1,142 @@
+# backend/app/core/tracing.py
+"""
+Spans no estilo OpenTelemetry para as etapas do enriquecimento de palavras.
+
+Cada span tem trace_id/span_id/parent_span_id, início e fim (ns desde a época), duração
+e atributos. O span atual fica em um ContextVar: tarefas do asyncio (gather) e
+asyncio.to_thread herdam o contexto, então as etapas paralelas ficam como filhas do span
+que as iniciou e os tempos de cada etapa mostram o caminho crítico.
+
+Exportação (TRACING_EXPORTER): 'none' (padrão; spans não são criados), 'console' (uma
+linha JSON por span no logger `backend.app.tracing`) ou 'file' (JSON lines em TRACING_FILE).
+"""
+import contextvars
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from .config import TRACING_EXPORTER, TRACING_FILE
+
+logger = logging.getLogger("backend.app.tracing")
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_span_id", "start_time_ns", "end_time_ns", "attributes", "status")
+
+    def __init__(self, name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent.span_id if parent else None
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns: Optional[int] = None
+        self.attributes = dict(attributes)
+        self.status = "ok"
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_status(self, status: str) -> None:
+        self.status = status
+
+    def to_dict(self) -> Dict[str, Any]:
+        end = self.end_time_ns or time.time_ns()
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "start_time_unix_nano": self.start_time_ns,
+            "end_time_unix_nano": end,
+            "duration_ms": (end - self.start_time_ns) / 1e6,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Span usado com a exportação desativada: aceita atributos e não registra nada."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_status(self, status: str) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class ConsoleExporter:
+    def export(self, span: Span) -> None:
+        logger.info(json.dumps(span.to_dict(), ensure_ascii=False, default=str))
+
+
+class FileExporter:
+    """Acrescenta uma linha JSON por span ao arquivo (seguro entre threads do processo)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as trace_file:
+            trace_file.write(line)
+
+
+class Tracer:
+    def __init__(self, exporter=None):
+        self.exporter = exporter
+        self._current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Any]:
+        """Abre um span filho do span atual; exceções marcam o status como 'error' e são propagadas."""
+        if self.exporter is None:
+            yield _NOOP_SPAN
+            return
+        span = Span(name, self._current.get(), attributes)
+        token = self._current.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.status = "error"
+            span.set_attribute("error.type", type(exc).__name__)
+            raise
+        finally:
+            self._current.reset(token)
+            span.end_time_ns = time.time_ns()
+            try:
+                self.exporter.export(span)
+            except Exception as e:
+                logger.warning(f"Falha ao exportar span '{name}': {e}")
+
+    def current_span(self) -> Any:
+        return self._current.get() or _NOOP_SPAN
+
+
+def build_exporter(kind: str, path: str):
+    kind = (kind or "none").lower()
+    if kind == "console":
+        return ConsoleExporter()
+    if kind == "file":
+        return FileExporter(path)
+    if kind != "none":
+        logger.warning(f"TRACING_EXPORTER desconhecido: '{kind}'. Tracing desativado.")
+    return None
+
+
+# Tracer compartilhado pelo processo
+tracer = Tracer(build_exporter(TRACING_EXPORTER, TRACING_FILE))
@@ -1,12 +1,31 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-
-SQLALCHEMY_DATABASE_URL = "sqlite:///./app_data.db"
-
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-Base = declarative_base()
\ No newline at end of file
+from sqlalchemy import create_engine
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import Session, sessionmaker
+
+from .core.config import DATABASE_URL
+
+SQLALCHEMY_DATABASE_URL = DATABASE_URL
+
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False} if SQLALCHEMY_DATABASE_URL.startswith("sqlite") else {}
+)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base = declarative_base()
+
+
+def release_connection(db: Session) -> None:
+    """
+    Encerra a transação da sessão e devolve a conexão ao pool, sem expirar os objetos já
+    carregados. Os endpoints assíncronos chamam antes de aguardar as APIs externas: a sessão
+    não segura uma conexão durante a espera (com o pool esgotado, a próxima requisição travaria
+    o event loop esperando por ela), e a próxima consulta abre outra transação.
+    Use depois de leituras; alterações pendentes seriam gravadas pelo commit.
+    """
+    expire_on_commit = db.expire_on_commit
+    db.expire_on_commit = False
+    try:
+        db.commit()
+    finally:
+        db.expire_on_commit = expire_on_commit
@@ -1,19 +1,118 @@
-from sqlalchemy.orm import Session
-from .database import SessionLocal
-# Importar o modelo de usuário e lógica de autenticação se necessário
-# from . import models, crud, auth
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-# TODO: Implementar a lógica real para obter o usuário logado
-# Isso dependerá da tua implementação de autenticação (ex: OAuth2 com JWT)
-def get_current_user():
-    # Esta é uma implementação placeholder. Precisas da lógica real de autenticação aqui.
-    # Por enquanto, pode retornar um usuário dummy ou None para testes, mas a lógica real é crucial.
-    # Ex: usando token JWT e buscando o usuário no DB.
-    pass # Implementar lógica de autenticação real aqui 
\ No newline at end of file
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from jose import JWTError, jwt
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from . import crud, models, schemas
+from .core.config import SECRET_KEY, ALGORITHM, AUTH_CACHE_TTL_SECONDS, AUTH_CACHE_SIZE
+from .core import metrics
+from .database import SessionLocal, release_connection
+from .services.lru_cache import LRUCache, stable_content_key
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
+
+# Caches de autenticação (por processo, TTL curto):
+# - token -> claims já validadas (evita decodificar/verificar o JWT a cada requisição)
+# - id do usuário -> AuthenticatedUser (evita uma consulta ao banco a cada requisição)
+# Alterações em User invalidam a entrada do usuário (ver listeners abaixo); em outros
+# workers a entrada expira pelo TTL.
+token_claims_cache = LRUCache(maxsize=AUTH_CACHE_SIZE, name="auth_tokens", ttl_seconds=AUTH_CACHE_TTL_SECONDS)
+authenticated_user_cache = LRUCache(maxsize=AUTH_CACHE_SIZE, name="auth_users", ttl_seconds=AUTH_CACHE_TTL_SECONDS)
+for _auth_cache in (token_claims_cache, authenticated_user_cache):
+    metrics.register_cache(_auth_cache.name, _auth_cache.stats)
+
+def invalidate_cached_user(user_id: int) -> None:
+    authenticated_user_cache.invalidate(user_id)
+
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def _invalidate_user_on_change(mapper, connection, target: models.User) -> None:
+    if target.id is not None:
+        invalidate_cached_user(target.id)
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+def _decode_token_claims(token: str) -> dict:
+    """Valida o JWT (usando o cache de tokens) e retorna as claims."""
+    token_key = stable_content_key(token)
+    found, claims = token_claims_cache.get(token_key)
+    if found:
+        # A expiração do próprio token continua valendo mesmo com a entrada em cache
+        if claims["exp"] > datetime.now(timezone.utc).timestamp():
+            return claims
+        token_claims_cache.invalidate(token_key)
+        raise _credentials_exception()
+
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise _credentials_exception()
+    if payload.get("sub") is None or payload.get("exp") is None:
+        raise _credentials_exception()
+    claims = {"sub": payload["sub"], "uid": payload.get("uid"), "exp": payload["exp"]}
+    token_claims_cache.put(token_key, claims, ttl_seconds=max(claims["exp"] - datetime.now(timezone.utc).timestamp(), 0.001))
+    return claims
+
+def _load_user(db: Session, claims: dict) -> Optional[schemas.AuthenticatedUser]:
+    # Tokens novos trazem o id do usuário (busca pela chave primária);
+    # tokens emitidos antes disso trazem apenas o username
+    try:
+        if claims["uid"] is not None:
+            user = crud.get_user(db, user_id=claims["uid"])
+            if user is not None and user.username != claims["sub"]:
+                return None
+        else:
+            user = crud.get_user_by_username(db, username=claims["sub"])
+        return schemas.AuthenticatedUser.model_validate(user) if user is not None else None
+    finally:
+        # O endpoint pode aguardar as APIs externas em seguida: a conexão não fica presa à sessão
+        release_connection(db)
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> schemas.AuthenticatedUser:
+    """
+    Dependência única de autenticação de todos os routers.
+    No caminho quente (token e usuário em cache) não decodifica o JWT nem consulta o banco.
+    """
+    claims = _decode_token_claims(token)
+    user_id = claims["uid"]
+    if user_id is not None:
+        found, user = authenticated_user_cache.get(user_id)
+        if found:
+            return user
+
+    # Falta no cache: a consulta roda em uma thread (a espera por uma conexão do pool não trava o event loop)
+    user = await asyncio.to_thread(_load_user, db, claims)
+    if user is None:
+        raise _credentials_exception()
+    authenticated_user_cache.put(user.id, user)
+    return user
+
+async def get_current_active_user(current_user: schemas.AuthenticatedUser = Depends(get_current_user)) -> schemas.AuthenticatedUser:
+    return current_user
+
+async def get_current_active_admin_user(current_user: schemas.AuthenticatedUser = Depends(get_current_active_user)) -> schemas.AuthenticatedUser:
+    # O papel de admin vem do registro do usuário (e não da claim do token),
+    # para que uma revogação valha assim que a entrada do cache for invalidada/expirar
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Operation not permitted. Requires admin privileges."
+        )
+    return current_user
@@ -0,0 +1,184 @@
+# backend/app/services/cognitive_state_cache.py
+"""
+Cache em memória (por processo) do UserCognitiveState, com escrita direta (write-through).
+
+- Leituras servem uma cópia do snapshot em cache; durante uma sessão ativa não tocam o banco.
+- Cada atualização incrementa a versão do usuário em `cognitive_state_versions` na mesma
+  transação (concorrência otimista: quem atualiza a partir de uma versão antiga recebe
+  CognitiveStateConflict) e atribui uma sequência global de alteração.
+- Para invalidar entre workers, cada processo consulta, no máximo a cada
+  COGNITIVE_STATE_SYNC_SECONDS, as alterações com sequência maior que a última vista.
+- A sequência é max(change_seq) + 1 calculado na própria escrita, o que só é seguro com escritores
+  serializados (SQLite). Em outros bancos duas transações obteriam o mesmo valor e um worker perderia
+  a invalidação: lá o cache fica desligado e toda leitura vai ao banco (a versão continua valendo).
+"""
+import logging
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from .. import models, schemas
+from ..core.config import COGNITIVE_STATE_CACHE_SIZE, COGNITIVE_STATE_SYNC_SECONDS, DATABASE_URL
+from ..core import metrics
+from .lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Bancos em que a sequência de alterações é confiável (ver docstring do módulo)
+SERIALIZED_WRITERS = DATABASE_URL.startswith("sqlite")
+
+
+class CognitiveStateConflict(Exception):
+    """O estado cognitivo foi alterado por outra requisição desde a leitura (versão divergente)."""
+
+
+def _next_change_seq():
+    # Avaliado dentro do próprio UPDATE/INSERT: no SQLite a escrita já detém o lock,
+    # então as sequências são atribuídas (e confirmadas) em ordem. Nos demais bancos o
+    # cache não é usado (SERIALIZED_WRITERS), e a sequência serve só de registro
+    return select(func.coalesce(func.max(models.CognitiveStateVersion.change_seq), 0) + 1).scalar_subquery()
+
+
+def _snapshot(state: models.UserCognitiveState, version: int) -> schemas.UserCognitiveState:
+    return schemas.UserCognitiveState(
+        id=state.id,
+        user_id=state.user_id,
+        version=version,
+        vocabular_ability=state.vocabular_ability or 0.0,
+        processing_speed=state.processing_speed or 0.0,
+        working_memory_load=state.working_memory_load or 0.0,
+        confidence_level=state.confidence_level or 0.0,
+        fatigue_factor=state.fatigue_factor or 0.0,
+        domain_expertise=dict(state.domain_expertise or {}),
+    )
+
+
+class CognitiveStateCache:
+    def __init__(self, maxsize: int = COGNITIVE_STATE_CACHE_SIZE, sync_interval: float = COGNITIVE_STATE_SYNC_SECONDS,
+                 enabled: bool = SERIALIZED_WRITERS):
+        self._cache = LRUCache(maxsize=maxsize, name="cognitive_state")
+        self.enabled = enabled
+        if not enabled:
+            logger.warning("Cache do estado cognitivo desligado: a invalidação entre workers exige SQLite; as leituras vão ao banco.")
+        self.sync_interval = sync_interval
+        self._sync_lock = threading.Lock()
+        self._last_change_seq: Optional[int] = None
+        self._next_sync = 0.0
+
+    def _sync(self, db: Session) -> None:
+        """Descarta entradas alteradas por outros workers desde a última sincronização."""
+        if time.monotonic() < self._next_sync:
+            return
+        with self._sync_lock:
+            if time.monotonic() < self._next_sync:
+                return
+            self._next_sync = time.monotonic() + self.sync_interval
+            if self._last_change_seq is None:
+                self._last_change_seq = db.query(func.coalesce(func.max(models.CognitiveStateVersion.change_seq), 0)).scalar()
+                self._cache.clear()
+                return
+            changes = db.query(
+                models.CognitiveStateVersion.user_id,
+                models.CognitiveStateVersion.version,
+                models.CognitiveStateVersion.change_seq,
+            ).filter(models.CognitiveStateVersion.change_seq > self._last_change_seq).all()
+            for user_id, version, change_seq in changes:
+                found, cached = self._cache.peek(user_id)
+                # Alterações feitas por este processo já estão no cache (mesma versão)
+                if found and cached.version != version:
+                    self._cache.invalidate(user_id)
+                self._last_change_seq = max(self._last_change_seq, change_seq)
+
+    def get(self, db: Session, user_id: int) -> Optional[schemas.UserCognitiveState]:
+        """Estado cognitivo do usuário (cópia; alterações locais não afetam o cache)."""
+        if not self.enabled:
+            return self._read(db, user_id)
+        self._sync(db)
+        found, snapshot = self._cache.get(user_id)
+        if not found:
+            snapshot = self._read(db, user_id)
+            if snapshot is None:
+                return None
+            self._cache.put(user_id, snapshot)
+        return snapshot.model_copy(deep=True)
+
+    def _read(self, db: Session, user_id: int) -> Optional[schemas.UserCognitiveState]:
+        row = db.query(models.UserCognitiveState, models.CognitiveStateVersion.version)\
+            .outerjoin(models.CognitiveStateVersion, models.CognitiveStateVersion.user_id == models.UserCognitiveState.user_id)\
+            .filter(models.UserCognitiveState.user_id == user_id)\
+            .first()
+        return _snapshot(row[0], row[1] or 0) if row is not None else None
+
+    def _store(self, user_id: int, snapshot: schemas.UserCognitiveState) -> None:
+        if self.enabled:
+            self._cache.put(user_id, snapshot)
+
+    def create_initial(self, db: Session, user_id: int) -> schemas.UserCognitiveState:
+        initial_state = models.UserCognitiveState(user_id=user_id)
+        db.add(initial_state)
+        db.add(models.CognitiveStateVersion(user_id=user_id, version=0, change_seq=_next_change_seq()))
+        db.flush()
+        snapshot = _snapshot(initial_state, 0)
+        db.commit()
+        self._store(user_id, snapshot)
+        return snapshot.model_copy(deep=True)
+
+    def update(
+        self,
+        db: Session,
+        user_id: int,
+        state_update: schemas.UserCognitiveStateBase,
+        expected_version: Optional[int] = None,
+    ) -> Optional[schemas.UserCognitiveState]:
+        """
+        Atualiza o estado no banco e no cache na mesma operação (write-through).
+        Com `expected_version`, falha com CognitiveStateConflict se a versão no banco for outra.
+        """
+        db_state = db.query(models.UserCognitiveState).filter(models.UserCognitiveState.user_id == user_id).first()
+        if not db_state:
+            return None
+
+        version_query = db.query(models.CognitiveStateVersion).filter(models.CognitiveStateVersion.user_id == user_id)
+        if expected_version is not None:
+            version_query = version_query.filter(models.CognitiveStateVersion.version == expected_version)
+        updated = version_query.update(
+            {
+                models.CognitiveStateVersion.version: models.CognitiveStateVersion.version + 1,
+                models.CognitiveStateVersion.change_seq: _next_change_seq(),
+            },
+            synchronize_session=False,
+        )
+        if not updated:
+            has_version_row = db.query(models.CognitiveStateVersion.user_id)\
+                .filter(models.CognitiveStateVersion.user_id == user_id).first() is not None
+            if has_version_row or expected_version not in (None, 0):
+                db.rollback()
+                self._cache.invalidate(user_id)
+                raise CognitiveStateConflict(f"Estado cognitivo do usuário {user_id} foi alterado por outra requisição.")
+            # Estado criado antes do contador de versões existir
+            db.add(models.CognitiveStateVersion(user_id=user_id, version=1, change_seq=_next_change_seq()))
+            db.flush()
+
+        for field, value in state_update.model_dump(exclude_unset=True).items():
+            setattr(db_state, field, value)
+        new_version = db.query(models.CognitiveStateVersion.version)\
+            .filter(models.CognitiveStateVersion.user_id == user_id).scalar()
+        db.flush()
+        snapshot = _snapshot(db_state, new_version)
+        db.commit()
+        self._store(user_id, snapshot)
+        return snapshot.model_copy(deep=True)
+
+    def invalidate(self, user_id: int) -> None:
+        self._cache.invalidate(user_id)
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+# Instância compartilhada pelo processo
+cognitive_state_cache = CognitiveStateCache()
+metrics.register_cache("cognitive_state", cognitive_state_cache.stats)
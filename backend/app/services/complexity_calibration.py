@@ -0,0 +1,152 @@
+# backend/app/services/complexity_calibration.py
+"""
+Calibração offline dos pesos do score composto do WordComplexityAnalyzer.
+
+A partir do desempenho observado no UserProgress (taxa de erro e tempo médio por palavra),
+ajusta por mínimos quadrados ponderados (regularizados em direção aos pesos atuais) os pesos
+dos sub-scores e um intercepto, e exporta um arquivo JSON pequeno que o analisador carrega
+na inicialização. A inferência continua sendo um único produto escalar por palavra.
+
+As definições não são armazenadas (nem no UserProgress nem no MasterWord): os sub-scores que
+dependem do texto da definição ficam fora do ajuste e mantêm os pesos atuais.
+
+Uso (a partir da raiz do projeto):
+    python -m backend.app.services.complexity_calibration [--min-attempts 5] [--ridge 1.0] [--output caminho.json]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from .. import crud
+from ..core.config import COMPLEXITY_COEFFICIENTS_PATH
+from .word_complexity_analyzer import SCORE_COMPONENTS, WordComplexityAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# Peso da taxa de erro e do tempo relativo na dificuldade observada (escala 0-10)
+ERROR_RATE_WEIGHT = 0.7
+RESPONSE_TIME_WEIGHT = 0.3
+# Mínimo de palavras distintas para a calibração
+MIN_CALIBRATION_WORDS = 20
+# Sub-scores calculados a partir da definição (abstração semântica usa também os marcadores
+# da definição); sem o texto, seriam constantes ou incompletos no ajuste
+DEFINITION_DEPENDENT_COMPONENTS = ('semantic', 'definition')
+
+
+def fit_complexity_coefficients(
+    db: Session,
+    complexity_analyzer: WordComplexityAnalyzer,
+    min_attempts: int = 5,
+    ridge: float = 1.0,
+) -> Optional[Dict[str, Any]]:
+    """
+    Ajusta pesos e intercepto do score composto. Retorna o dicionário de coeficientes
+    (formato do arquivo exportado) ou None se não houver dados suficientes.
+
+    Alvo por palavra: 10 * (0.7 * taxa de erro + 0.3 * posição percentil do tempo médio).
+    Cada palavra pesa proporcionalmente ao número de tentativas. O termo de regularização
+    `ridge` puxa os pesos para os atuais, estabilizando o ajuste com poucos dados; pesos
+    negativos são zerados (um sub-score maior não deve reduzir a dificuldade).
+    Os componentes de DEFINITION_DEPENDENT_COMPONENTS mantêm os pesos atuais; sua contribuição
+    (calculada sem definição) é descontada do alvo e o intercepto absorve a diferença média.
+    """
+    import numpy as np
+
+    rows = crud.get_word_performance_aggregates(db, min_attempts=min_attempts)
+    if len(rows) < MIN_CALIBRATION_WORDS:
+        logger.warning(f"Calibração ignorada: {len(rows)} palavras com ao menos {min_attempts} tentativas (mínimo {MIN_CALIBRATION_WORDS}).")
+        return None
+
+    words = [row.word_text for row in rows]
+    correct = np.array([row.correct_attempts or 0 for row in rows], dtype=np.float64)
+    attempts = np.array([row.total_attempts for row in rows], dtype=np.float64)
+    mean_time = np.array([row.total_time_seconds or 0.0 for row in rows], dtype=np.float64) / attempts
+
+    error_rate = np.clip(1.0 - correct / attempts, 0.0, 1.0)
+    time_rank = mean_time.argsort().argsort() / max(len(words) - 1, 1)
+    target = 10.0 * (ERROR_RATE_WEIGHT * error_rate + RESPONSE_TIME_WEIGHT * time_rank)
+
+    batch = complexity_analyzer.infer_batch(words)
+    scores = np.column_stack((
+        batch.lexical_score, batch.syllabic_score, batch.morphological_density,
+        batch.semantic_abstraction, batch.definition_complexity,
+    ))
+
+    sample_weight = attempts / attempts.mean()
+    prior = np.array([complexity_analyzer.weights[component] for component in SCORE_COMPONENTS])
+    fitted = np.array([component not in DEFINITION_DEPENDENT_COMPONENTS for component in SCORE_COMPONENTS])
+    fixed_contribution = scores[:, ~fitted] @ prior[~fitted]
+    design = np.column_stack((scores[:, fitted], np.ones(len(words))))
+    penalty = np.diag(np.r_[np.full(int(fitted.sum()), ridge), 0.0])  # O intercepto não é regularizado
+    weighted_design = design * sample_weight[:, None]
+    solution = np.linalg.solve(
+        design.T @ weighted_design + penalty,
+        weighted_design.T @ (target - fixed_contribution) + penalty @ np.r_[prior[fitted], 0.0],
+    )
+    weights = prior.copy()
+    weights[fitted] = np.clip(solution[:-1], 0.0, None)
+    intercept = float(np.average(target - scores @ weights, weights=sample_weight))
+
+    def weighted_r2(predicted: 'np.ndarray') -> float:
+        residual = np.average((target - predicted) ** 2, weights=sample_weight)
+        variance = np.average((target - np.average(target, weights=sample_weight)) ** 2, weights=sample_weight)
+        return float(1.0 - residual / variance) if variance > 0 else 0.0
+
+    thresholds = complexity_analyzer.complexity_thresholds
+    return {
+        'version': datetime.utcnow().strftime("%Y%m%d%H%M%S"),
+        'components': list(SCORE_COMPONENTS),
+        'weights': [round(float(weight), 6) for weight in weights],
+        'intercept': round(intercept, 6),
+        'thresholds': [thresholds['fácil'][1], thresholds['média'][1]],
+        'fit': {
+            'words': len(words),
+            'attempts': int(attempts.sum()),
+            'ridge': ridge,
+            'fixed_components': list(DEFINITION_DEPENDENT_COMPONENTS),
+            'r2': weighted_r2(np.clip(scores @ weights + intercept, 0.0, 10.0)),
+            'r2_previous_weights': weighted_r2(np.clip(scores @ prior + complexity_analyzer.composite_intercept, 0.0, 10.0)),
+        },
+    }
+
+
+def export_coefficients(coefficients: Dict[str, Any], path: str = COMPLEXITY_COEFFICIENTS_PATH) -> None:
+    """Grava o arquivo de coeficientes de forma atômica."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as coefficients_file:
+        json.dump(coefficients, coefficients_file, ensure_ascii=False, indent=2)
+    os.replace(temp_path, path)
+    logger.info(f"Coeficientes de complexidade (versão {coefficients['version']}) exportados para {path}.")
+
+
+def main(argv=None) -> int:
+    from ..database import SessionLocal
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Calibra os pesos do score composto de complexidade")
+    parser.add_argument("--min-attempts", type=int, default=5, help="Tentativas mínimas para uma palavra entrar no ajuste")
+    parser.add_argument("--ridge", type=float, default=1.0, help="Regularização em direção aos pesos atuais")
+    parser.add_argument("--output", default=COMPLEXITY_COEFFICIENTS_PATH)
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        coefficients = fit_complexity_coefficients(db, WordComplexityAnalyzer(), args.min_attempts, args.ridge)
+    finally:
+        db.close()
+    if coefficients is None:
+        return 1
+    export_coefficients(coefficients, args.output)
+    fit = coefficients['fit']
+    print(f"R² ponderado: {fit['r2']:.3f} (pesos anteriores: {fit['r2_previous_weights']:.3f}) em {fit['words']} palavras")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,96 +1,166 @@
-# backend/app/services/image_api.py
-import os
-import httpx
-from dotenv import load_dotenv
-import logging
-
-logger = logging.getLogger(__name__)
-
-# Carrega variáveis do .env localizado em Palavras_project/backend/.env
-# __file__ é Palavras_project/backend/app/services/image_api.py
-# Queremos Palavras_project/backend/.env
-dotenv_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '.env'))
-load_dotenv(dotenv_path=dotenv_path)
-
-PIXABAY_API_KEY = os.getenv("PIXABAY_API_KEY")
-# Para depuração, vamos verificar se a chave foi carregada
-if not PIXABAY_API_KEY:
-    logger.error("CRÍTICO: Chave da API do Pixabay (PIXABAY_API_KEY) não está configurada.")
-else:
-    logger.info("Chave PIXABAY_API_KEY carregada.")
-
-PIXABAY_API_URL = "https://pixabay.com/api/"
-
-async def _get_image_for_word_func(word: str, lang: str = "pt", image_type: str = "photo", per_page: int = 3) -> str | None:
-    """
-    Busca uma imagem ilustrativa para a palavra no Pixabay de forma assíncrona.
-
-    Args:
-        word (str): A palavra para buscar.
-        lang (str, optional): Código do idioma. Default é "pt".
-        image_type (str, optional): Tipo de imagem ('photo', 'illustration'). Default é "photo".
-        per_page (int, optional): Quantidade de imagens a solicitar (para ter uma pequena margem). Default é 3.
-
-    Returns:
-        str | None: A URL da imagem (webformatURL) ou None se não encontrada/erro.
-    """
-    if not PIXABAY_API_KEY:
-        logger.error("API do Pixabay não pode ser usada: chave não configurada.")
-        return None
-    if not word:
-        return None
-
-    params = {
-        'key': PIXABAY_API_KEY,
-        'q': word,
-        'lang': lang,
-        'image_type': image_type,
-        'safesearch': 'true',    # Essencial para ambiente educacional
-        'order': 'popular',      # Traz as mais populares primeiro
-        'per_page': per_page
-    }
-
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(PIXABAY_API_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data.get('hits') and len(data['hits']) > 0:
-                image_url = data['hits'][0].get('webformatURL')
-                if image_url:
-                    logger.info(f"Imagem encontrada para '{word}': {image_url}")
-                    return image_url
-                else:
-                    logger.warning(f"Campo 'webformatURL' não encontrado no hit para '{word}': {data['hits'][0]}")
-                    return None
-            else:
-                logger.info(f"Nenhuma imagem encontrada para '{word}' no Pixabay com filtros: lang={lang}, type={image_type}")
-                return None
-            
-    except httpx.HTTPStatusError as e_http:
-        logger.error(f"Erro HTTP ao buscar imagem para '{word}': {e_http.response.status_code} - {e_http.response.text}")
-        return None
-    except httpx.RequestError as e_req:
-        logger.error(f"Erro de requisição à API do Pixabay para '{word}': {e_req}")
-        return None
-    except Exception as e_gen: # Captura outras exceções como JSONDecodeError se a resposta não for JSON válido
-        logger.error(f"Erro inesperado ao buscar imagem no Pixabay para '{word}': {e_gen}", exc_info=True)
-        return None
-
-class ImageAPI:
-    async def get_image_for_word(self, word: str, lang: str = "pt", image_type: str = "photo", per_page: int = 3) -> str | None:
-        return await _get_image_for_word_func(word, lang, image_type, per_page)
-
-# Exemplo de uso assíncrono
-# import asyncio
-# async def main():
-#     termo_busca = "gato"
-#     url_imagem = await get_image_for_word(termo_busca)
-#     if url_imagem:
-#         print(f"Imagem para '{termo_busca}': {url_imagem}")
-#     else:
-#         print(f"Não foi possível encontrar imagem para '{termo_busca}'.")
-# if __name__ == "__main__":
-#     logging.basicConfig(level=logging.INFO) # Configurar logging para ver os logs do serviço
+# backend/app/services/image_api.py
+import os
+import httpx
+import logging
+from functools import lru_cache
+
+from ..core.config import PIXABAY_API_URL as _CONFIGURED_PIXABAY_API_URL
+from ..core.config import IMAGE_TIMEOUT_SECONDS, IMAGE_DEADLINE_SECONDS, UPSTREAM_FALLBACK_CACHE_SIZE
+from ..core.config import PIXABAY_RATE_PER_MINUTE, PIXABAY_BURST, PIXABAY_INTERACTIVE_RESERVE, PIXABAY_DAILY_BUDGET
+from ..core import metrics
+from ..core.tracing import tracer
+from .lru_cache import LRUCache, stable_content_key
+from .resilience import CircuitOpenError, UpstreamPolicy, build_upstream_policy
+from .rate_limiter import QuotaExhaustedError, RateLimiter, limiter_for_key
+
+logger = logging.getLogger(__name__)
+
+# Caminho do .env localizado em Palavras_project/backend/.env
+# __file__ é Palavras_project/backend/app/services/image_api.py
+dotenv_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '.env'))
+
+@lru_cache(maxsize=1)
+def _get_pixabay_api_key() -> str | None:
+    """
+    Lê a PIXABAY_API_KEY no primeiro uso (e não na importação do módulo).
+    O .env só é carregado se a variável ainda não estiver no ambiente.
+    """
+    api_key = os.getenv("PIXABAY_API_KEY")
+    if not api_key and os.path.exists(dotenv_path):
+        from dotenv import load_dotenv
+        load_dotenv(dotenv_path=dotenv_path)
+        api_key = os.getenv("PIXABAY_API_KEY")
+    # Para depuração, vamos verificar se a chave foi carregada
+    if not api_key:
+        logger.error("CRÍTICO: Chave da API do Pixabay (PIXABAY_API_KEY) não está configurada.")
+    else:
+        logger.info("Chave PIXABAY_API_KEY carregada.")
+    return api_key
+
+PIXABAY_API_URL = _CONFIGURED_PIXABAY_API_URL
+
+# Prazo, novas tentativas e disjuntor compartilhados por todas as instâncias (estado do backend no processo)
+upstream_policy = build_upstream_policy(metrics.IMAGE_BACKEND, IMAGE_TIMEOUT_SECONDS, IMAGE_DEADLINE_SECONDS)
+# Últimas imagens obtidas, servidas enquanto o circuito do Pixabay está aberto
+_fallback_cache = LRUCache(maxsize=UPSTREAM_FALLBACK_CACHE_SIZE, name="image_fallback")
+metrics.register_cache(_fallback_cache.name, _fallback_cache.stats)
+
+
+def pixabay_rate_limiter(api_key: str) -> RateLimiter:
+    """Limitador de taxa e orçamento diário compartilhados por todas as chamadas com a mesma chave."""
+    return limiter_for_key("pixabay", api_key, PIXABAY_RATE_PER_MINUTE, PIXABAY_BURST,
+                           PIXABAY_INTERACTIVE_RESERVE, PIXABAY_DAILY_BUDGET)
+
+async def _search_images_func(word: str, lang: str = "pt", image_type: str = "photo", per_page: int = 3, api_url: str = PIXABAY_API_URL, api_key: str | None = None, policy: UpstreamPolicy = upstream_policy) -> list[dict]:
+    """
+    Busca imagens ilustrativas para a palavra no Pixabay de forma assíncrona.
+
+    Args:
+        word (str): A palavra para buscar.
+        lang (str, optional): Código do idioma. Default é "pt".
+        image_type (str, optional): Tipo de imagem ('photo', 'illustration'). Default é "photo".
+        per_page (int, optional): Quantidade de imagens a solicitar (para ter uma pequena margem). Default é 3.
+        api_url (str, optional): URL da API (injetável para servidores locais). Default é PIXABAY_API_URL.
+        api_key (str, optional): Chave da API; se omitida, usa PIXABAY_API_KEY do ambiente/.env.
+        policy (UpstreamPolicy, optional): Prazo, novas tentativas e disjuntor. Default é a política do Pixabay.
+
+    Returns:
+        list[dict]: Os hits com 'webformatURL' (o primeiro é o mais popular); lista vazia se não encontrados/erro.
+
+    Raises:
+        CircuitOpenError: Se o circuito do Pixabay estiver aberto (a chamada não é feita).
+        QuotaExhaustedError: Se o orçamento diário da chave acabou para a faixa da chamada.
+    """
+    api_key = api_key or _get_pixabay_api_key()
+    if not api_key:
+        logger.error("API do Pixabay não pode ser usada: chave não configurada.")
+        return []
+    if not word:
+        return []
+
+    params = {
+        'key': api_key,
+        'q': word,
+        'lang': lang,
+        'image_type': image_type,
+        'safesearch': 'true',    # Essencial para ambiente educacional
+        'order': 'popular',      # Traz as mais populares primeiro
+        'per_page': per_page
+    }
+
+    try:
+        async with httpx.AsyncClient() as client:
+            # Cada tentativa espera ficha no limitador da chave, na faixa do contexto (interativa ou de fundo)
+            limiter = pixabay_rate_limiter(api_key)
+            response = await policy.get(client, api_url, throttle=limiter.acquire, params=params)
+            limiter.observe_headers(response.headers)
+            response.raise_for_status()
+            data = response.json()
+            
+            if data.get('hits') and len(data['hits']) > 0:
+                hits = [hit for hit in data['hits'] if hit.get('webformatURL')]
+                if hits:
+                    logger.info(f"Imagem encontrada para '{word}': {hits[0]['webformatURL']} (+{len(hits) - 1} alternativa(s))")
+                else:
+                    logger.warning(f"Campo 'webformatURL' não encontrado nos hits para '{word}': {data['hits'][0]}")
+                return hits
+            else:
+                logger.info(f"Nenhuma imagem encontrada para '{word}' no Pixabay com filtros: lang={lang}, type={image_type}")
+                return []
+            
+    except (CircuitOpenError, QuotaExhaustedError):
+        raise # Tratado por ImageAPI (resposta em cache ou vazia)
+    except httpx.HTTPStatusError as e_http:
+        metrics.upstream_errors.inc(metrics.IMAGE_BACKEND, f"http_{e_http.response.status_code}")
+        logger.error(f"Erro HTTP ao buscar imagem para '{word}': {e_http.response.status_code} - {e_http.response.text}")
+        return []
+    except httpx.RequestError as e_req:
+        metrics.upstream_errors.inc(metrics.IMAGE_BACKEND, type(e_req).__name__)
+        logger.error(f"Erro de requisição à API do Pixabay para '{word}': {e_req}")
+        return []
+    except Exception as e_gen: # Captura outras exceções como JSONDecodeError se a resposta não for JSON válido
+        metrics.upstream_errors.inc(metrics.IMAGE_BACKEND, type(e_gen).__name__)
+        logger.error(f"Erro inesperado ao buscar imagem no Pixabay para '{word}': {e_gen}", exc_info=True)
+        return []
+
+async def _get_image_for_word_func(word: str, lang: str = "pt", image_type: str = "photo", per_page: int = 3, api_url: str = PIXABAY_API_URL, api_key: str | None = None, policy: UpstreamPolicy = upstream_policy) -> str | None:
+    """URL (webformatURL) da imagem mais popular para a palavra, ou None (ver _search_images_func)."""
+    hits = await _search_images_func(word, lang, image_type, per_page, api_url=api_url, api_key=api_key, policy=policy)
+    return hits[0]['webformatURL'] if hits else None
+
+class ImageAPI:
+    def __init__(self, api_url: str | None = None, api_key: str | None = None, policy: UpstreamPolicy | None = None):
+        self.api_url = api_url or PIXABAY_API_URL
+        self.api_key = api_key
+        self.policy = policy or upstream_policy
+
+    async def search_images(self, word: str, lang: str = "pt", image_type: str = "photo", per_page: int = 3) -> list[dict]:
+        """Todos os hits da busca (o primeiro é a imagem escolhida; os demais, alternativas)."""
+        cache_key = stable_content_key(word, lang, image_type)
+        try:
+            hits = await _search_images_func(word, lang, image_type, per_page, api_url=self.api_url, api_key=self.api_key, policy=self.policy)
+        except (CircuitOpenError, QuotaExhaustedError) as e:
+            found, cached = _fallback_cache.get(cache_key)
+            tracer.current_span().set_attribute('circuit_open' if isinstance(e, CircuitOpenError) else 'quota_exhausted', True)
+            logger.warning(f"Pixabay não consultado: {e} '{word}' servida {'do cache' if found else 'sem imagem'}.")
+            return cached or []
+        if hits:
+            _fallback_cache.put(cache_key, hits)
+        return hits
+
+    async def get_image_for_word(self, word: str, lang: str = "pt", image_type: str = "photo", per_page: int = 3) -> str | None:
+        hits = await self.search_images(word, lang, image_type, per_page)
+        return hits[0]['webformatURL'] if hits else None
+
+# Exemplo de uso assíncrono
+# import asyncio
+# async def main():
+#     termo_busca = "gato"
+#     url_imagem = await get_image_for_word(termo_busca)
+#     if url_imagem:
+#         print(f"Imagem para '{termo_busca}': {url_imagem}")
+#     else:
+#         print(f"Não foi possível encontrar imagem para '{termo_busca}'.")
+# if __name__ == "__main__":
+#     logging.basicConfig(level=logging.INFO) # Configurar logging para ver os logs do serviço
 #     asyncio.run(main()) 
\ No newline at end of file
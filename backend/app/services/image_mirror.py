@@ -0,0 +1,207 @@
+# backend/app/services/image_mirror.py
+"""
+Espelho local das imagens do Pixabay (opcional, IMAGE_MIRROR_ENABLED).
+
+Na primeira busca de uma palavra, todas as imagens devolvidas (a escolhida e as
+alternativas) são baixadas uma única vez para static/images, com uma miniatura de cada,
+e um manifesto JSON por palavra registra os arquivos. As buscas seguintes leem o
+manifesto e não consultam o Pixabay; os clientes recebem URLs da própria origem,
+servidas como imutáveis (nomes derivados da URL de origem). As alternativas servem de
+imagens para os distratores dos exercícios de múltipla escolha com imagem.
+
+Variantes: com o Pillow instalado (dependência opcional), a imagem é gravada em WebP e a
+miniatura é redimensionada localmente (IMAGE_MIRROR_THUMBNAIL_SIZE); sem ele, o formato
+original é mantido e a miniatura é a `previewURL` (150 px) já gerada pelo Pixabay.
+"""
+import asyncio
+import io
+import json
+import logging
+import os
+import re
+import tempfile
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+
+from ..core.config import IMAGE_MIRROR_MAX_BYTES, IMAGE_MIRROR_THUMBNAIL_SIZE, IMAGE_TIMEOUT_SECONDS
+from ..core import metrics
+from .lru_cache import LRUCache, stable_content_key
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow é opcional: sem ele não há conversão para WebP nem redimensionamento local
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+IMAGE_MIRROR_SUBDIR = "images"
+MANIFEST_SUBDIR = "manifests"
+# Caminho público (montagem /static em main.py) dos arquivos espelhados
+STATIC_URL_PREFIX = f"/static/{IMAGE_MIRROR_SUBDIR}/"
+CONTENT_ADDRESSED_IMAGE_PATTERN = re.compile(r"-[0-9a-f]{16}(?:-thumb)?\.(?:jpg|png|gif|webp)$")
+WEBP_QUALITY = 80
+MANIFEST_CACHE_SIZE = 1000
+
+_EXTENSIONS = {"image/jpeg": "jpg", "image/png": "png", "image/gif": "gif", "image/webp": "webp"}
+
+
+@dataclass
+class MirroredImage:
+    source_url: str
+    filename: Optional[str] = None   # Imagem local (None se o download falhou)
+    thumbnail: Optional[str] = None  # Miniatura local
+    tags: str = ""
+
+
+@dataclass
+class WordImages:
+    """Imagens de uma palavra: a primeira é a escolhida, as demais são alternativas."""
+    word: str
+    images: List[MirroredImage] = field(default_factory=list)
+
+    @property
+    def chosen(self) -> Optional[MirroredImage]:
+        return self.images[0] if self.images else None
+
+    @property
+    def alternates(self) -> List[MirroredImage]:
+        return [image for image in self.images[1:] if image.filename]
+
+
+def static_url(filename: Optional[str]) -> Optional[str]:
+    """URL relativa (mesma origem) de um arquivo espelhado."""
+    return f"{STATIC_URL_PREFIX}{filename}" if filename else None
+
+
+def _safe_word(word: str) -> str:
+    return re.sub(r'[^a-z0-9_]', '', word.lower().replace(" ", "_"))[:50] or "imagem"
+
+
+class ImageMirror:
+    def __init__(self, base_dir: str, max_bytes: int = IMAGE_MIRROR_MAX_BYTES,
+                 thumbnail_size: int = IMAGE_MIRROR_THUMBNAIL_SIZE, timeout_seconds: float = IMAGE_TIMEOUT_SECONDS):
+        self.base_dir = base_dir
+        self.manifest_dir = os.path.join(base_dir, MANIFEST_SUBDIR)
+        os.makedirs(self.manifest_dir, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.thumbnail_size = thumbnail_size
+        self.timeout_seconds = timeout_seconds
+        self.manifests = LRUCache(maxsize=MANIFEST_CACHE_SIZE, name="image_mirror")
+        metrics.register_cache(self.manifests.name, self.manifests.stats)
+        if Image is None:
+            logger.info("Pillow não instalado: imagens espelhadas no formato original, miniaturas do Pixabay.")
+
+    def _manifest_path(self, word: str) -> str:
+        return os.path.join(self.manifest_dir, f"{_safe_word(word)}-{stable_content_key('image_manifest', word)[:16]}.json")
+
+    def _read_manifest(self, word: str) -> Optional[WordImages]:
+        try:
+            with open(self._manifest_path(word), encoding="utf-8") as manifest_file:
+                data = json.load(manifest_file)
+            return WordImages(word=data["word"], images=[MirroredImage(**image) for image in data["images"]])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Manifesto de imagens inválido para '{word}': {e}")
+            return None
+
+    def _write_atomic(self, path: str, content: bytes) -> None:
+        directory = os.path.dirname(path)
+        temp_fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(temp_fd, "wb") as temp_file:
+                temp_file.write(content)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    async def lookup(self, word: str) -> Optional[WordImages]:
+        """Imagens já espelhadas da palavra (sem acessar a rede); None se a palavra nunca foi espelhada."""
+        found, cached = self.manifests.get(word)
+        if found:
+            return cached
+        word_images = await asyncio.to_thread(self._read_manifest, word)
+        if word_images is not None:
+            self.manifests.put(word, word_images)
+        return word_images
+
+    async def mirror(self, word: str, hits: Sequence[Dict[str, Any]]) -> WordImages:
+        """Baixa todas as imagens devolvidas pelo Pixabay (em paralelo) e grava o manifesto da palavra."""
+        hits = [hit for hit in hits if hit.get("webformatURL")]
+        async with httpx.AsyncClient(timeout=self.timeout_seconds, follow_redirects=True) as client:
+            images = await asyncio.gather(*(self._mirror_hit(client, word, hit) for hit in hits))
+        word_images = WordImages(word=word, images=list(images))
+        if any(image.filename for image in word_images.images):
+            manifest = json.dumps({"word": word, "images": [asdict(image) for image in word_images.images]}, ensure_ascii=False)
+            await asyncio.to_thread(self._write_atomic, self._manifest_path(word), manifest.encode("utf-8"))
+            self.manifests.put(word, word_images)
+        return word_images
+
+    async def _mirror_hit(self, client: httpx.AsyncClient, word: str, hit: Dict[str, Any]) -> MirroredImage:
+        source_url = hit["webformatURL"]
+        image = MirroredImage(source_url=source_url, tags=hit.get("tags", ""))
+        base_name = f"{_safe_word(word)}-{stable_content_key('image', source_url)[:16]}"
+        try:
+            content, content_type = await self._download(client, source_url)
+            image.filename, image.thumbnail = await asyncio.to_thread(self._store_variants, base_name, content, content_type)
+            if image.thumbnail is None and hit.get("previewURL"):
+                preview, preview_type = await self._download(client, hit["previewURL"])
+                thumbnail = f"{base_name}-thumb.{_EXTENSIONS[preview_type]}"
+                await asyncio.to_thread(self._write_atomic, os.path.join(self.base_dir, thumbnail), preview)
+                image.thumbnail = thumbnail
+        except (httpx.HTTPError, ValueError, OSError) as e:
+            metrics.upstream_errors.inc(metrics.IMAGE_BACKEND, f"mirror_{type(e).__name__}")
+            logger.warning(f"Falha ao espelhar imagem de '{word}' ({source_url}): {e}")
+        return image
+
+    async def _download(self, client: httpx.AsyncClient, url: str):
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+            if content_type not in _EXTENSIONS:
+                raise ValueError(f"tipo de conteúdo não suportado: '{content_type}'")
+            chunks, size = [], 0
+            async for chunk in response.aiter_bytes():
+                size += len(chunk)
+                if size > self.max_bytes:
+                    raise ValueError(f"imagem maior que {self.max_bytes} bytes")
+                chunks.append(chunk)
+        return b"".join(chunks), content_type
+
+    def _store_variants(self, base_name: str, content: bytes, content_type: str):
+        """Grava a imagem (e a miniatura, com Pillow); devolve (arquivo, miniatura ou None)."""
+        if Image is not None:
+            try:
+                with Image.open(io.BytesIO(content)) as picture:
+                    picture = picture.convert("RGBA" if picture.mode in ("RGBA", "LA", "P") else "RGB")
+                    filename = f"{base_name}.webp"
+                    buffer = io.BytesIO()
+                    picture.save(buffer, "WEBP", quality=WEBP_QUALITY)
+                    self._write_atomic(os.path.join(self.base_dir, filename), buffer.getvalue())
+                    picture.thumbnail((self.thumbnail_size, self.thumbnail_size))
+                    thumbnail = f"{base_name}-thumb.webp"
+                    buffer = io.BytesIO()
+                    picture.save(buffer, "WEBP", quality=WEBP_QUALITY)
+                    self._write_atomic(os.path.join(self.base_dir, thumbnail), buffer.getvalue())
+                    return filename, thumbnail
+            except Exception as e:
+                logger.warning(f"Pillow não conseguiu converter '{base_name}': {e}. Mantendo o formato original.")
+        filename = f"{base_name}.{_EXTENSIONS[content_type]}"
+        self._write_atomic(os.path.join(self.base_dir, filename), content)
+        return filename, None
+
+
+# Instância configurada na inicialização (app_config), quando IMAGE_MIRROR_ENABLED
+_image_mirror: Optional[ImageMirror] = None
+
+
+def configure_image_mirror(mirror: Optional[ImageMirror]) -> None:
+    global _image_mirror
+    _image_mirror = mirror
+
+
+def get_image_mirror() -> Optional[ImageMirror]:
+    return _image_mirror
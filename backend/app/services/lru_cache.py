@@ -0,0 +1,119 @@
+# backend/app/services/lru_cache.py
+"""
+Cache LRU limitado e thread-safe, com chaves estáveis e estatísticas.
+
+As chaves são hashes de conteúdo (BLAKE2b) e não dependem do `hash()` do Python,
+que é salgado por processo: a mesma palavra/definição gera a mesma chave em qualquer
+worker, o que permite compartilhar ou persistir o cache no futuro.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+_KEY_SEPARATOR = "\x1f"  # Separador de unidade: não aparece em palavras/definições
+
+
+def stable_content_key(*parts: Optional[str]) -> str:
+    """Chave estável (independente de processo) para o conteúdo informado."""
+    joined = _KEY_SEPARATOR.join("" if part is None else part for part in parts)
+    return hashlib.blake2b(joined.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class LRUCache:
+    """
+    Cache LRU com tamanho máximo configurável e, opcionalmente, tempo de vida (TTL)
+    por entrada: entradas expiradas são descartadas na leitura e contam como miss.
+    `get_or_compute` devolve o valor junto com a indicação de hit/miss da própria
+    chamada, evitando estado compartilhado entre requisições concorrentes.
+    """
+
+    def __init__(self, maxsize: int, name: str = "cache", ttl_seconds: Optional[float] = None):
+        if maxsize <= 0:
+            raise ValueError("maxsize deve ser positivo.")
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError("ttl_seconds deve ser positivo.")
+        self.maxsize = maxsize
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        # Cada entrada guarda (valor, instante de expiração ou None)
+        self._data: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Retorna (encontrado, valor) e marca a entrada como usada recentemente."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._data[key]
+                self.expirations += 1
+            self.misses += 1
+            return False, None
+
+    def peek(self, key: Hashable) -> Tuple[bool, Any]:
+        """Como `get`, mas sem alterar a ordem LRU nem as estatísticas."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or (entry[1] is not None and entry[1] <= time.monotonic()):
+                return False, None
+            return True, entry[0]
+
+    def put(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Insere/atualiza a entrada. `ttl_seconds` sobrepõe o TTL padrão do cache (só pode reduzi-lo)."""
+        ttl = self.ttl_seconds
+        if ttl_seconds is not None:
+            ttl = ttl_seconds if ttl is None else min(ttl, ttl_seconds)
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Retorna (valor, cache_hit). Em caso de miss, `compute` é executado fora do lock;
+        chamadas concorrentes para a mesma chave podem calcular o valor mais de uma vez.
+        """
+        found, value = self.get(key)
+        if found:
+            return value, True
+        value = compute()
+        self.put(key, value)
+        return value, False
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'name': self.name,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+            }
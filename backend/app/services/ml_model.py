@@ -1,101 +1,345 @@
-import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import accuracy_score
-import joblib
-import os
-
-BACKEND_ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-MODEL_FILE_PATH = os.path.join(BACKEND_ROOT_DIR, 'difficulty_model.pkl')
-
-DIFFICULTY_LEVELS = {"Fácil": 0, "Médio": 1, "Difícil": 2}
-REVERSE_DIFFICULTY_LEVELS = {v: k for k, v in DIFFICULTY_LEVELS.items()}
-
-def train_model(data: pd.DataFrame):
-    """
-    Treina um modelo de classificação para prever a dificuldade.
-    O DataFrame 'data' deve ter colunas como:
-    'accuracy' (0.0-1.0), 'avg_time' (em segundos), 'word_length', 'difficulty_level' (0, 1 ou 2)
-    """
-    features = ['accuracy', 'avg_time', 'word_length']
-    target = 'difficulty_level'
-    
-    X = data[features]
-    y = data[target]
-    
-    if len(X) < 10:
-        print("Dados insuficientes para treinamento do modelo (<10 amostras).")
-        return None
-
-    if len(y.unique()) < 2:
-        print("Dados de treinamento contêm menos de duas classes de dificuldade. Modelo não será treinado.")
-        return None
-        
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y if len(y.unique()) > 1 else None)
-    
-    model = LogisticRegression()
-    model.fit(X_train, y_train)
-    
-    joblib.dump(model, MODEL_FILE_PATH)
-    
-    accuracy = accuracy_score(y_test, model.predict(X_test))
-    print(f"Modelo treinado e salvo em {MODEL_FILE_PATH} com acurácia de: {accuracy:.2f}")
-    return model
-
-def predict_difficulty(user_performance: dict) -> int:
-    """
-    Prevê a próxima dificuldade com base no desempenho do usuário.
-    user_performance = {'accuracy': 0.85, 'avg_time': 5.2, 'word_length': 7}
-    Retorna um inteiro representando o nível de dificuldade (0, 1, ou 2).
-    """
-    try:
-        model = joblib.load(MODEL_FILE_PATH)
-        df_performance = pd.DataFrame([user_performance])
-        features_expected = ['accuracy', 'avg_time', 'word_length']
-        df_performance = df_performance[features_expected]
-
-        prediction = model.predict(df_performance)
-        predicted_level = prediction[0]
-        print(f"Previsão de dificuldade: Nível {predicted_level} ({REVERSE_DIFFICULTY_LEVELS.get(predicted_level, 'Desconhecido')})")
-        return predicted_level
-    except FileNotFoundError:
-        print(f"Arquivo do modelo não encontrado em {MODEL_FILE_PATH}. Retornando dificuldade Média por padrão.")
-        return DIFFICULTY_LEVELS["Médio"]
-    except Exception as e:
-        print(f"Erro ao prever dificuldade: {e}. Retornando dificuldade Média por padrão.")
-        return DIFFICULTY_LEVELS["Médio"]
-
-if __name__ == '__main__':
-    sample_data = {
-        'accuracy': [0.9, 0.8, 0.95, 0.7, 0.6, 0.85, 0.92, 0.75, 0.65, 0.98, 0.5, 0.77, 0.88],
-        'avg_time': [5.0, 7.1, 4.5, 8.0, 9.5, 6.0, 5.3, 7.5, 8.8, 4.0, 10.0, 7.2, 5.8],
-        'word_length': [4, 5, 3, 7, 8, 5, 4, 6, 7, 3, 9, 6, 5],
-        'difficulty_level': [0, 1, 0, 1, 2, 1, 0, 1, 2, 0, 2, 1, 0]
-    }
-    df_train = pd.DataFrame(sample_data)
-    
-    print("--- Treinando Modelo ---")
-    trained_model = train_model(df_train)
-    
-    if trained_model:
-        print("\n--- Testando Predição ---")
-        performance_easy = {'accuracy': 0.95, 'avg_time': 4.0, 'word_length': 4}
-        performance_medium = {'accuracy': 0.80, 'avg_time': 7.0, 'word_length': 6}
-        performance_hard = {'accuracy': 0.60, 'avg_time': 9.0, 'word_length': 8}
-        
-        print(f"Desempenho (esperado Fácil): {performance_easy}")
-        predict_difficulty(performance_easy)
-        
-        print(f"Desempenho (esperado Médio): {performance_medium}")
-        predict_difficulty(performance_medium)
-
-        print(f"Desempenho (esperado Difícil): {performance_hard}")
-        predict_difficulty(performance_hard)
-    else:
-        print("Treinamento do modelo falhou ou foi pulado.")
-
-    print("\n--- Testando Predição sem modelo treinado (deve usar fallback) ---")
-    if os.path.exists(MODEL_FILE_PATH):
-        os.remove(MODEL_FILE_PATH)
-        print(f"Arquivo {MODEL_FILE_PATH} removido para teste de fallback.")
+import os
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Mapping, Optional, Sequence, Tuple, Union
+
+from ..core.config import MODEL_RELOAD_CHECK_SECONDS
+
+# pandas/scikit-learn/joblib/numpy são importados apenas dentro das funções:
+# o módulo pode ser importado na inicialização da API sem custo.
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+BACKEND_ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+MODEL_FILE_PATH = os.path.join(BACKEND_ROOT_DIR, 'difficulty_model.pkl')
+# Artefatos versionados gerados pelo treinamento em streaming (o ativo é copiado para MODEL_FILE_PATH)
+MODEL_ARTIFACTS_DIR = os.path.join(BACKEND_ROOT_DIR, 'model_artifacts')
+
+DIFFICULTY_LEVELS = {"Fácil": 0, "Médio": 1, "Difícil": 2}
+REVERSE_DIFFICULTY_LEVELS = {v: k for k, v in DIFFICULTY_LEVELS.items()}
+# Ordem das colunas esperada pelo modelo (e pelas matrizes de predict_difficulty_many)
+FEATURE_COLUMNS = ('accuracy', 'avg_time', 'word_length')
+
+def train_model(data: Union['pd.DataFrame', Mapping[str, Sequence]]):
+    """
+    Treina um modelo de classificação para prever a dificuldade.
+    'data' (DataFrame, ou colunas -> valores) deve ter colunas como:
+    'accuracy' (0.0-1.0), 'avg_time' (em segundos), 'word_length', 'difficulty_level' (0, 1 ou 2)
+    """
+    import joblib
+    import pandas as pd
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.metrics import accuracy_score
+    from sklearn.model_selection import train_test_split
+
+    features = list(FEATURE_COLUMNS)
+    target = 'difficulty_level'
+    
+    data = pd.DataFrame(data)
+    X = data[features]
+    y = data[target]
+    
+    if len(X) < 10:
+        print("Dados insuficientes para treinamento do modelo (<10 amostras).")
+        return None
+
+    if len(y.unique()) < 2:
+        print("Dados de treinamento contêm menos de duas classes de dificuldade. Modelo não será treinado.")
+        return None
+        
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y if len(y.unique()) > 1 else None)
+    
+    model = LogisticRegression()
+    model.fit(X_train, y_train)
+    
+    joblib.dump(model, MODEL_FILE_PATH)
+    difficulty_model_registry.load()
+    
+    accuracy = accuracy_score(y_test, model.predict(X_test))
+    print(f"Modelo treinado e salvo em {MODEL_FILE_PATH} com acurácia de: {accuracy:.2f}")
+    return model
+
+class DifficultyModelRegistry:
+    """
+    Mantém o modelo de dificuldade carregado em memória.
+
+    O arquivo é lido uma única vez (na inicialização da aplicação ou no primeiro uso) e
+    recarregado apenas quando seu mtime muda; a verificação do mtime é feita no máximo a
+    cada `check_interval` segundos, então o caminho de predição não toca o disco.
+    Para modelos lineares (ex: LogisticRegression) os coeficientes são extraídos e a
+    predição é um único produto matricial em NumPy, sem DataFrame nem `model.predict`.
+    """
+
+    def __init__(self, model_path: str = MODEL_FILE_PATH, check_interval: float = MODEL_RELOAD_CHECK_SECONDS):
+        self.model_path = model_path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._model: Any = None
+        self._coef: Optional['np.ndarray'] = None
+        self._intercept: Optional['np.ndarray'] = None
+        self._classes: Optional['np.ndarray'] = None
+        self._loaded_mtime: Optional[float] = None
+        self._next_check = 0.0
+        self.reloads = 0
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._model is not None
+
+    def _file_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.model_path).st_mtime
+        except OSError:
+            return None
+
+    def load(self) -> bool:
+        """Carrega (ou recarrega) o modelo do disco. Retorna True se houver um modelo disponível."""
+        import joblib
+        import numpy as np
+
+        with self._lock:
+            mtime = self._file_mtime()
+            self._next_check = time.monotonic() + self.check_interval
+            if mtime is None:
+                if self._model is not None:
+                    logger.warning(f"Arquivo do modelo removido ({self.model_path}); mantendo a versão em memória.")
+                else:
+                    logger.info(f"Arquivo do modelo não encontrado em {self.model_path}. Predições usarão a dificuldade padrão.")
+                return self._model is not None
+            if mtime == self._loaded_mtime:
+                return True
+            try:
+                model = joblib.load(self.model_path)
+            except Exception as e:
+                logger.error(f"Erro ao carregar o modelo de dificuldade de {self.model_path}: {e}")
+                return self._model is not None
+
+            coef = getattr(model, 'coef_', None)
+            intercept = getattr(model, 'intercept_', None)
+            classes = getattr(model, 'classes_', None)
+            if coef is not None and intercept is not None and classes is not None:
+                self._coef = np.ascontiguousarray(np.asarray(coef, dtype=np.float64).T)
+                self._intercept = np.asarray(intercept, dtype=np.float64)
+                self._classes = np.asarray(classes)
+            else:
+                self._coef = self._intercept = self._classes = None
+            self._model = model
+            self._loaded_mtime = mtime
+            self.reloads += 1
+            logger.info(f"Modelo de dificuldade carregado de {self.model_path} (mtime={mtime}).")
+            return True
+
+    def _refresh_if_stale(self) -> None:
+        if time.monotonic() < self._next_check:
+            return
+        if self._file_mtime() != self._loaded_mtime:
+            self.load()
+        else:
+            self._next_check = time.monotonic() + self.check_interval
+
+    def predict_many(self, features: 'np.ndarray') -> Optional['np.ndarray']:
+        """
+        Prediz os níveis para uma matriz (n, len(FEATURE_COLUMNS)).
+        Retorna None se nenhum modelo estiver disponível.
+        """
+        import numpy as np
+
+        self._refresh_if_stale()
+        model, coef, intercept, classes = self._model, self._coef, self._intercept, self._classes
+        if model is None:
+            return None
+        features = np.asarray(features, dtype=np.float64)
+        if features.ndim == 1:
+            features = features.reshape(1, -1)
+        if coef is None:
+            return np.asarray(model.predict(features))
+        decision = features @ coef + intercept
+        if decision.shape[1] == 1:  # Classificação binária: um único hiperplano
+            return classes[(decision[:, 0] > 0).astype(np.intp)]
+        return classes[decision.argmax(axis=1)]
+
+
+# Registro compartilhado pelo processo (carregado na inicialização da aplicação)
+difficulty_model_registry = DifficultyModelRegistry()
+
+
+def predict_difficulty_many(features: 'np.ndarray') -> 'np.ndarray':
+    """
+    Versão em lote de `predict_difficulty`.
+    `features` é uma matriz (n, 3) com as colunas de FEATURE_COLUMNS.
+    Sem modelo disponível, todas as linhas recebem a dificuldade Média.
+    """
+    import numpy as np
+
+    predictions = difficulty_model_registry.predict_many(features)
+    if predictions is None:
+        rows = np.asarray(features).reshape(-1, len(FEATURE_COLUMNS)).shape[0]
+        return np.full(rows, DIFFICULTY_LEVELS["Médio"], dtype=np.int64)
+    return predictions
+
+
+def predict_difficulty(user_performance: dict) -> int:
+    """
+    Prevê a próxima dificuldade com base no desempenho do usuário.
+    user_performance = {'accuracy': 0.85, 'avg_time': 5.2, 'word_length': 7}
+    Retorna um inteiro representando o nível de dificuldade (0, 1, ou 2).
+    """
+    try:
+        row = [[float(user_performance[column]) for column in FEATURE_COLUMNS]]
+        predicted_level = int(predict_difficulty_many(row)[0])
+        logger.debug(f"Previsão de dificuldade: Nível {predicted_level} ({REVERSE_DIFFICULTY_LEVELS.get(predicted_level, 'Desconhecido')})")
+        return predicted_level
+    except Exception as e:
+        logger.error(f"Erro ao prever dificuldade: {e}. Retornando dificuldade Média por padrão.")
+        return DIFFICULTY_LEVELS["Médio"]
+
+# Fonte de dados do treinamento em streaming: cada chamada devolve um novo iterador
+# de lotes (features (n, 3), rótulos (n,)), permitindo várias passadas sem manter o histórico em memória.
+TrainingChunkSource = Callable[[], Iterable[Tuple['np.ndarray', 'np.ndarray']]]
+
+
+def _split_holdout(offset: int, size: int, holdout_every: int) -> 'np.ndarray':
+    """Máscara determinística de validação: uma a cada `holdout_every` linhas do fluxo."""
+    import numpy as np
+
+    return (np.arange(offset, offset + size) % holdout_every) == 0
+
+
+def train_model_streaming(
+    chunk_source: TrainingChunkSource,
+    epochs: int = 5,
+    holdout_every: int = 5,
+    progress: Optional[Callable[[str, int], None]] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Treina o modelo de dificuldade de forma incremental, lote a lote.
+
+    1. Uma passada ajusta a normalização (StandardScaler.partial_fit) e conta as classes;
+    2. `epochs` passadas de SGDClassifier(log_loss).partial_fit;
+    3. uma passada final mede a acurácia nas linhas de validação.
+    A normalização é incorporada aos coeficientes, então o artefato salvo é um modelo
+    linear simples (coef_/intercept_/classes_), usado diretamente pelo DifficultyModelRegistry.
+    Retorna os metadados da versão gerada, ou None se os dados forem insuficientes.
+    """
+    import joblib
+    import numpy as np
+    from sklearn.linear_model import SGDClassifier
+    from sklearn.preprocessing import StandardScaler
+
+    def report(stage: str, rows: int) -> None:
+        if progress:
+            progress(stage, rows)
+
+    scaler = StandardScaler()
+    class_counts: Dict[int, int] = {}
+    train_rows = 0
+    offset = 0
+    for features, labels in chunk_source():
+        train_mask = ~_split_holdout(offset, len(labels), holdout_every)
+        offset += len(labels)
+        if train_mask.any():
+            scaler.partial_fit(features[train_mask])
+            for level, count in zip(*np.unique(labels[train_mask], return_counts=True)):
+                class_counts[int(level)] = class_counts.get(int(level), 0) + int(count)
+            train_rows += int(train_mask.sum())
+        report("scaling", offset)
+
+    if train_rows < 10:
+        logger.warning(f"Dados insuficientes para treinamento do modelo ({train_rows} amostras de treino).")
+        return None
+    if len(class_counts) < 2:
+        logger.warning("Dados de treinamento contêm menos de duas classes de dificuldade. Modelo não será treinado.")
+        return None
+
+    classes = np.array(sorted(DIFFICULTY_LEVELS.values()))
+    model = SGDClassifier(loss='log_loss', random_state=42)
+    for epoch in range(epochs):
+        offset = 0
+        for features, labels in chunk_source():
+            train_mask = ~_split_holdout(offset, len(labels), holdout_every)
+            offset += len(labels)
+            if train_mask.any():
+                model.partial_fit(scaler.transform(features[train_mask]), labels[train_mask], classes=classes)
+        report(f"epoch {epoch + 1}/{epochs}", offset)
+
+    # Incorpora a normalização: w·((x - μ)/σ) + b == (w/σ)·x + (b - w·μ/σ)
+    scale = np.where(scaler.scale_ > 0, scaler.scale_, 1.0)
+    coef = model.coef_ / scale
+    model.intercept_ = model.intercept_ - coef @ scaler.mean_
+    model.coef_ = coef
+
+    holdout_rows = 0
+    holdout_correct = 0
+    offset = 0
+    for features, labels in chunk_source():
+        holdout_mask = _split_holdout(offset, len(labels), holdout_every)
+        offset += len(labels)
+        if holdout_mask.any():
+            predicted = model.predict(features[holdout_mask])
+            holdout_correct += int((predicted == labels[holdout_mask]).sum())
+            holdout_rows += int(holdout_mask.sum())
+    report("evaluation", offset)
+
+    version = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    os.makedirs(MODEL_ARTIFACTS_DIR, exist_ok=True)
+    artifact_path = os.path.join(MODEL_ARTIFACTS_DIR, f"difficulty_model_{version}.pkl")
+    joblib.dump(model, artifact_path)
+
+    # Publica a nova versão de forma atômica; o registro a recarrega pelo mtime
+    temp_path = f"{MODEL_FILE_PATH}.{version}.tmp"
+    joblib.dump(model, temp_path)
+    os.replace(temp_path, MODEL_FILE_PATH)
+    difficulty_model_registry.load()
+
+    metadata = {
+        'version': version,
+        'artifact_path': artifact_path,
+        'train_rows': train_rows,
+        'holdout_rows': holdout_rows,
+        'holdout_accuracy': (holdout_correct / holdout_rows) if holdout_rows else None,
+        'class_counts': {REVERSE_DIFFICULTY_LEVELS.get(level, str(level)): count for level, count in sorted(class_counts.items())},
+        'epochs': epochs,
+    }
+    with open(os.path.splitext(artifact_path)[0] + ".json", "w", encoding="utf-8") as metadata_file:
+        json.dump(metadata, metadata_file, ensure_ascii=False, indent=2)
+    logger.info(f"Modelo versão {version} treinado em streaming ({train_rows} linhas) e publicado em {MODEL_FILE_PATH}.")
+    return metadata
+
+if __name__ == '__main__':
+    sample_data = {
+        'accuracy': [0.9, 0.8, 0.95, 0.7, 0.6, 0.85, 0.92, 0.75, 0.65, 0.98, 0.5, 0.77, 0.88],
+        'avg_time': [5.0, 7.1, 4.5, 8.0, 9.5, 6.0, 5.3, 7.5, 8.8, 4.0, 10.0, 7.2, 5.8],
+        'word_length': [4, 5, 3, 7, 8, 5, 4, 6, 7, 3, 9, 6, 5],
+        'difficulty_level': [0, 1, 0, 1, 2, 1, 0, 1, 2, 0, 2, 1, 0]
+    }
+    print("--- Treinando Modelo ---")
+    trained_model = train_model(sample_data)
+    
+    if trained_model:
+        print("\n--- Testando Predição ---")
+        performance_easy = {'accuracy': 0.95, 'avg_time': 4.0, 'word_length': 4}
+        performance_medium = {'accuracy': 0.80, 'avg_time': 7.0, 'word_length': 6}
+        performance_hard = {'accuracy': 0.60, 'avg_time': 9.0, 'word_length': 8}
+        
+        print(f"Desempenho (esperado Fácil): {performance_easy}")
+        predict_difficulty(performance_easy)
+        
+        print(f"Desempenho (esperado Médio): {performance_medium}")
+        predict_difficulty(performance_medium)
+
+        print(f"Desempenho (esperado Difícil): {performance_hard}")
+        predict_difficulty(performance_hard)
+    else:
+        print("Treinamento do modelo falhou ou foi pulado.")
+
+    print("\n--- Testando Predição sem modelo treinado (deve usar fallback) ---")
+    if os.path.exists(MODEL_FILE_PATH):
+        os.remove(MODEL_FILE_PATH)
+        print(f"Arquivo {MODEL_FILE_PATH} removido para teste de fallback.")
     predict_difficulty({'accuracy': 0.7, 'avg_time': 6.0, 'word_length': 5})
\ No newline at end of file
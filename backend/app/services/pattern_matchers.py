@@ -0,0 +1,141 @@
+# backend/app/services/pattern_matchers.py
+"""
+Casadores de padrões compilados para o WordComplexityAnalyzer.
+
+- PrefixTrie: detecta prefixos em uma única passada sobre o início da palavra.
+- SuffixTrie: trie de sufixos invertidos, percorrida do fim da palavra para o início.
+- AhoCorasick: autômato para buscar todas as palavras-chave de vários conjuntos
+  em um texto com uma única passada linear, independente do tamanho das listas.
+"""
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple
+
+
+class _TrieNode:
+    __slots__ = ("children", "terminal")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.terminal: Optional[str] = None  # Padrão que termina neste nó
+
+
+class PrefixTrie:
+    """Trie de prefixos. O custo de uma busca depende do tamanho da palavra, não da lista."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._root = _TrieNode()
+        for pattern in patterns:
+            self.add(pattern)
+
+    def add(self, pattern: str) -> None:
+        pattern = pattern.lower()
+        if not pattern:
+            return
+        node = self._root
+        for char in self._ordered(pattern):
+            node = node.children.setdefault(char, _TrieNode())
+        node.terminal = pattern
+
+    def _ordered(self, text: str) -> Iterable[str]:
+        return text
+
+    def longest_match(self, word: str) -> Optional[str]:
+        """Retorna o padrão mais longo que casa com a palavra (ou None)."""
+        node = self._root
+        match = None
+        for char in self._ordered(word):
+            node = node.children.get(char)
+            if node is None:
+                break
+            if node.terminal is not None:
+                match = node.terminal
+        return match
+
+    def matches(self, word: str) -> bool:
+        """True se algum padrão casa com a palavra (interrompe no primeiro casamento)."""
+        node = self._root
+        for char in self._ordered(word):
+            node = node.children.get(char)
+            if node is None:
+                return False
+            if node.terminal is not None:
+                return True
+        return False
+
+
+class SuffixTrie(PrefixTrie):
+    """Trie de sufixos: os padrões são armazenados invertidos e a palavra é lida do fim."""
+
+    def _ordered(self, text: str) -> Iterable[str]:
+        return reversed(text)
+
+
+class AhoCorasick:
+    """
+    Autômato de Aho–Corasick sobre padrões rotulados por categoria.
+    `find_categories` percorre o texto uma vez e devolve, por categoria,
+    o conjunto de padrões distintos encontrados (inclusive sobrepostos).
+    """
+
+    def __init__(self, patterns_by_category: Mapping[str, Iterable[str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[Tuple[str, str], ...]] = [()]
+        self.categories: Tuple[str, ...] = tuple(patterns_by_category)
+
+        for category, patterns in patterns_by_category.items():
+            for pattern in patterns:
+                pattern = pattern.lower()
+                if pattern:
+                    self._insert(pattern, category)
+        self._build_failure_links()
+
+    def _insert(self, pattern: str, category: str) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        self._output[state] = self._output[state] + ((category, pattern),)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                candidate = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = candidate if candidate != next_state else 0
+                # Herda as saídas do estado de falha (padrões que são sufixos deste)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find_categories(self, text: str) -> Dict[str, FrozenSet[str]]:
+        """Padrões distintos encontrados em `text`, agrupados por categoria."""
+        found: Dict[str, Set[str]] = {category: set() for category in self.categories}
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for category, pattern in output[state]:
+                found[category].add(pattern)
+        return {category: frozenset(patterns) for category, patterns in found.items()}
+
+    def first_category(self, text: str, priority: Iterable[str]) -> Optional[str]:
+        """Primeira categoria (na ordem de `priority`) com pelo menos um padrão presente em `text`."""
+        found = self.find_categories(text)
+        for category in priority:
+            if found.get(category):
+                return category
+        return None
@@ -0,0 +1,128 @@
+# backend/app/services/prefetch_service.py
+"""
+Dicas de pré-carregamento para os próximos exercícios prováveis.
+
+A seleção devolve, além do exercício escolhido, as alternativas do top-k e os dados já
+enriquecidos dessas palavras. Para cada uma, este serviço monta a URL da imagem e a URL do
+áudio (e, no plano de exercícios, os dados do exercício) a partir desses dados, sem novo
+enriquecimento, para que o cliente baixe a mídia enquanto o aluno resolve o exercício atual.
+
+O aquecimento (`warm_word_assets`) roda em segundo plano com a instância configurada do
+WordInfoService: apenas executa o enriquecimento das palavras, o que preenche os caches de
+definição e de imagem do serviço (ou o manifesto do espelho de imagens), o áudio gerado em
+disco e o cache de complexidade. Os pedidos seguintes da palavra não consultam o dicionário
+nem o Pixabay até o cache expirar (UPSTREAM_RESULT_CACHE_TTL_SECONDS).
+"""
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from .. import schemas
+from .exercise_data_service import ExerciseDataService
+from ..word_info_endpoint import StaticURLBuilder, WordInfoService, get_configured_word_info_service
+from .rate_limiter import background_lane
+
+logger = logging.getLogger(__name__)
+
+# Gerador de dados de cada tipo de exercício (o ditado usa apenas o áudio da palavra)
+PAYLOAD_GENERATORS = {
+    'MCQ_definition': 'generate_multiple_choice_exercise_data',
+    'MCQ_image': 'generate_mcq_image_exercise_data',
+    'define_word': 'generate_define_word_exercise_data',
+    'complete_sentence': 'generate_complete_sentence_exercise_data',
+}
+
+
+class PrefetchService:
+    def __init__(self, word_info_service: WordInfoService, exercise_data_service: ExerciseDataService,
+                 static_urls: Optional[StaticURLBuilder] = None):
+        self.word_info_service = word_info_service
+        self.exercise_data_service = exercise_data_service
+        self.static_urls = static_urls
+
+    async def build_hint(self, candidate: schemas.ExerciseCandidate, word_data: Optional[Dict[str, Any]] = None,
+                         include_payload: bool = False) -> Optional[schemas.PrefetchHint]:
+        """
+        Dica para um candidato; falhas não interrompem a resposta principal (retorna None).
+        Com `word_data` (dados já enriquecidos na seleção), a palavra não é enriquecida de novo;
+        os dados do exercício só são gerados com `include_payload`.
+        """
+        try:
+            if word_data is None:
+                word_data = await self.word_info_service._get_word_info_data_internal(candidate.word_text)
+            word_info = self.word_info_service.build_word_info_response(candidate.word_text, word_data, self.static_urls)
+            payload = None
+            generator_name = PAYLOAD_GENERATORS.get(candidate.exercise_type)
+            if include_payload and generator_name:
+                exercise_data = await getattr(self.exercise_data_service, generator_name)(candidate.word_text, word_info=word_data)
+                if exercise_data:
+                    payload = exercise_data.model_dump()
+            return schemas.PrefetchHint(
+                word_text=candidate.word_text,
+                exercise_type=candidate.exercise_type,
+                image_url=word_info.image_url,
+                audio_url=word_info.audio_url,
+                word_info=word_info,
+                exercise_payload=payload,
+            )
+        except Exception as e:
+            logger.warning(f"Falha ao montar dica de pré-carregamento para '{candidate.word_text}' ({candidate.exercise_type}): {e}")
+            return None
+
+    async def build_hints(self, candidates: Sequence[schemas.ExerciseCandidate], limit: int,
+                          word_data: Optional[Dict[str, Dict[str, Any]]] = None,
+                          include_payloads: bool = False) -> List[schemas.PrefetchHint]:
+        # Sequencial: os serviços compartilham a mesma sessão do banco.
+        # As dicas são especulativas: se alguma palavra chegar sem os dados da seleção e precisar
+        # consultar o Pixabay, a chamada usa a faixa de fundo e não as fichas dos pedidos interativos.
+        word_data = word_data or {}
+        hints: List[schemas.PrefetchHint] = []
+        with background_lane():
+            for candidate in candidates[:max(limit, 0)]:
+                hint = await self.build_hint(candidate, word_data.get(candidate.word_text), include_payload=include_payloads)
+                if hint:
+                    hints.append(hint)
+        return hints
+
+
+# Palavras sendo aquecidas neste processo (evita trabalho duplicado entre pedidos simultâneos)
+_warming_words = set()
+_warming_lock = threading.Lock()
+
+
+def claim_words_for_warming(word_texts: Iterable[str]) -> List[str]:
+    """Normaliza, remove duplicatas e reserva as palavras que ainda não estão sendo aquecidas."""
+    claimed: List[str] = []
+    with _warming_lock:
+        for word_text in word_texts:
+            normalized = word_text.strip().lower()
+            if normalized and normalized not in _warming_words:
+                _warming_words.add(normalized)
+                claimed.append(normalized)
+    return claimed
+
+
+async def warm_word_assets(word_texts: Sequence[str]) -> int:
+    """
+    Executa o enriquecimento das palavras (já reservadas com claim_words_for_warming)
+    para popular os caches. Retorna quantas foram aquecidas com sucesso.
+    As chamadas a APIs com limite de taxa (Pixabay) usam a faixa de fundo do limitador.
+    """
+    warmed = 0
+    try:
+        word_info_service = get_configured_word_info_service()
+        if word_info_service is None:
+            logger.warning("Aquecimento ignorado: WordInfoService não configurado.")
+            return 0
+        with background_lane():
+            for word_text in word_texts:
+                try:
+                    if await word_info_service._get_word_info_data_internal(word_text):
+                        warmed += 1
+                except Exception as e:
+                    logger.warning(f"Falha ao aquecer caches para '{word_text}': {e}")
+    finally:
+        with _warming_lock:
+            _warming_words.difference_update(word_texts)
+    logger.info(f"Aquecimento concluído: {warmed}/{len(word_texts)} palavras.")
+    return warmed
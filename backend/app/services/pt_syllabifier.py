@@ -0,0 +1,185 @@
+# backend/app/services/pt_syllabifier.py
+"""
+Silabificador rápido para o português brasileiro.
+
+Substitui o `textstat.syllable_count` (orientado ao inglês) no caminho quente do
+WordComplexityAnalyzer. É um autômato baseado em regras que percorre a palavra uma
+única vez, agrupando as vogais em núcleos silábicos (ditongos x hiatos) e
+distribuindo as consoantes entre eles (encontros consonantais e dígrafos).
+Os resultados são memorizados em uma tabela LRU.
+"""
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
+# Tamanho da tabela de memorização (palavras distintas)
+SYLLABIFIER_CACHE_SIZE = 65536
+
+VOWELS = frozenset("aeiouáéíóúâêôãõàüy")
+# Vogais que podem funcionar como semivogal (glide) em um ditongo decrescente
+WEAK_VOWELS = frozenset("iuy")
+NASAL_VOWELS = frozenset("ãõ")
+# Consoantes que podem fechar a sílaba e provocar hiato (ex: ca-ir, ru-im, ju-iz)
+HIATUS_CODAS = frozenset("rlmnz")
+
+# Dígrafos tratados como uma única consoante
+DIGRAPHS = frozenset({"ch", "lh", "nh"})
+# Encontros consonantais inseparáveis (obstruinte + líquida)
+ONSET_CLUSTERS = frozenset({
+    "bl", "br", "cl", "cr", "dr", "fl", "fr", "gl", "gr",
+    "pl", "pr", "tl", "tr", "vr",
+})
+
+
+def _tokenize(word: str) -> List[str]:
+    """
+    Divide a palavra em unidades fonológicas: vogais isoladas e consoantes,
+    juntando dígrafos (ch, lh, nh) e os grupos 'qu'/'gu' seguidos de vogal,
+    em que o 'u' não forma núcleo silábico (ex: quei-jo, guer-ra, á-gua).
+    """
+    units: List[str] = []
+    i = 0
+    length = len(word)
+    while i < length:
+        char = word[i]
+        nxt = word[i + 1] if i + 1 < length else ""
+        if char in "qg" and nxt in ("u", "ü") and i + 2 < length and word[i + 2] in VOWELS:
+            units.append(char + nxt)
+            i += 2
+            continue
+        if nxt and char + nxt in DIGRAPHS:
+            units.append(char + nxt)
+            i += 2
+            continue
+        units.append(char)
+        i += 1
+    return units
+
+
+def _is_vowel(unit: str) -> bool:
+    return len(unit) == 1 and unit in VOWELS
+
+
+def _joins_previous(units: List[str], index: int, nucleus: List[str]) -> bool:
+    """Decide se a vogal em `units[index]` forma ditongo com o núcleo corrente."""
+    if len(nucleus) != 1:
+        return False
+    previous = nucleus[0]
+    current = units[index]
+
+    # Ditongos nasais: mãe, pão, põe
+    if previous in NASAL_VOWELS and current in "eo":
+        return True
+
+    if current not in WEAK_VOWELS or current == previous:
+        return False
+
+    following = units[index + 1] if index + 1 < len(units) else ""
+    after_following = units[index + 2] if index + 2 < len(units) else ""
+    # Hiato diante de 'nh' (ra-i-nha) ou de consoante que fecha a sílaba (ca-ir, a-in-da)
+    if following == "nh":
+        return False
+    if following in HIATUS_CODAS and (not after_following or not _is_vowel(after_following)):
+        return False
+    return True
+
+
+def _nuclei_spans(units: List[str]) -> List[Tuple[int, int]]:
+    """Retorna os intervalos [início, fim) de cada núcleo vocálico em `units`."""
+    spans: List[Tuple[int, int]] = []
+    nucleus: List[str] = []
+    start = -1
+    for index, unit in enumerate(units):
+        if _is_vowel(unit):
+            if nucleus and start + len(nucleus) == index and _joins_previous(units, index, nucleus):
+                nucleus.append(unit)
+                continue
+            if nucleus:
+                spans.append((start, start + len(nucleus)))
+            nucleus = [unit]
+            start = index
+        elif nucleus:
+            spans.append((start, start + len(nucleus)))
+            nucleus = []
+    if nucleus:
+        spans.append((start, start + len(nucleus)))
+    return spans
+
+
+def _split_consonants(cluster: List[str]) -> int:
+    """
+    Quantas consoantes do grupo intervocálico ficam na coda da sílaba anterior.
+    O restante inicia a sílaba seguinte.
+    """
+    size = len(cluster)
+    if size <= 1:
+        return 0
+    if cluster[-2] + cluster[-1] in ONSET_CLUSTERS:
+        return size - 2
+    return size - 1
+
+
+@lru_cache(maxsize=SYLLABIFIER_CACHE_SIZE)
+def syllabify(word: str) -> Tuple[str, ...]:
+    """
+    Divide uma palavra em sílabas (ex: 'paralelepípedo' -> ('pa', 'ra', 'le', 'le', 'pí', 'pe', 'do')).
+    Palavras sem vogais retornam uma única sílaba com o texto original.
+    """
+    normalized = (word or "").strip().lower()
+    if not normalized:
+        return ()
+
+    units = _tokenize(normalized)
+    spans = _nuclei_spans(units)
+    if not spans:
+        return (normalized,)
+
+    syllables: List[str] = []
+    syllable_start = 0
+    for position, (_, nucleus_end) in enumerate(spans):
+        if position + 1 < len(spans):
+            next_start = spans[position + 1][0]
+            cluster = units[nucleus_end:next_start]
+            boundary = nucleus_end + _split_consonants(cluster)
+        else:
+            boundary = len(units)
+        syllables.append("".join(units[syllable_start:boundary]))
+        syllable_start = boundary
+    return tuple(syllables)
+
+
+@lru_cache(maxsize=SYLLABIFIER_CACHE_SIZE)
+def count_syllables(word: str) -> int:
+    """Número de sílabas da palavra (0 para texto vazio, mínimo 1 caso contrário)."""
+    normalized = (word or "").strip().lower()
+    if not normalized:
+        return 0
+    return max(1, len(_nuclei_spans(_tokenize(normalized))))
+
+
+def syllabify_batch(words: Iterable[str]) -> List[Tuple[str, ...]]:
+    """Versão em lote de `syllabify`; palavras repetidas são servidas pela tabela de memorização."""
+    return [syllabify(word) for word in words]
+
+
+def count_syllables_batch(words: Iterable[str]) -> List[int]:
+    """Versão em lote de `count_syllables`."""
+    return [count_syllables(word) for word in words]
+
+
+def cache_info():
+    """Estatísticas das tabelas de memorização (útil para benchmarks e métricas)."""
+    return {
+        'syllabify': syllabify.cache_info(),
+        'count_syllables': count_syllables.cache_info(),
+    }
+
+
+# Exemplo de uso (para teste local)
+if __name__ == '__main__':
+    palavras_teste = [
+        "casa", "sol", "felicidade", "paralelepípedo", "transcendência", "saúde",
+        "rainha", "cair", "ainda", "quatro", "guerra", "água", "Paraguai", "pão",
+        "muito", "história", "carro", "pneumoultramicroscopicossilicovulcanoconiose",
+    ]
+    for palavra in palavras_teste:
+        print(f"{palavra}: {'-'.join(syllabify(palavra))} ({count_syllables(palavra)} sílabas)")
@@ -0,0 +1,233 @@
+# backend/app/services/rate_limiter.py
+"""
+Limite de taxa do lado do cliente e orçamento diário para APIs com chave (Pixabay).
+
+- Balde de fichas (token bucket) compartilhado por chave de API entre todas as corrotinas
+  do processo: `rate_per_second` fichas por segundo, até `burst` acumuladas. Sem ficha
+  disponível, a chamada espera na fila da sua faixa.
+- Faixas de prioridade: 'interactive' (requisições de usuários) e 'background'
+  (aquecimento/prefetch). A fila interativa é sempre atendida primeiro e a faixa de fundo
+  só consome fichas acima de `interactive_reserve`: um aquecimento em massa não esvazia o
+  balde nem coloca uma requisição interativa atrás dele.
+- Orçamento diário (UTC) opcional: conta as chamadas do dia e informa quanto resta. A faixa
+  de fundo para ao chegar a BACKGROUND_BUDGET_FLOOR do orçamento; a interativa, ao esgotá-lo
+  (QuotaExhaustedError: o chamador responde com o valor em cache ou vazio).
+
+A faixa da chamada vem de um ContextVar (padrão: interativa); `background_lane()` marca
+um trecho como trabalho de fundo, herdado pelas tarefas criadas dentro dele.
+"""
+import asyncio
+import contextvars
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Iterator, Optional
+
+from ..core import metrics
+from .lru_cache import stable_content_key
+
+logger = logging.getLogger(__name__)
+
+LANE_INTERACTIVE = "interactive"
+LANE_BACKGROUND = "background"
+LANES = (LANE_INTERACTIVE, LANE_BACKGROUND)
+
+# Fração do orçamento diário guardada para requisições interativas
+BACKGROUND_BUDGET_FLOOR = 0.1
+
+_current_lane: contextvars.ContextVar[str] = contextvars.ContextVar("rate_limit_lane", default=LANE_INTERACTIVE)
+
+
+@contextmanager
+def background_lane() -> Iterator[None]:
+    """Chamadas feitas dentro do bloco (e nas tarefas criadas nele) usam a faixa de fundo."""
+    token = _current_lane.set(LANE_BACKGROUND)
+    try:
+        yield
+    finally:
+        _current_lane.reset(token)
+
+
+def current_lane() -> str:
+    return _current_lane.get()
+
+
+class QuotaExhaustedError(Exception):
+    """O orçamento diário (ou a parte dele disponível para a faixa) acabou; a chamada não foi feita."""
+
+    def __init__(self, name: str, lane: str):
+        super().__init__(f"Orçamento diário esgotado para '{name}' (faixa {lane}).")
+        self.name = name
+        self.lane = lane
+
+
+class DailyBudget:
+    """Chamadas por dia (UTC). `limit` 0 apenas conta, sem limitar."""
+
+    def __init__(self, limit: int):
+        self.limit = max(0, limit)
+        self._day = self._today()
+        self.used = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(timezone.utc).date().isoformat()
+
+    def _roll_over(self) -> None:
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self.used = 0
+
+    def try_consume(self, lane: str) -> bool:
+        with self._lock:
+            self._roll_over()
+            if self.limit:
+                floor = int(self.limit * BACKGROUND_BUDGET_FLOOR) if lane == LANE_BACKGROUND else 0
+                if self.limit - self.used <= floor:
+                    return False
+            self.used += 1
+            return True
+
+    def refund(self) -> None:
+        """Devolve uma chamada reservada que não chegou a ser feita (ex: espera cancelada)."""
+        with self._lock:
+            self.used = max(0, self.used - 1)
+
+    def remaining(self) -> Optional[int]:
+        """Chamadas restantes hoje (None sem limite configurado)."""
+        with self._lock:
+            self._roll_over()
+            return max(0, self.limit - self.used) if self.limit else None
+
+    def stats(self) -> Dict[str, Any]:
+        remaining = self.remaining()
+        return {'day': self._day, 'used': self.used, 'limit': self.limit, 'remaining': remaining}
+
+
+class RateLimiter:
+    def __init__(self, name: str, rate_per_second: float, burst: int, interactive_reserve: int = 0,
+                 budget: Optional[DailyBudget] = None):
+        if rate_per_second <= 0 or burst <= 0:
+            raise ValueError("rate_per_second e burst devem ser positivos.")
+        self.name = name
+        self.rate_per_second = rate_per_second
+        self.burst = float(burst)
+        self.interactive_reserve = min(max(0, interactive_reserve), burst - 1)
+        self.budget = budget or DailyBudget(0)
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        # Pausa imposta pelo servidor (ex: X-RateLimit-Remaining = 0 até o reset)
+        self._paused_until = 0.0
+        self._queues: Dict[str, Deque[int]] = {lane: deque() for lane in LANES}
+        self._tickets = itertools.count()
+        self._lock = threading.Lock()
+        self.waits = {lane: 0 for lane in LANES}
+        self.wait_seconds = {lane: 0.0 for lane in LANES}
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate_per_second)
+        self._updated_at = now
+
+    def _try_take(self, lane: str, ticket: int, now: float) -> float:
+        """Tenta pegar uma ficha para `ticket`; devolve 0 se conseguiu ou o tempo estimado até a próxima tentativa."""
+        self._refill(now)
+        if now < self._paused_until:
+            return self._paused_until - now
+        queue = self._queues[lane]
+        position = queue.index(ticket)
+        ahead = position
+        needed = 1.0
+        if lane == LANE_BACKGROUND:
+            # A faixa de fundo respeita a reserva e espera toda a fila interativa
+            ahead += len(self._queues[LANE_INTERACTIVE])
+            needed += self.interactive_reserve
+        if ahead == 0 and self._tokens >= needed:
+            self._tokens -= 1.0
+            queue.popleft()
+            return 0.0
+        return max(0.001, (ahead + needed - self._tokens) / self.rate_per_second)
+
+    async def acquire(self, lane: Optional[str] = None) -> None:
+        """Espera uma ficha na faixa (padrão: a do contexto) e consome uma chamada do orçamento."""
+        lane = lane or current_lane()
+        if not self.budget.try_consume(lane):
+            raise QuotaExhaustedError(self.name, lane)
+        started_at = time.monotonic()
+        with self._lock:
+            ticket = next(self._tickets)
+            self._queues[lane].append(ticket)
+        try:
+            while True:
+                with self._lock:
+                    wait = self._try_take(lane, ticket, time.monotonic())
+                if wait == 0.0:
+                    break
+                await asyncio.sleep(wait)
+        except BaseException:
+            with self._lock:
+                if ticket in self._queues[lane]:
+                    self._queues[lane].remove(ticket)
+            self.budget.refund()
+            raise
+        waited = time.monotonic() - started_at
+        if waited > 0.001:
+            with self._lock:
+                self.waits[lane] += 1
+                self.wait_seconds[lane] += waited
+
+    def observe_headers(self, headers) -> None:
+        """Ajusta o balde ao que o servidor informa (X-RateLimit-Remaining / X-RateLimit-Reset, em segundos)."""
+        try:
+            remaining = headers.get("X-RateLimit-Remaining")
+            reset = headers.get("X-RateLimit-Reset")
+            if remaining is None:
+                return
+            remaining = float(remaining)
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                self._tokens = min(self._tokens, remaining)
+                if remaining <= 0 and reset is not None:
+                    self._paused_until = max(self._paused_until, now + float(reset))
+                    logger.warning(f"Limite de taxa de '{self.name}' atingido no servidor; pausa de {float(reset):.0f}s.")
+        except (TypeError, ValueError):
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refill(time.monotonic())
+            stats = {
+                'name': self.name,
+                'tokens': self._tokens,
+                'waiting': {lane: len(queue) for lane, queue in self._queues.items()},
+                'waits': dict(self.waits),
+                'wait_seconds': dict(self.wait_seconds),
+            }
+        budget = self.budget.stats()
+        stats['budget_used'] = budget['used']
+        stats['budget_limit'] = budget['limit']
+        stats['budget_remaining'] = budget['remaining']
+        return stats
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def limiter_for_key(service: str, api_key: str, rate_per_minute: float, burst: int,
+                    interactive_reserve: int, daily_budget: int) -> RateLimiter:
+    """Limitador compartilhado por (serviço, chave de API) no processo; a chave não aparece no nome (métricas/logs)."""
+    name = f"{service}:{stable_content_key(api_key)[:8]}"
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = RateLimiter(name, rate_per_minute / 60.0, burst, interactive_reserve, DailyBudget(daily_budget))
+            _limiters[name] = limiter
+            metrics.register_rate_limiter(name, limiter.stats)
+        return limiter
@@ -0,0 +1,212 @@
+# backend/app/services/resilience.py
+"""
+Resiliência das chamadas às APIs externas (dicionário, Pixabay): prazo por backend,
+novas tentativas com jitter para GETs idempotentes e disjuntor (circuit breaker).
+
+- Prazo: cada tentativa usa `timeout_seconds` e o conjunto das tentativas respeita
+  `deadline_seconds`; uma nova tentativa só começa se ainda couber no prazo. A espera na
+  fila do limitador de taxa não conta no prazo (não é lentidão do backend).
+- Novas tentativas: apenas para falhas transitórias (erros de transporte/timeout e
+  HTTP 429/5xx), com espera exponencial e "full jitter" (aleatória entre 0 e o teto),
+  para não sincronizar as tentativas de requisições concorrentes.
+- Disjuntor: após `failure_threshold` falhas seguidas o backend fica 'open' e as chamadas
+  falham na hora com `CircuitOpenError` (o chamador responde com o valor em cache ou vazio).
+  Passados `reset_timeout_seconds`, uma única chamada de teste ('half_open') decide se o
+  circuito fecha ou volta a abrir.
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from ..core import metrics
+from ..core.config import (
+    UPSTREAM_RETRY_ATTEMPTS, UPSTREAM_RETRY_BASE_DELAY_MS, UPSTREAM_RETRY_MAX_DELAY_MS,
+    CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Estados do disjuntor (o código numérico é o valor do gauge nas métricas)
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_HALF_OPEN = "half_open"
+CIRCUIT_OPEN = "open"
+CIRCUIT_STATE_CODES = {CIRCUIT_CLOSED: 0, CIRCUIT_HALF_OPEN: 1, CIRCUIT_OPEN: 2}
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+_jitter_rng = random.Random()
+
+
+class CircuitOpenError(Exception):
+    """O backend está marcado como indisponível; a chamada não foi feita."""
+
+    def __init__(self, backend: str):
+        super().__init__(f"Circuito aberto para o backend '{backend}'.")
+        self.backend = backend
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int, reset_timeout_seconds: float):
+        if failure_threshold <= 0:
+            raise ValueError("failure_threshold deve ser positivo.")
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self._state = CIRCUIT_CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self.times_opened = 0
+        self.short_circuits = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == CIRCUIT_OPEN and time.monotonic() - self._opened_at >= self.reset_timeout_seconds:
+            return CIRCUIT_HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        """Indica se a chamada pode ser feita. No estado 'half_open', libera só uma chamada de teste por vez."""
+        with self._lock:
+            state = self._current_state()
+            if state == CIRCUIT_CLOSED:
+                return True
+            if state == CIRCUIT_HALF_OPEN and not self._probe_in_flight:
+                self._state = CIRCUIT_HALF_OPEN
+                self._probe_in_flight = True
+                return True
+            self.short_circuits += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != CIRCUIT_CLOSED:
+                logger.info(f"Circuito do backend '{self.name}' fechado: chamada de teste bem-sucedida.")
+            self._state = CIRCUIT_CLOSED
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state == CIRCUIT_HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != CIRCUIT_OPEN:
+                    self.times_opened += 1
+                    logger.warning(f"Circuito do backend '{self.name}' aberto após {self._consecutive_failures} falha(s) seguida(s).")
+                self._state = CIRCUIT_OPEN
+                self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def release(self) -> None:
+        """Libera a chamada de teste sem decidir o estado (ex: chamada cancelada)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            state = self._current_state()
+            return {
+                'name': self.name,
+                'state': state,
+                'state_code': CIRCUIT_STATE_CODES[state],
+                'consecutive_failures': self._consecutive_failures,
+                'times_opened': self.times_opened,
+                'short_circuits': self.short_circuits,
+            }
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: int = 3               # Total de tentativas (1 = sem novas tentativas)
+    base_delay_seconds: float = 0.1
+    max_delay_seconds: float = 1.0
+
+    def delay(self, retry_number: int) -> float:
+        """Espera antes da nova tentativa `retry_number` (1, 2, ...): full jitter sobre o teto exponencial."""
+        ceiling = min(self.max_delay_seconds, self.base_delay_seconds * (2 ** (retry_number - 1)))
+        return _jitter_rng.uniform(0, ceiling)
+
+
+class UpstreamPolicy:
+    """Prazo, novas tentativas e disjuntor de um backend externo."""
+
+    def __init__(self, backend: str, timeout_seconds: float, deadline_seconds: float,
+                 retry: RetryPolicy, breaker: CircuitBreaker):
+        self.backend = backend
+        self.timeout_seconds = timeout_seconds
+        self.deadline_seconds = deadline_seconds
+        self.retry = retry
+        self.breaker = breaker
+
+    async def get(self, client: httpx.AsyncClient, url: str,
+                  throttle: Optional[Callable[[], Awaitable[None]]] = None, **kwargs: Any) -> httpx.Response:
+        """
+        GET com prazo, novas tentativas e disjuntor. Devolve a última resposta (o chamador
+        ainda decide sobre 4xx com raise_for_status) ou propaga o último erro de transporte.
+        Levanta CircuitOpenError sem fazer a chamada se o circuito estiver aberto.
+        `throttle`, se informado, é aguardado antes de cada tentativa (ex: RateLimiter.acquire);
+        o relógio do prazo fica parado enquanto a chamada espera na fila.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(self.backend)
+
+        started_at = time.monotonic()
+        throttled_seconds = 0.0
+        attempt = 0
+        try:
+            while True:
+                attempt += 1
+                if throttle is not None:
+                    queued_at = time.monotonic()
+                    await throttle()
+                    throttled_seconds += time.monotonic() - queued_at
+                remaining = self.deadline_seconds - (time.monotonic() - started_at - throttled_seconds)
+                timeout = max(0.001, min(self.timeout_seconds, remaining))
+                failure: Optional[BaseException] = None
+                response: Optional[httpx.Response] = None
+                try:
+                    response = await client.get(url, timeout=timeout, **kwargs)
+                except (httpx.TimeoutException, httpx.TransportError) as e:
+                    failure = e
+                if response is not None and response.status_code not in RETRYABLE_STATUS_CODES:
+                    self.breaker.record_success()
+                    return response
+
+                delay = self.retry.delay(attempt)
+                elapsed = time.monotonic() - started_at - throttled_seconds
+                if attempt >= self.retry.attempts or elapsed + delay >= self.deadline_seconds:
+                    self.breaker.record_failure()
+                    if failure is not None:
+                        raise failure
+                    return response
+                reason = type(failure).__name__ if failure is not None else f"HTTP {response.status_code}"
+                logger.info(f"Nova tentativa {attempt + 1}/{self.retry.attempts} para '{self.backend}' em {delay:.3f}s ({reason}).")
+                metrics.upstream_retries.inc(self.backend)
+                await asyncio.sleep(delay)
+        except BaseException:
+            # Cancelamento ou erro inesperado: não conta como falha do backend, mas libera a chamada de teste
+            self.breaker.release()
+            raise
+
+
+def build_upstream_policy(backend: str, timeout_seconds: float, deadline_seconds: float) -> UpstreamPolicy:
+    """Política com as novas tentativas e o disjuntor configurados; o disjuntor é exposto nas métricas."""
+    breaker = CircuitBreaker(backend, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS)
+    metrics.register_circuit_breaker(backend, breaker.stats)
+    retry = RetryPolicy(
+        attempts=max(1, UPSTREAM_RETRY_ATTEMPTS),
+        base_delay_seconds=UPSTREAM_RETRY_BASE_DELAY_MS / 1000.0,
+        max_delay_seconds=UPSTREAM_RETRY_MAX_DELAY_MS / 1000.0,
+    )
+    return UpstreamPolicy(backend, timeout_seconds, deadline_seconds, retry, breaker)
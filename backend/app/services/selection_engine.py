@@ -0,0 +1,103 @@
+# backend/app/services/selection_engine.py
+"""
+Seleção ranqueada dos candidatos de exercício.
+
+Os candidatos pontuados são inseridos em um heap limitado (memória O(k), independente
+do tamanho do pool) e a escolha final aplica uma estratégia de exploração:
+- 'greedy': sempre o melhor score;
+- 'epsilon': com probabilidade epsilon, um dos top-k ao acaso (epsilon-greedy);
+- 'softmax': amostra proporcional a exp(score / temperatura) entre os top-k;
+- 'thompson': soma ao score um ruído gaussiano proporcional à incerteza do candidato
+  (menos tentativas => mais incerteza) e escolhe o maior valor amostrado.
+
+O gerador aleatório é semeado por usuário (e por um "nonce", ex: a versão do estado
+cognitivo), então a mesma situação produz a mesma escolha. Os demais top-k são
+devolvidos em ordem como alternativas (para pré-carregamento no cliente).
+"""
+import heapq
+import itertools
+import math
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from .lru_cache import stable_content_key
+
+T = TypeVar("T")
+
+SELECTION_STRATEGIES = ('greedy', 'epsilon', 'softmax', 'thompson')
+
+
+class TopKHeap(Generic[T]):
+    """Mantém apenas os k itens de maior score (min-heap de tamanho k)."""
+
+    def __init__(self, k: int):
+        if k <= 0:
+            raise ValueError("k deve ser positivo.")
+        self.k = k
+        self._heap: List[Tuple[float, int, float, T]] = []
+        self._counter = itertools.count()  # Desempate estável: não compara os itens
+        self.pushed = 0
+
+    def push(self, score: float, item: T, uncertainty: float = 0.0) -> None:
+        self.pushed += 1
+        entry = (score, -next(self._counter), uncertainty, item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def ranked(self) -> List[Tuple[float, float, T]]:
+        """(score, incerteza, item) do maior para o menor score (empates: ordem de inserção)."""
+        return [(score, uncertainty, item) for score, _, uncertainty, item in sorted(self._heap, reverse=True)]
+
+
+@dataclass
+class SelectionResult(Generic[T]):
+    selected: Optional[T]
+    runner_ups: List[T] = field(default_factory=list)  # Demais top-k, do melhor para o pior
+    strategy: str = 'greedy'
+    explored: bool = False  # True se a escolha não foi o melhor score
+    word_data: Dict[str, Any] = field(default_factory=dict)  # Dados já enriquecidos das palavras do top-k
+
+
+def seeded_rng(user_id: int, nonce: Any = None) -> random.Random:
+    """Gerador reprodutível por usuário: mesma (user_id, nonce) => mesma sequência."""
+    return random.Random(int(stable_content_key("selection", str(user_id), str(nonce)), 16))
+
+
+def select_from_heap(
+    heap: TopKHeap[T],
+    strategy: str,
+    rng: random.Random,
+    epsilon: float = 0.1,
+    temperature: float = 0.1,
+    thompson_scale: float = 0.2,
+) -> SelectionResult[T]:
+    """Escolhe um dos top-k segundo a estratégia; os demais viram alternativas ranqueadas."""
+    if strategy not in SELECTION_STRATEGIES:
+        raise ValueError(f"Estratégia de seleção desconhecida: {strategy}")
+    ranked = heap.ranked()
+    if not ranked:
+        return SelectionResult(selected=None, strategy=strategy)
+
+    index = 0
+    if len(ranked) > 1:
+        if strategy == 'epsilon':
+            if rng.random() < epsilon:
+                index = rng.randrange(len(ranked))
+        elif strategy == 'softmax':
+            best = ranked[0][0]
+            # Subtrai o maior score para estabilidade numérica
+            weights = [math.exp((score - best) / max(temperature, 1e-9)) for score, _, _ in ranked]
+            index = rng.choices(range(len(ranked)), weights=weights)[0]
+        elif strategy == 'thompson':
+            sampled = [score + rng.gauss(0.0, thompson_scale * uncertainty) for score, uncertainty, _ in ranked]
+            index = max(range(len(ranked)), key=sampled.__getitem__)
+
+    items = [item for _, _, item in ranked]
+    selected = items.pop(index)
+    return SelectionResult(selected=selected, runner_ups=items, strategy=strategy, explored=index != 0)
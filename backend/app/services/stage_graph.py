@@ -0,0 +1,116 @@
+# backend/app/services/stage_graph.py
+"""
+Executor de um pequeno grafo acíclico (DAG) de etapas assíncronas.
+
+Cada etapa declara de quais outras depende; etapas independentes rodam concorrentemente
+e cada uma começa assim que suas dependências terminam, então o tempo total segue o
+caminho crítico (e não a soma das etapas). Cada etapa tem timeout próprio: em timeout ou
+erro, vale o valor padrão da etapa e o resultado é marcado como incompleto, sem derrubar
+as demais (resultados parciais).
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Estados finais de uma etapa
+STAGE_OK = "ok"
+STAGE_TIMEOUT = "timeout"
+STAGE_ERROR = "error"
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    # Recebe {nome da dependência: valor} e devolve o valor da etapa
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]
+    depends_on: Sequence[str] = ()
+    timeout_seconds: Optional[float] = None
+    default: Any = None
+
+
+@dataclass
+class StageResult:
+    value: Any
+    status: str = STAGE_OK
+    elapsed_ms: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == STAGE_OK
+
+
+@dataclass
+class GraphResult:
+    stages: Dict[str, StageResult] = field(default_factory=dict)
+
+    def value(self, name: str) -> Any:
+        return self.stages[name].value
+
+    @property
+    def incomplete(self) -> List[str]:
+        """Etapas que terminaram em timeout ou erro (valor padrão usado)."""
+        return [name for name, result in self.stages.items() if not result.ok]
+
+
+class StageGraph:
+    def __init__(self, stages: Sequence[Stage]):
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Nomes de etapa duplicados.")
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        order: List[str] = []
+        state: Dict[str, int] = {}  # 1 = visitando, 2 = concluída
+
+        def visit(name: str, path: Sequence[str]) -> None:
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Ciclo entre as etapas: {' -> '.join([*path, name])}")
+            if name not in self.stages:
+                raise ValueError(f"Dependência desconhecida: '{name}' (em {path[-1] if path else '?'})")
+            state[name] = 1
+            for dependency in self.stages[name].depends_on:
+                visit(dependency, [*path, name])
+            state[name] = 2
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, [])
+        return order
+
+    async def run(self) -> GraphResult:
+        tasks: Dict[str, "asyncio.Task[StageResult]"] = {}
+
+        async def run_stage(stage: Stage) -> StageResult:
+            inputs = {}
+            for dependency in stage.depends_on:
+                inputs[dependency] = (await tasks[dependency]).value
+            started_at = time.perf_counter()
+            try:
+                value = await asyncio.wait_for(stage.run(inputs), timeout=stage.timeout_seconds)
+                return StageResult(value=value, elapsed_ms=(time.perf_counter() - started_at) * 1000)
+            except asyncio.TimeoutError:
+                logger.warning(f"Etapa '{stage.name}' excedeu {stage.timeout_seconds}s; usando valor padrão.")
+                return StageResult(value=stage.default, status=STAGE_TIMEOUT,
+                                   elapsed_ms=(time.perf_counter() - started_at) * 1000)
+            except Exception as e:
+                logger.error(f"Erro na etapa '{stage.name}': {e}", exc_info=True)
+                return StageResult(value=stage.default, status=STAGE_ERROR, error=str(e),
+                                   elapsed_ms=(time.perf_counter() - started_at) * 1000)
+
+        # As dependências são criadas antes das dependentes (ordem topológica)
+        for name in self.order:
+            tasks[name] = asyncio.ensure_future(run_stage(self.stages[name]))
+        try:
+            await asyncio.gather(*tasks.values())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+        return GraphResult(stages={name: tasks[name].result() for name in self.order})
@@ -0,0 +1,241 @@
+# backend/app/services/training_jobs.py
+"""
+Execução do treinamento do modelo de dificuldade em segundo plano.
+
+O treinamento roda em um único worker dedicado (thread), fora do event loop da API,
+lendo o UserProgress em lotes (crud.iter_progress_training_rows) e treinando de forma
+incremental (ml_model.train_model_streaming). O estado de cada job fica na tabela
+training_jobs, de modo que o endpoint de status do admin responde em qualquer worker da API.
+
+A reserva (coluna única active_slot) garante no máximo um treinamento ativo entre todos os
+workers: o INSERT do segundo job ativo falha e o pedido devolve o job já em andamento. Um job
+ativo cujo worker parou de dar notícias (heartbeat_at) por TRAINING_JOB_STALE_SECONDS é
+marcado como falho e libera a vaga.
+"""
+import logging
+import os
+import socket
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .. import crud, models
+from ..core.config import TRAINING_CHUNK_SIZE, TRAINING_EPOCHS, TRAINING_JOB_STALE_SECONDS
+from . import ml_model
+
+logger = logging.getLogger(__name__)
+
+# Quantidade de jobs finalizados mantidos para consulta
+MAX_FINISHED_JOBS = 20
+# Valor de active_slot enquanto o job está na fila ou rodando (coluna única: um job ativo por vez)
+ACTIVE_SLOT = 1
+ACTIVE_STATUSES = ("queued", "running")
+
+
+@dataclass
+class TrainingJob:
+    job_id: str
+    requested_by: str
+    status: str = "queued"  # queued | running | succeeded | skipped | failed
+    stage: Optional[str] = None
+    rows_processed: int = 0
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    model_version: Optional[str] = None
+    metrics: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in ACTIVE_STATUSES
+
+    @classmethod
+    def from_record(cls, record: models.TrainingJobRecord) -> "TrainingJob":
+        return cls(
+            job_id=record.job_id, requested_by=record.requested_by, status=record.status,
+            stage=record.stage, rows_processed=record.rows_processed or 0,
+            created_at=record.created_at, started_at=record.started_at, finished_at=record.finished_at,
+            model_version=record.model_version, metrics=record.metrics, error=record.error,
+        )
+
+
+def build_chunk_source(session_factory: Callable[[], Session], complexity_analyzer, chunk_size: int = TRAINING_CHUNK_SIZE) -> ml_model.TrainingChunkSource:
+    """
+    Cria a fonte de lotes (features, rótulos) do treinamento a partir do UserProgress.
+    Features: acurácia, tempo médio e tamanho da palavra (ml_model.FEATURE_COLUMNS).
+    Rótulo: nível de dificuldade da palavra pelo composite_score da palavra mestra; palavras
+    fora de master_words são pontuadas pelo caminho vetorizado do analisador.
+    """
+    import numpy as np
+
+    thresholds = np.array([
+        complexity_analyzer.complexity_thresholds['fácil'][1],
+        complexity_analyzer.complexity_thresholds['média'][1],
+    ])
+
+    def chunks():
+        db = session_factory()
+        try:
+            for rows in crud.iter_progress_training_rows(db, chunk_size=chunk_size):
+                words = [row.word_text for row in rows]
+                correct = np.fromiter((row.correct_attempts or 0 for row in rows), dtype=np.float64, count=len(rows))
+                total = np.fromiter((row.total_attempts for row in rows), dtype=np.float64, count=len(rows))
+                avg_time = np.fromiter((row.average_time_seconds or 0.0 for row in rows), dtype=np.float64, count=len(rows))
+                word_length = np.fromiter((len(word) for word in words), dtype=np.float64, count=len(rows))
+
+                scores = np.fromiter(
+                    (np.nan if row.composite_score is None else row.composite_score for row in rows),
+                    dtype=np.float64, count=len(rows),
+                )
+                missing = np.flatnonzero(np.isnan(scores))
+                if missing.size:
+                    batch = complexity_analyzer.infer_batch([words[i] for i in missing])
+                    scores[missing] = batch.composite_score
+
+                features = np.column_stack((correct / total, avg_time, word_length))
+                labels = np.searchsorted(thresholds, scores, side='right').astype(np.int64)
+                yield features, labels
+        finally:
+            db.close()
+
+    return chunks
+
+
+class TrainingJobManager:
+    """
+    Fila de treinamento com estado no banco. Cada processo tem um único worker (thread) e a
+    reserva em training_jobs.active_slot limita a um treinamento ativo entre todos os processos.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], stale_after_seconds: float = TRAINING_JOB_STALE_SECONDS):
+        self.session_factory = session_factory
+        self.stale_after = timedelta(seconds=stale_after_seconds)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-training")
+
+    def submit(self, requested_by: str) -> TrainingJob:
+        """Enfileira um treinamento. Se já houver um ativo (em qualquer worker), devolve o job existente."""
+        db = self.session_factory()
+        try:
+            # Duas tentativas: o job ativo que bloqueou o INSERT pode ter terminado nesse meio-tempo
+            for _ in range(2):
+                self._expire_stale(db)
+                active = self._active_record(db)
+                if active is not None:
+                    return TrainingJob.from_record(active)
+                now = datetime.utcnow()
+                record = models.TrainingJobRecord(
+                    job_id=uuid.uuid4().hex, requested_by=requested_by, status="queued",
+                    created_at=now, heartbeat_at=now, claimed_by=self.worker_id, active_slot=ACTIVE_SLOT,
+                )
+                db.add(record)
+                try:
+                    db.commit()
+                except IntegrityError:
+                    # Outro worker reservou a vaga entre a consulta e o INSERT
+                    db.rollback()
+                    continue
+                job = TrainingJob.from_record(record)
+                self._prune_finished(db)
+                break
+            else:
+                active = self._active_record(db)
+                if active is None:
+                    raise RuntimeError("Não foi possível reservar a vaga de treinamento.")
+                return TrainingJob.from_record(active)
+        finally:
+            db.close()
+        self._executor.submit(self._run, job.job_id)
+        logger.info(f"Job de treinamento {job.job_id} enfileirado por {requested_by} (worker {self.worker_id}).")
+        return job
+
+    def get(self, job_id: str) -> Optional[TrainingJob]:
+        db = self.session_factory()
+        try:
+            record = db.get(models.TrainingJobRecord, job_id)
+            return TrainingJob.from_record(record) if record is not None else None
+        finally:
+            db.close()
+
+    def list_jobs(self) -> List[TrainingJob]:
+        db = self.session_factory()
+        try:
+            records = db.query(models.TrainingJobRecord).order_by(models.TrainingJobRecord.created_at.desc()).all()
+            return [TrainingJob.from_record(record) for record in records]
+        finally:
+            db.close()
+
+    @staticmethod
+    def _active_record(db: Session) -> Optional[models.TrainingJobRecord]:
+        return db.query(models.TrainingJobRecord).filter(models.TrainingJobRecord.active_slot == ACTIVE_SLOT).first()
+
+    def _expire_stale(self, db: Session) -> None:
+        """Marca como falho o job ativo cujo worker parou de dar notícias, liberando a vaga."""
+        now = datetime.utcnow()
+        last_seen = func.coalesce(models.TrainingJobRecord.heartbeat_at, models.TrainingJobRecord.created_at)
+        expired = db.query(models.TrainingJobRecord).filter(
+            models.TrainingJobRecord.active_slot == ACTIVE_SLOT,
+            last_seen < now - self.stale_after,
+        ).update({
+            models.TrainingJobRecord.status: "failed",
+            models.TrainingJobRecord.error: "Worker interrompido: o job ficou sem atualização.",
+            models.TrainingJobRecord.finished_at: now,
+            models.TrainingJobRecord.active_slot: None,
+        }, synchronize_session=False)
+        db.commit()
+        if expired:
+            logger.warning(f"{expired} job(s) de treinamento abandonado(s) marcado(s) como falho(s).")
+
+    def _prune_finished(self, db: Session) -> None:
+        finished_ids = [
+            job_id for (job_id,) in db.query(models.TrainingJobRecord.job_id)
+            .filter(models.TrainingJobRecord.status.notin_(ACTIVE_STATUSES))
+            .order_by(models.TrainingJobRecord.created_at.desc())
+            .offset(MAX_FINISHED_JOBS)
+        ]
+        if finished_ids:
+            db.query(models.TrainingJobRecord).filter(
+                models.TrainingJobRecord.job_id.in_(finished_ids)
+            ).delete(synchronize_session=False)
+            db.commit()
+
+    def _update(self, job_id: str, **values: Any) -> None:
+        """Grava o progresso do job (sempre com heartbeat) em uma sessão própria do worker."""
+        values['heartbeat_at'] = datetime.utcnow()
+        db = self.session_factory()
+        try:
+            db.query(models.TrainingJobRecord).filter(models.TrainingJobRecord.job_id == job_id).update(values, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def _run(self, job_id: str) -> None:
+        from .word_complexity_analyzer import WordComplexityAnalyzer
+
+        self._update(job_id, status="running", started_at=datetime.utcnow(), claimed_by=self.worker_id)
+
+        def on_progress(stage: str, rows: int) -> None:
+            self._update(job_id, stage=stage, rows_processed=rows)
+
+        result: Dict[str, Any] = {}
+        try:
+            chunk_source = build_chunk_source(self.session_factory, WordComplexityAnalyzer())
+            metadata = ml_model.train_model_streaming(chunk_source, epochs=TRAINING_EPOCHS, progress=on_progress)
+            if metadata is None:
+                result = {'status': "skipped", 'error': "Dados insuficientes para treinar o modelo."}
+            else:
+                result = {'status': "succeeded", 'model_version': metadata['version'], 'metrics': metadata}
+        except Exception as e:
+            logger.exception(f"Falha no job de treinamento {job_id}")
+            result = {'status': "failed", 'error': str(e)}
+        finally:
+            result.setdefault('status', "failed")
+            self._update(job_id, finished_at=datetime.utcnow(), active_slot=None, **result)
+            logger.info(f"Job de treinamento {job_id} finalizado com status '{result['status']}'.")
@@ -1,94 +1,145 @@
-from gtts import gTTS
-import os
-import asyncio # Para rodar gTTS em uma thread separada
-import logging
-import re # Para sanitizar nomes de arquivos
-
-logger = logging.getLogger(__name__)
-
-# Não precisamos mais de BACKEND_ROOT_DIR ou AUDIO_DIR_FULL_PATH definidos globalmente aqui,
-# já que o path base para salvar será passado para a função.
-
-async def _generate_audio_from_text_func(text: str, audio_save_base_path: str, lang: str = 'pt') -> str | None:
-    """
-    Gera um áudio a partir do texto fornecido e o salva em um arquivo no diretório especificado.
-    Retorna o nome do arquivo gerado (ex: palavra.mp3) ou None em caso de erro.
-    Esta função agora é assíncrona e executa a parte bloqueante (gTTS) em uma thread.
-
-    Args:
-        text (str): O texto a ser convertido em áudio.
-        audio_save_base_path (str): O diretório base para salvar o áudio.
-        lang (str, optional): Idioma do áudio. Default é 'pt' (Português).
-
-    Returns:
-        str | None: O nome do arquivo gerado ou None em caso de erro.
-    """
-    if not text or not audio_save_base_path:
-        logger.warning("Texto ou caminho base para salvar áudio não fornecido.")
-        return None
-
-    try:
-        # Cria um nome de arquivo seguro removendo caracteres não alfanuméricos e substituindo espaços
-        # Mantém acentos e cedilha se desejado, ou remove tudo que não for ASCII alfanumérico.
-        # Versão mais restritiva para nomes de arquivo URL-friendly:
-        safe_filename_base = re.sub(r'[^a-z0-9_.]', '', text.lower().replace(" ", "_"))
-        if not safe_filename_base: # Se o texto for só caracteres especiais
-            safe_filename_base = "audio" # Fallback
-        safe_filename = f"{safe_filename_base[:50]}.mp3" # Limita o comprimento e adiciona extensão
-        
-        audio_full_save_path = os.path.join(audio_save_base_path, safe_filename)
-        
-        # Verificar se o diretório de destino existe, se não, tentar criar
-        # Isso já é feito no WordInfoService, mas uma verificação dupla não faz mal
-        if not os.path.exists(audio_save_base_path):
-            try:
-                os.makedirs(audio_save_base_path, exist_ok=True)
-                logger.info(f"Diretório de áudio criado em tts_service: {audio_save_base_path}")
-            except OSError as e:
-                logger.error(f"Falha ao criar diretório de áudio {audio_save_base_path} em tts_service: {e}")
-                return None # Não pode salvar se o diretório não puder ser criado
-
-        # A geração e salvamento do áudio são operações bloqueantes
-        # Vamos executá-las em uma thread separada para não bloquear o event loop do asyncio
-        async def _blocking_tts_save():
-            if not os.path.exists(audio_full_save_path):
-                tts = gTTS(text=text, lang=lang, slow=False)
-                tts.save(audio_full_save_path)
-                logger.info(f"Áudio salvo em: {audio_full_save_path}")
-                return True # Indica que o arquivo foi gerado
-            else:
-                logger.info(f"Áudio já existe (não sobrescrito): {audio_full_save_path}")
-                return False # Indica que o arquivo já existia
-        
-        await asyncio.to_thread(_blocking_tts_save)
-        
-        # Retorna apenas o nome do arquivo para que o chamador construa a URL
-        return safe_filename
-
-    except Exception as e:
-        logger.error(f"Erro ao gerar áudio para '{text}': {e}", exc_info=True)
-        return None
-
-class TTSService:
-    async def generate_audio_from_text(self, text: str, audio_save_base_path: str, lang: str = 'pt') -> str | None:
-        return await _generate_audio_from_text_func(text, audio_save_base_path, lang)
-
-# Exemplo de uso (para teste local)
-# async def main():
-#     # Simular o path que seria passado pelo WordInfoService
-#     # Palavras_project/backend/static/audio
-#     test_audio_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "static", "audio"))
-#     os.makedirs(test_audio_dir, exist_ok=True)
-#     print(f"Testando com diretório de áudio: {test_audio_dir}")
-#     
-#     filename1 = await generate_audio_from_text("Olá mundo do TTS assíncrono", test_audio_dir)
-#     if filename1:
-#         print(f"Nome do arquivo de áudio 1: {filename1}")
-#     
-#     filename2 = await generate_audio_from_text("Café & Cachaça na Città!", test_audio_dir)
-#     if filename2:
-#         print(f"Nome do arquivo de áudio 2: {filename2}")
-#
-# if __name__ == "__main__":
-#     logging.basicConfig(level=logging.INFO)
+import os
+import asyncio # Para rodar gTTS em uma thread separada
+import logging
+import re # Para sanitizar nomes de arquivos
+import tempfile
+
+from .lru_cache import stable_content_key
+from ..core.config import TTS_BASE_URL
+from ..core import metrics
+from ..core.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# Nomes de arquivo endereçados por conteúdo: "<palavra>-<hash de (idioma, texto)>.mp3".
+# O mesmo nome sempre corresponde ao mesmo áudio, então pode ser servido como imutável.
+CONTENT_ADDRESSED_AUDIO_PATTERN = re.compile(r"-[0-9a-f]{16}\.mp3$")
+
+
+# Caminho do endpoint RPC do Google Translate usado pelo gTTS (mantido ao trocar a URL base)
+GTTS_RPC_PATH = "_/TranslateWebserverUi/data/batchexecute"
+
+
+def _build_gtts(text: str, lang: str, base_url: str | None):
+    """gTTS para o texto; com `base_url`, as requisições vão para esse host (ex: servidor local)."""
+    from gtts import gTTS  # Importado no primeiro uso para não pesar na inicialização
+    tts = gTTS(text=text, lang=lang, slow=False)
+    if base_url:
+        prepare_requests = tts._prepare_requests
+        rpc_url = f"{base_url.rstrip('/')}/{GTTS_RPC_PATH}"
+
+        def _prepare_requests_with_base_url():
+            prepared_requests = prepare_requests()
+            for prepared in prepared_requests:
+                prepared.prepare_url(rpc_url, None)
+            return prepared_requests
+
+        tts._prepare_requests = _prepare_requests_with_base_url
+    return tts
+
+
+def audio_filename_for(text: str, lang: str = 'pt') -> str:
+    """Nome de arquivo seguro (URL-friendly) e endereçado por conteúdo para o áudio do texto."""
+    # Remove caracteres não alfanuméricos ASCII e substitui espaços
+    safe_filename_base = re.sub(r'[^a-z0-9_.]', '', text.lower().replace(" ", "_"))
+    if not safe_filename_base: # Se o texto for só caracteres especiais
+        safe_filename_base = "audio" # Fallback
+    content_hash = stable_content_key("tts", lang, text)[:16]
+    return f"{safe_filename_base[:50]}-{content_hash}.mp3" # Limita o comprimento e adiciona extensão
+
+# Não precisamos mais de BACKEND_ROOT_DIR ou AUDIO_DIR_FULL_PATH definidos globalmente aqui,
+# já que o path base para salvar será passado para a função.
+
+async def _generate_audio_from_text_func(text: str, audio_save_base_path: str, lang: str = 'pt', base_url: str | None = None) -> str | None:
+    """
+    Gera um áudio a partir do texto fornecido e o salva em um arquivo no diretório especificado.
+    Retorna o nome do arquivo gerado (ex: palavra-<hash>.mp3) ou None em caso de erro.
+    Esta função agora é assíncrona e executa a parte bloqueante (gTTS) em uma thread.
+
+    Args:
+        text (str): O texto a ser convertido em áudio.
+        audio_save_base_path (str): O diretório base para salvar o áudio.
+        lang (str, optional): Idioma do áudio. Default é 'pt' (Português).
+        base_url (str, optional): Host alternativo para o gTTS (ex: servidor local). Default é o do Google.
+
+    Returns:
+        str | None: O nome do arquivo gerado ou None em caso de erro.
+    """
+    if not text or not audio_save_base_path:
+        logger.warning("Texto ou caminho base para salvar áudio não fornecido.")
+        return None
+
+    try:
+        # Nome seguro e endereçado por conteúdo (palavras diferentes com o mesmo nome "limpo",
+        # ex: "pé" e "pe", não colidem)
+        safe_filename = audio_filename_for(text, lang)
+        
+        audio_full_save_path = os.path.join(audio_save_base_path, safe_filename)
+        
+        # Verificar se o diretório de destino existe, se não, tentar criar
+        # Isso já é feito no WordInfoService, mas uma verificação dupla não faz mal
+        if not os.path.exists(audio_save_base_path):
+            try:
+                os.makedirs(audio_save_base_path, exist_ok=True)
+                logger.info(f"Diretório de áudio criado em tts_service: {audio_save_base_path}")
+            except OSError as e:
+                logger.error(f"Falha ao criar diretório de áudio {audio_save_base_path} em tts_service: {e}")
+                return None # Não pode salvar se o diretório não puder ser criado
+
+        # A geração e salvamento do áudio são operações bloqueantes
+        # Vamos executá-las em uma thread separada para não bloquear o event loop do asyncio
+        def _blocking_tts_save():
+            if not os.path.exists(audio_full_save_path):
+                tts = _build_gtts(text, lang, base_url)
+                # Grava em arquivo temporário: uma falha no meio do download não deixa um mp3 truncado
+                temp_fd, temp_path = tempfile.mkstemp(dir=audio_save_base_path, suffix=".tmp")
+                os.close(temp_fd)
+                try:
+                    tts.save(temp_path)
+                    os.replace(temp_path, audio_full_save_path)
+                finally:
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
+                logger.info(f"Áudio salvo em: {audio_full_save_path}")
+                return True # Indica que o arquivo foi gerado
+            else:
+                logger.info(f"Áudio já existe (não sobrescrito): {audio_full_save_path}")
+                return False # Indica que o arquivo já existia
+        
+        generated = await asyncio.to_thread(_blocking_tts_save)
+        tracer.current_span().set_attribute('cache_hit', not generated)
+        
+        # Retorna apenas o nome do arquivo para que o chamador construa a URL
+        return safe_filename
+
+    except Exception as e:
+        metrics.upstream_errors.inc(metrics.TTS_BACKEND, type(e).__name__)
+        logger.error(f"Erro ao gerar áudio para '{text}': {e}", exc_info=True)
+        return None
+
+class TTSService:
+    def __init__(self, base_url: str | None = None):
+        self.base_url = base_url or TTS_BASE_URL
+
+    async def generate_audio_from_text(self, text: str, audio_save_base_path: str, lang: str = 'pt') -> str | None:
+        return await _generate_audio_from_text_func(text, audio_save_base_path, lang, self.base_url)
+
+# Exemplo de uso (para teste local)
+# async def main():
+#     # Simular o path que seria passado pelo WordInfoService
+#     # Palavras_project/backend/static/audio
+#     test_audio_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "static", "audio"))
+#     os.makedirs(test_audio_dir, exist_ok=True)
+#     print(f"Testando com diretório de áudio: {test_audio_dir}")
+#     
+#     filename1 = await generate_audio_from_text("Olá mundo do TTS assíncrono", test_audio_dir)
+#     if filename1:
+#         print(f"Nome do arquivo de áudio 1: {filename1}")
+#     
+#     filename2 = await generate_audio_from_text("Café & Cachaça na Città!", test_audio_dir)
+#     if filename2:
+#         print(f"Nome do arquivo de áudio 2: {filename2}")
+#
+# if __name__ == "__main__":
+#     logging.basicConfig(level=logging.INFO)
 #     asyncio.run(main()) 
\ No newline at end of file
@@ -1,306 +1,473 @@
-import re
-import math
-from typing import Dict, Tuple, Optional
-from dataclasses import dataclass, field
-from enum import Enum
-import nltk # Será necessário adicionar ao requirements.txt
-from textstat import flesch_reading_ease, syllable_count # Será necessário adicionar ao requirements.txt
-import logging
-
-# Tentar baixar 'punkt' e 'wordnet' (para lematização, se usada no futuro) e 'averaged_perceptron_tagger' (para POS tagging, se usada)
-# Isso é uma tentativa. Em ambientes restritos, pode falhar e exigir instalação manual.
-try:
-    nltk.data.find('tokenizers/punkt')
-except nltk.downloader.DownloadError:
-    nltk.download('punkt', quiet=True)
-# try:
-#     nltk.data.find('corpora/wordnet')
-# except nltk.downloader.DownloadError:
-#     nltk.download('wordnet', quiet=True)
-# try:
-#     nltk.data.find('taggers/averaged_perceptron_tagger')
-# except nltk.downloader.DownloadError:
-#     nltk.download('averaged_perceptron_tagger', quiet=True)
-
-@dataclass
-class ComplexityMetrics:
-    """Métricas neuropsicológicas para análise de complexidade em tempo real"""
-    lexical_length: int          # Comprimento lexical
-    syllabic_complexity: int     # Complexidade silábica
-    morphological_density: float # Densidade morfológica
-    semantic_abstraction: float  # Nível de abstração semântica
-    definition_complexity: float # Complexidade da definição
-    composite_score: float       # Score composto (0-10)
-
-class WordComplexityAnalyzer:
-    """
-    Analisador de complexidade baseado em métricas neuropsicológicas
-    Implementa inferência em tempo real conforme protocolo WAIS-IV (inspirado)
-    """
-    
-    def __init__(self):
-        self.logger = logging.getLogger(__name__)
-        
-        # Coeficientes calibrados empiricamente (baseados em corpus brasileiro)
-        self.weights = {
-            'lexical': 0.20,        # Peso do comprimento lexical
-            'syllabic': 0.15,       # Peso da complexidade silábica
-            'morphological': 0.25,  # Peso da densidade morfológica
-            'semantic': 0.25,       # Peso da abstração semântica
-            'definition': 0.15      # Peso da complexidade da definição
-        }
-        
-        # Thresholds calibrados com base em dados psicométricos (Exemplos)
-        self.complexity_thresholds = {
-            'fácil': (0.0, 3.5),     # Ajustado para refletir scores até 10
-            'média': (3.5, 7.0),
-            'difícil': (7.0, 10.0)
-        }
-        
-        # Padrões morfológicos do português brasileiro (Exemplos)
-        self.morphological_patterns = {
-            'prefixes': ['pre', 'anti', 'super', 'inter', 'trans', 'contra', 're', 'des', 'in', 'im'],
-            'suffixes': ['ção', 'ismo', 'ista', 'mente', 'dade', 'ável', 'ível', 'oso', 'izar', 'ecer']
-        }
-        
-        # Marcadores de abstração semântica (Exemplos, requer expansão e refinamento)
-        # Idealmente, usaríamos uma base de dados léxico-semântica como WordNet para avaliar concretude/abstração
-        self.abstraction_markers = {
-            'concrete_keywords': ['objeto', 'coisa', 'lugar', 'pessoa', 'animal', 'parte', 'ferramenta', 'comida', 'corpo'],
-            'abstract_keywords': ['conceito', 'ideia', 'sentimento', 'qualidade', 'estado', 'processo', 'sistema', 
-                                  'propriedade', 'característica', 'princípio', 'teoria', 'emoção', 'relação']
-        }
-        self.logger.info("WordComplexityAnalyzer inicializado.")
-    
-    def infer_word_complexity_metrics(self, word_text: str, definition_text: Optional[str]) -> ComplexityMetrics:
-        """
-        Inferência principal de complexidade baseada em múltiplas métricas.
-        Retorna o objeto ComplexityMetrics completo.
-        """
-        word_text = (word_text or "").strip()
-        definition_text = (definition_text or "").strip()
-
-        if not word_text:
-            self.logger.warning("Texto da palavra vazio, retornando métricas de fallback.")
-            return self._basic_complexity_fallback("palavra_vazia")
-
-        try:
-            lexical_score = self._analyze_lexical_complexity(word_text)
-            syllabic_score = self._analyze_syllabic_complexity(word_text)
-            morphological_score = self._analyze_morphological_density(word_text)
-            # Análise semântica e da definição são mais robustas com definição
-            semantic_score = self._analyze_semantic_abstraction(word_text, definition_text if definition_text else "")
-            definition_score_val = self._analyze_definition_complexity(definition_text if definition_text else "")
-            
-            composite_score = (
-                lexical_score * self.weights['lexical'] +
-                syllabic_score * self.weights['syllabic'] +
-                morphological_score * self.weights['morphological'] +
-                semantic_score * self.weights['semantic'] +
-                definition_score_val * self.weights['definition']
-            )
-            
-            # Normalização para garantir que o score esteja entre 0 e 10
-            # A soma dos pesos é 1.0. Cada sub-score pode ir até ~8-10.
-            # Precisamos normalizar o resultado final ou garantir que os sub-scores sejam escalados adequadamente.
-            # Se cada sub-score for normalizado para 0-10, então o composite_score já estaria nessa faixa.
-            # Vou assumir que os sub-scores estão na faixa de 0-10 (ou perto disso)
-            
-            final_composite_score = min(max(composite_score, 0.0), 10.0)
-
-            # syllable_count pode falhar para palavras não padrão ou muito curtas
-            try:
-                syll_count = syllable_count(word_text)
-            except Exception:
-                syll_count = max(1, len(word_text) // 3)
-
-
-            metrics = ComplexityMetrics(
-                lexical_length=len(word_text),
-                syllabic_complexity=syll_count,
-                morphological_density=morphological_score, # Este já é um score, não contagem
-                semantic_abstraction=semantic_score,     # Este já é um score
-                definition_complexity=definition_score_val, # Este já é um score
-                composite_score=final_composite_score
-            )
-            
-            self.logger.debug(f"Métricas de complexidade para '{word_text}': Score Composto={final_composite_score:.2f}")
-            return metrics
-            
-        except Exception as e:
-            self.logger.error(f"Erro na análise de complexidade para '{word_text}': {e}", exc_info=True)
-            return self._basic_complexity_fallback(word_text)
-    
-    def _analyze_lexical_complexity(self, word: str) -> float:
-        length = len(word)
-        if length == 0: return 0.0
-        # Mapeamento mais granular e normalizado para 0-10 (aproximado)
-        if length <= 3: return 1.0
-        if length <= 5: return 3.0
-        if length <= 7: return 5.0
-        if length <= 9: return 7.0
-        if length <= 12: return 8.5
-        return 10.0
-    
-    def _analyze_syllabic_complexity(self, word: str) -> float:
-        if not word: return 0.0
-        try:
-            syllables = syllable_count(word)
-        except Exception: # textstat pode falhar com algumas strings
-             syllables = max(1, len(word) // 3) # Fallback simples
-
-        if syllables <= 1: return 1.0
-        if syllables == 2: return 3.0
-        if syllables == 3: return 5.0
-        if syllables == 4: return 7.0
-        if syllables == 5: return 8.5
-        return 10.0
-    
-    def _analyze_morphological_density(self, word: str) -> float:
-        if not word: return 0.0
-        word_lower = word.lower()
-        morpheme_count = 1 
-        
-        detected_morphemes = 0
-        for prefix in self.morphological_patterns['prefixes']:
-            if word_lower.startswith(prefix):
-                detected_morphemes += 1
-                # word_lower = word_lower[len(prefix):] # Remover para evitar contagem dupla se houver sobreposição
-                break 
-        
-        for suffix in self.morphological_patterns['suffixes']:
-            if word_lower.endswith(suffix):
-                detected_morphemes +=1
-                break
-        
-        # Score de 0 a 10. Ex: 0 afixos = 1.0, 1 afixo = 5.0, 2 afixos = 9.0
-        if detected_morphemes == 0: return 1.0
-        if detected_morphemes == 1: return 5.0
-        return 9.0
-
-    def _analyze_semantic_abstraction(self, word: str, definition: str) -> float:
-        if not word and not definition: return 3.0 # Neutro
-        
-        word_lower = word.lower()
-        definition_lower = definition.lower()
-        
-        # Pontuação inicial baseada na palavra (se ela mesma for um marcador)
-        score = 5.0 # Base neutra (0-10)
-
-        # Verificar se a própria palavra é um forte indicador
-        if any(m in word_lower for m in self.abstraction_markers['abstract_keywords']):
-            score += 2.5
-        elif any(m in word_lower for m in self.abstraction_markers['concrete_keywords']):
-            score -= 2.5
-
-        # Ajustar com base na definição
-        if definition_lower:
-            abstract_hits = sum(1 for marker in self.abstraction_markers['abstract_keywords'] if marker in definition_lower)
-            concrete_hits = sum(1 for marker in self.abstraction_markers['concrete_keywords'] if marker in definition_lower)
-
-            if abstract_hits > concrete_hits:
-                score += (abstract_hits - concrete_hits) * 1.5 
-            elif concrete_hits > abstract_hits:
-                score -= (concrete_hits - abstract_hits) * 1.5
-        
-        return min(max(score, 0.0), 10.0) # Normaliza para 0-10
-
-    def _analyze_definition_complexity(self, definition: str) -> float:
-        if not definition:
-            return 3.0  # Neutro se não há definição (0-10)
-        
-        try:
-            # Usar Flesch Reading Ease (Português) e normalizar para 0-10
-            # Flesch Reading Ease: 0-100 (mais alto = mais fácil)
-            # Para o Brasil, a fórmula é: 248.835 - (1.015 * ASL) - (84.6 * ASW)
-            # ASL = tamanho médio da sentença, ASW = média de sílabas por palavra
-            # textstat.set_lang('pt_BR') # Não existe em textstat, ele tenta detectar
-            f_ease = flesch_reading_ease(definition)
-            
-            # Inverter e escalar para 0-10 (0 = muito fácil, 10 = muito difícil)
-            # Ex: f_ease 100 (fácil) -> 0 ; f_ease 0 (difícil) -> 10
-            score = (100 - f_ease) / 10.0
-            return min(max(score, 0.0), 10.0)
-
-        except Exception as e:
-            self.logger.warning(f"Erro ao calcular Flesch Reading Ease para definição: {e}. Usando fallback.")
-            # Fallback simples baseado no comprimento da definição
-            length = len(definition)
-            if length < 50: return 1.5
-            if length < 100: return 3.0
-            if length < 150: return 5.0
-            if length < 250: return 7.0
-            return 9.0
-    
-    def _basic_complexity_fallback(self, word: str) -> ComplexityMetrics:
-        length = len(word)
-        basic_score = 0.0
-        if length > 0 : basic_score = min(length * 0.8, 10.0) # Escala simples
-        
-        # Tenta usar syllable_count com fallback
-        try:
-            syll_count_fallback = syllable_count(word) if word else 0
-        except:
-            syll_count_fallback = max(1, length // 3) if word else 0
-
-        return ComplexityMetrics(
-            lexical_length=length,
-            syllabic_complexity=syll_count_fallback,
-            morphological_density=basic_score / 3 if basic_score > 0 else 1.0, # Estimativa
-            semantic_abstraction=basic_score / 3 if basic_score > 0 else 3.0,  # Estimativa
-            definition_complexity=basic_score / 3 if basic_score > 0 else 3.0, # Estimativa
-            composite_score=min(basic_score,10.0)
-        )
-    
-    def get_difficulty_level_from_metrics(self, metrics: ComplexityMetrics) -> str:
-        """Classificação em nível de dificuldade com base nas métricas (score composto)."""
-        score = metrics.composite_score
-        
-        if score < self.complexity_thresholds['fácil'][1]: # Limite superior de 'fácil'
-            return 'fácil'
-        elif score < self.complexity_thresholds['média'][1]: # Limite superior de 'média'
-            return 'média'
-        else:
-            return 'difícil'
-
-# Exemplo de uso (para teste local)
-if __name__ == '__main__':
-    logging.basicConfig(level=logging.INFO)
-    analyzer = WordComplexityAnalyzer()
-    
-    palavras_teste = {
-        "casa": "Estrutura construída para habitação.",
-        "sol": "Estrela central do nosso sistema solar.",
-        "felicidade": "Estado de contentamento e bem-estar.",
-        "inconstitucionalissimamente": "De maneira ou modo muito inconstitucional.",
-        "pneumoultramicroscopicossilicovulcanoconiose": "Doença pulmonar causada pela inalação de cinzas vulcânicas.",
-        "paralelepípedo": "Sólido geométrico com seis faces paralelas e iguais duas a duas.",
-        "transcendência": "Qualidade do que é transcendente, que ultrapassa os limites.",
-        "amor": "Sentimento de afeição profunda.",
-        "ódio": "Sentimento intenso de aversão ou repulsa.",
-        "efêmero": "Que dura pouco tempo; passageiro, transitório.",
-        "complexidade": "Qualidade do que é complexo, que apresenta múltiplos elementos e interações."
-    }
-    
-    for palavra, definicao in palavras_teste.items():
-        print(f"\nAnalisando: {palavra}")
-        metrics_obj = analyzer.infer_word_complexity_metrics(palavra, definicao)
-        difficulty = analyzer.get_difficulty_level_from_metrics(metrics_obj)
-        print(f"  Score Composto: {metrics_obj.composite_score:.2f}")
-        print(f"  Nível Inferido: {difficulty}")
-        print(f"  Métricas Detalhadas: {metrics_obj}")
-
-    print("\nTeste com palavra vazia e definição:")
-    metrics_vazia = analyzer.infer_word_complexity_metrics("", "alguma definicao")
-    difficulty_vazia = analyzer.get_difficulty_level_from_metrics(metrics_vazia)
-    print(f"  Score Composto: {metrics_vazia.composite_score:.2f}, Nível: {difficulty_vazia}")
-
-    print("\nTeste com palavra e definição vazia:")
-    metrics_vazia_total = analyzer.infer_word_complexity_metrics("teste", "")
-    difficulty_vazia_total = analyzer.get_difficulty_level_from_metrics(metrics_vazia_total)
-    print(f"  Score Composto: {metrics_vazia_total.composite_score:.2f}, Nível: {difficulty_vazia_total}")
-
-    print("\nTeste com palavra e definição None:")
-    metrics_none = analyzer.infer_word_complexity_metrics("palavra", None)
-    difficulty_none = analyzer.get_difficulty_level_from_metrics(metrics_none)
+import re
+import math
+import json
+import os
+from typing import Dict, Tuple, Optional, List, Sequence, TYPE_CHECKING
+from dataclasses import dataclass, field
+from enum import Enum
+import logging
+
+# Silabificador próprio para o português (substitui textstat.syllable_count, orientado ao inglês)
+from .pt_syllabifier import count_syllables, count_syllables_batch
+# Casadores compilados (tries de afixos e autômato Aho–Corasick para marcadores semânticos)
+from .pattern_matchers import PrefixTrie, SuffixTrie, AhoCorasick
+from ..core.config import COMPLEXITY_COEFFICIENTS_PATH
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Dependências pesadas (textstat -> nltk, numpy) são importadas apenas no primeiro uso,
+# para não pesar no cold start dos workers. Os recursos do NLTK (punkt, cmudict) não são
+# mais baixados na importação: use `python -m backend.app.setup_commands download-nltk`.
+_flesch_reading_ease = None
+
+def _get_flesch_reading_ease():
+    global _flesch_reading_ease
+    if _flesch_reading_ease is None:
+        from textstat import flesch_reading_ease
+        _flesch_reading_ease = flesch_reading_ease
+    return _flesch_reading_ease
+
+@dataclass
+class ComplexityMetrics:
+    """Métricas neuropsicológicas para análise de complexidade em tempo real"""
+    lexical_length: int          # Comprimento lexical
+    syllabic_complexity: int     # Complexidade silábica
+    morphological_density: float # Densidade morfológica
+    semantic_abstraction: float  # Nível de abstração semântica
+    definition_complexity: float # Complexidade da definição
+    composite_score: float       # Score composto (0-10)
+
+# Ordem das colunas de sub-scores usada no cálculo vetorizado do score composto
+SCORE_COMPONENTS = ('lexical', 'syllabic', 'morphological', 'semantic', 'definition')
+DIFFICULTY_LABELS = ('fácil', 'média', 'difícil')
+
+# Tabelas de mapeamento (contagem -> score 0-10) usadas pelo caminho vetorizado
+_LEXICAL_LENGTH_BINS = (3, 5, 7, 9, 12)
+_LEXICAL_SCORES = (1.0, 3.0, 5.0, 7.0, 8.5, 10.0)
+_SYLLABIC_SCORES = (1.0, 3.0, 5.0, 7.0, 8.5, 10.0)  # 1, 2, 3, 4, 5, 6+ sílabas
+_MORPHOLOGICAL_SCORES = (1.0, 5.0, 9.0)  # 0, 1, 2 afixos detectados
+
+@dataclass
+class ComplexityBatch:
+    """
+    Resultado colunar de WordComplexityAnalyzer.infer_batch: um array NumPy por métrica,
+    alinhado com `words`, em vez de um objeto ComplexityMetrics por palavra.
+    """
+    words: List[str]
+    lexical_length: 'np.ndarray'         # Comprimento lexical (int)
+    syllable_count: 'np.ndarray'         # Número de sílabas (int)
+    lexical_score: 'np.ndarray'          # Sub-scores 0-10
+    syllabic_score: 'np.ndarray'
+    morphological_density: 'np.ndarray'
+    semantic_abstraction: 'np.ndarray'
+    definition_complexity: 'np.ndarray'
+    composite_score: 'np.ndarray'        # Score composto (0-10)
+    difficulty_code: 'np.ndarray'        # Índice em DIFFICULTY_LABELS
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    @property
+    def difficulty_level(self) -> 'np.ndarray':
+        import numpy as np
+        return np.asarray(DIFFICULTY_LABELS, dtype=object)[self.difficulty_code]
+
+    def to_metrics(self, index: int) -> ComplexityMetrics:
+        """Materializa uma única linha como ComplexityMetrics (compatibilidade com o caminho por palavra)."""
+        return ComplexityMetrics(
+            lexical_length=int(self.lexical_length[index]),
+            syllabic_complexity=int(self.syllable_count[index]),
+            morphological_density=float(self.morphological_density[index]),
+            semantic_abstraction=float(self.semantic_abstraction[index]),
+            definition_complexity=float(self.definition_complexity[index]),
+            composite_score=float(self.composite_score[index])
+        )
+
+class WordComplexityAnalyzer:
+    """
+    Analisador de complexidade baseado em métricas neuropsicológicas
+    Implementa inferência em tempo real conforme protocolo WAIS-IV (inspirado)
+    """
+    
+    def __init__(self, coefficients_path: Optional[str] = COMPLEXITY_COEFFICIENTS_PATH):
+        self.logger = logging.getLogger(__name__)
+        
+        # Coeficientes calibrados empiricamente (baseados em corpus brasileiro)
+        self.weights = {
+            'lexical': 0.20,        # Peso do comprimento lexical
+            'syllabic': 0.15,       # Peso da complexidade silábica
+            'morphological': 0.25,  # Peso da densidade morfológica
+            'semantic': 0.25,       # Peso da abstração semântica
+            'definition': 0.15      # Peso da complexidade da definição
+        }
+        
+        # Thresholds calibrados com base em dados psicométricos (Exemplos)
+        self.complexity_thresholds = {
+            'fácil': (0.0, 3.5),     # Ajustado para refletir scores até 10
+            'média': (3.5, 7.0),
+            'difícil': (7.0, 10.0)
+        }
+        
+        # Padrões morfológicos do português brasileiro (Exemplos)
+        self.morphological_patterns = {
+            'prefixes': ['pre', 'anti', 'super', 'inter', 'trans', 'contra', 're', 'des', 'in', 'im'],
+            'suffixes': ['ção', 'ismo', 'ista', 'mente', 'dade', 'ável', 'ível', 'oso', 'izar', 'ecer']
+        }
+        
+        # Marcadores de abstração semântica (Exemplos, requer expansão e refinamento)
+        # Idealmente, usaríamos uma base de dados léxico-semântica como WordNet para avaliar concretude/abstração
+        self.abstraction_markers = {
+            'concrete_keywords': ['objeto', 'coisa', 'lugar', 'pessoa', 'animal', 'parte', 'ferramenta', 'comida', 'corpo'],
+            'abstract_keywords': ['conceito', 'ideia', 'sentimento', 'qualidade', 'estado', 'processo', 'sistema', 
+                                  'propriedade', 'característica', 'princípio', 'teoria', 'emoção', 'relação']
+        }
+        # Termo independente do score composto (0 com os pesos padrão; ajustado pela calibração)
+        self.composite_intercept = 0.0
+        self.coefficients_version: Optional[str] = None
+        if coefficients_path and os.path.exists(coefficients_path):
+            self.load_coefficients(coefficients_path)
+
+        self._compile_matchers()
+        self.logger.info("WordComplexityAnalyzer inicializado.")
+
+    def load_coefficients(self, path: str) -> bool:
+        """
+        Carrega pesos, intercepto e thresholds aprendidos (arquivo JSON gerado por
+        complexity_calibration). Em caso de erro, mantém os coeficientes atuais.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as coefficients_file:
+                data = json.load(coefficients_file)
+            if tuple(data['components']) != SCORE_COMPONENTS or len(data['weights']) != len(SCORE_COMPONENTS):
+                raise ValueError(f"componentes incompatíveis: {data['components']}")
+            weights = {component: float(weight) for component, weight in zip(SCORE_COMPONENTS, data['weights'])}
+            easy_upper, medium_upper = (float(value) for value in data['thresholds'])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.logger.error(f"Coeficientes de complexidade inválidos em {path}: {e}. Usando os pesos atuais.")
+            return False
+
+        self.weights = weights
+        self.composite_intercept = float(data.get('intercept', 0.0))
+        self.complexity_thresholds = {
+            'fácil': (0.0, easy_upper),
+            'média': (easy_upper, medium_upper),
+            'difícil': (medium_upper, 10.0)
+        }
+        self.coefficients_version = data.get('version')
+        self.logger.info(f"Coeficientes de complexidade carregados de {path} (versão {self.coefficients_version}).")
+        return True
+
+    def _compile_matchers(self):
+        """
+        Compila as listas de padrões uma única vez: cada análise passa a ser uma
+        passada linear sobre a palavra/definição, independente do tamanho das listas.
+        Deve ser chamado novamente se morphological_patterns ou abstraction_markers forem alterados.
+        """
+        self._prefix_trie = PrefixTrie(self.morphological_patterns['prefixes'])
+        self._suffix_trie = SuffixTrie(self.morphological_patterns['suffixes'])
+        self._abstraction_automaton = AhoCorasick(self.abstraction_markers)
+    
+    def infer_word_complexity_metrics(self, word_text: str, definition_text: Optional[str]) -> ComplexityMetrics:
+        """
+        Inferência principal de complexidade baseada em múltiplas métricas.
+        Retorna o objeto ComplexityMetrics completo.
+        """
+        word_text = (word_text or "").strip()
+        definition_text = (definition_text or "").strip()
+
+        if not word_text:
+            self.logger.warning("Texto da palavra vazio, retornando métricas de fallback.")
+            return self._basic_complexity_fallback("palavra_vazia")
+
+        try:
+            # Contagem de sílabas calculada uma única vez e reaproveitada abaixo
+            syll_count = count_syllables(word_text)
+
+            lexical_score = self._analyze_lexical_complexity(word_text)
+            syllabic_score = self._analyze_syllabic_complexity(word_text, syll_count)
+            morphological_score = self._analyze_morphological_density(word_text)
+            # Análise semântica e da definição são mais robustas com definição
+            semantic_score = self._analyze_semantic_abstraction(word_text, definition_text if definition_text else "")
+            definition_score_val = self._analyze_definition_complexity(definition_text if definition_text else "")
+            
+            composite_score = (
+                lexical_score * self.weights['lexical'] +
+                syllabic_score * self.weights['syllabic'] +
+                morphological_score * self.weights['morphological'] +
+                semantic_score * self.weights['semantic'] +
+                definition_score_val * self.weights['definition'] +
+                self.composite_intercept
+            )
+            
+            # Normalização para garantir que o score esteja entre 0 e 10
+            # A soma dos pesos é 1.0. Cada sub-score pode ir até ~8-10.
+            # Precisamos normalizar o resultado final ou garantir que os sub-scores sejam escalados adequadamente.
+            # Se cada sub-score for normalizado para 0-10, então o composite_score já estaria nessa faixa.
+            # Vou assumir que os sub-scores estão na faixa de 0-10 (ou perto disso)
+            
+            final_composite_score = min(max(composite_score, 0.0), 10.0)
+
+            metrics = ComplexityMetrics(
+                lexical_length=len(word_text),
+                syllabic_complexity=syll_count,
+                morphological_density=morphological_score, # Este já é um score, não contagem
+                semantic_abstraction=semantic_score,     # Este já é um score
+                definition_complexity=definition_score_val, # Este já é um score
+                composite_score=final_composite_score
+            )
+            
+            self.logger.debug(f"Métricas de complexidade para '{word_text}': Score Composto={final_composite_score:.2f}")
+            return metrics
+            
+        except Exception as e:
+            self.logger.error(f"Erro na análise de complexidade para '{word_text}': {e}", exc_info=True)
+            return self._basic_complexity_fallback(word_text)
+    
+    def infer_batch(self, words: Sequence[str], definitions: Optional[Sequence[Optional[str]]] = None) -> ComplexityBatch:
+        """
+        Versão vetorizada de infer_word_complexity_metrics para um lote de palavras.
+        As contagens por palavra (sílabas, afixos, marcadores) são extraídas em uma passada,
+        e os mapeamentos para scores, o score composto e os níveis de dificuldade são
+        calculados com NumPy sobre o lote inteiro.
+        """
+        import numpy as np
+
+        words = [(word or "").strip() for word in words]
+        if definitions is None:
+            definitions = [""] * len(words)
+        elif len(definitions) != len(words):
+            raise ValueError("words e definitions devem ter o mesmo tamanho.")
+        definitions = [(definition or "").strip() for definition in definitions]
+        size = len(words)
+
+        lexical_length = np.fromiter((len(word) for word in words), dtype=np.int64, count=size)
+        syllable_count = np.asarray(count_syllables_batch(words), dtype=np.int64)
+
+        affix_count = np.zeros(size, dtype=np.int64)
+        word_abstraction = np.zeros(size)  # +1 abstrata, -1 concreta, 0 neutra
+        abstract_hits = np.zeros(size)
+        concrete_hits = np.zeros(size)
+        definition_cache: Dict[str, float] = {}
+        definition_score = np.empty(size)
+
+        for i, (word, definition) in enumerate(zip(words, definitions)):
+            word_lower = word.lower()
+            affix_count[i] = self._prefix_trie.matches(word_lower) + self._suffix_trie.matches(word_lower)
+
+            word_category = self._abstraction_automaton.first_category(word_lower, ('abstract_keywords', 'concrete_keywords'))
+            if word_category == 'abstract_keywords':
+                word_abstraction[i] = 1.0
+            elif word_category == 'concrete_keywords':
+                word_abstraction[i] = -1.0
+
+            if definition:
+                definition_hits = self._abstraction_automaton.find_categories(definition.lower())
+                abstract_hits[i] = len(definition_hits['abstract_keywords'])
+                concrete_hits[i] = len(definition_hits['concrete_keywords'])
+
+            # Definições repetidas no lote (ex: vazias) são avaliadas uma única vez
+            cached_definition_score = definition_cache.get(definition)
+            if cached_definition_score is None:
+                cached_definition_score = self._analyze_definition_complexity(definition)
+                definition_cache[definition] = cached_definition_score
+            definition_score[i] = cached_definition_score
+
+        lexical_score = np.asarray(_LEXICAL_SCORES)[np.digitize(lexical_length, _LEXICAL_LENGTH_BINS, right=True)]
+        syllabic_score = np.asarray(_SYLLABIC_SCORES)[np.clip(syllable_count, 1, 6) - 1]
+        morphological_score = np.asarray(_MORPHOLOGICAL_SCORES)[affix_count]
+        semantic_score = np.clip(5.0 + 2.5 * word_abstraction + 1.5 * (abstract_hits - concrete_hits), 0.0, 10.0)
+
+        score_matrix = np.column_stack((lexical_score, syllabic_score, morphological_score, semantic_score, definition_score))
+        weight_vector = np.array([self.weights[component] for component in SCORE_COMPONENTS])
+        composite_score = np.clip(score_matrix @ weight_vector + self.composite_intercept, 0.0, 10.0)
+
+        # Palavras vazias seguem o mesmo fallback do caminho por palavra
+        empty_mask = lexical_length == 0
+        if empty_mask.any():
+            fallback = self._basic_complexity_fallback("palavra_vazia")
+            lexical_length[empty_mask] = fallback.lexical_length
+            syllable_count[empty_mask] = fallback.syllabic_complexity
+            morphological_score[empty_mask] = fallback.morphological_density
+            semantic_score[empty_mask] = fallback.semantic_abstraction
+            definition_score[empty_mask] = fallback.definition_complexity
+            composite_score[empty_mask] = fallback.composite_score
+
+        thresholds = np.array([self.complexity_thresholds['fácil'][1], self.complexity_thresholds['média'][1]])
+        difficulty_code = np.searchsorted(thresholds, composite_score, side='right')
+
+        return ComplexityBatch(
+            words=words,
+            lexical_length=lexical_length,
+            syllable_count=syllable_count,
+            lexical_score=lexical_score,
+            syllabic_score=syllabic_score,
+            morphological_density=morphological_score,
+            semantic_abstraction=semantic_score,
+            definition_complexity=definition_score,
+            composite_score=composite_score,
+            difficulty_code=difficulty_code
+        )
+
+    def _analyze_lexical_complexity(self, word: str) -> float:
+        length = len(word)
+        if length == 0: return 0.0
+        # Mapeamento mais granular e normalizado para 0-10 (aproximado)
+        if length <= 3: return 1.0
+        if length <= 5: return 3.0
+        if length <= 7: return 5.0
+        if length <= 9: return 7.0
+        if length <= 12: return 8.5
+        return 10.0
+    
+    def _analyze_syllabic_complexity(self, word: str, syllables: Optional[int] = None) -> float:
+        if not word: return 0.0
+        if syllables is None:
+            syllables = count_syllables(word)
+
+        if syllables <= 1: return 1.0
+        if syllables == 2: return 3.0
+        if syllables == 3: return 5.0
+        if syllables == 4: return 7.0
+        if syllables == 5: return 8.5
+        return 10.0
+    
+    def _analyze_morphological_density(self, word: str) -> float:
+        if not word: return 0.0
+        word_lower = word.lower()
+
+        detected_morphemes = 0
+        if self._prefix_trie.matches(word_lower):
+            detected_morphemes += 1
+        if self._suffix_trie.matches(word_lower):
+            detected_morphemes += 1
+        
+        # Score de 0 a 10. Ex: 0 afixos = 1.0, 1 afixo = 5.0, 2 afixos = 9.0
+        if detected_morphemes == 0: return 1.0
+        if detected_morphemes == 1: return 5.0
+        return 9.0
+
+    def _analyze_semantic_abstraction(self, word: str, definition: str) -> float:
+        if not word and not definition: return 3.0 # Neutro
+        
+        word_lower = word.lower()
+        definition_lower = definition.lower()
+        
+        # Pontuação inicial baseada na palavra (se ela mesma for um marcador)
+        score = 5.0 # Base neutra (0-10)
+
+        # Verificar se a própria palavra é um forte indicador (uma passada no autômato)
+        word_category = self._abstraction_automaton.first_category(word_lower, ('abstract_keywords', 'concrete_keywords'))
+        if word_category == 'abstract_keywords':
+            score += 2.5
+        elif word_category == 'concrete_keywords':
+            score -= 2.5
+
+        # Ajustar com base na definição (marcadores distintos encontrados, em uma única passada)
+        if definition_lower:
+            definition_hits = self._abstraction_automaton.find_categories(definition_lower)
+            abstract_hits = len(definition_hits['abstract_keywords'])
+            concrete_hits = len(definition_hits['concrete_keywords'])
+
+            if abstract_hits > concrete_hits:
+                score += (abstract_hits - concrete_hits) * 1.5 
+            elif concrete_hits > abstract_hits:
+                score -= (concrete_hits - abstract_hits) * 1.5
+        
+        return min(max(score, 0.0), 10.0) # Normaliza para 0-10
+
+    def _analyze_definition_complexity(self, definition: str) -> float:
+        if not definition:
+            return 3.0  # Neutro se não há definição (0-10)
+        
+        try:
+            # Usar Flesch Reading Ease (Português) e normalizar para 0-10
+            # Flesch Reading Ease: 0-100 (mais alto = mais fácil)
+            # Para o Brasil, a fórmula é: 248.835 - (1.015 * ASL) - (84.6 * ASW)
+            # ASL = tamanho médio da sentença, ASW = média de sílabas por palavra
+            # textstat.set_lang('pt_BR') # Não existe em textstat, ele tenta detectar
+            f_ease = _get_flesch_reading_ease()(definition)
+            
+            # Inverter e escalar para 0-10 (0 = muito fácil, 10 = muito difícil)
+            # Ex: f_ease 100 (fácil) -> 0 ; f_ease 0 (difícil) -> 10
+            score = (100 - f_ease) / 10.0
+            return min(max(score, 0.0), 10.0)
+
+        except Exception as e:
+            self.logger.warning(f"Erro ao calcular Flesch Reading Ease para definição: {e}. Usando fallback.")
+            # Fallback simples baseado no comprimento da definição
+            length = len(definition)
+            if length < 50: return 1.5
+            if length < 100: return 3.0
+            if length < 150: return 5.0
+            if length < 250: return 7.0
+            return 9.0
+    
+    def _basic_complexity_fallback(self, word: str) -> ComplexityMetrics:
+        length = len(word)
+        basic_score = 0.0
+        if length > 0 : basic_score = min(length * 0.8, 10.0) # Escala simples
+        
+        syll_count_fallback = count_syllables(word) if word else 0
+
+        return ComplexityMetrics(
+            lexical_length=length,
+            syllabic_complexity=syll_count_fallback,
+            morphological_density=basic_score / 3 if basic_score > 0 else 1.0, # Estimativa
+            semantic_abstraction=basic_score / 3 if basic_score > 0 else 3.0,  # Estimativa
+            definition_complexity=basic_score / 3 if basic_score > 0 else 3.0, # Estimativa
+            composite_score=min(basic_score,10.0)
+        )
+    
+    def get_difficulty_level_from_metrics(self, metrics: ComplexityMetrics) -> str:
+        """Classificação em nível de dificuldade com base nas métricas (score composto)."""
+        score = metrics.composite_score
+        
+        if score < self.complexity_thresholds['fácil'][1]: # Limite superior de 'fácil'
+            return 'fácil'
+        elif score < self.complexity_thresholds['média'][1]: # Limite superior de 'média'
+            return 'média'
+        else:
+            return 'difícil'
+
+# Exemplo de uso (para teste local)
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    analyzer = WordComplexityAnalyzer()
+    
+    palavras_teste = {
+        "casa": "Estrutura construída para habitação.",
+        "sol": "Estrela central do nosso sistema solar.",
+        "felicidade": "Estado de contentamento e bem-estar.",
+        "inconstitucionalissimamente": "De maneira ou modo muito inconstitucional.",
+        "pneumoultramicroscopicossilicovulcanoconiose": "Doença pulmonar causada pela inalação de cinzas vulcânicas.",
+        "paralelepípedo": "Sólido geométrico com seis faces paralelas e iguais duas a duas.",
+        "transcendência": "Qualidade do que é transcendente, que ultrapassa os limites.",
+        "amor": "Sentimento de afeição profunda.",
+        "ódio": "Sentimento intenso de aversão ou repulsa.",
+        "efêmero": "Que dura pouco tempo; passageiro, transitório.",
+        "complexidade": "Qualidade do que é complexo, que apresenta múltiplos elementos e interações."
+    }
+    
+    for palavra, definicao in palavras_teste.items():
+        print(f"\nAnalisando: {palavra}")
+        metrics_obj = analyzer.infer_word_complexity_metrics(palavra, definicao)
+        difficulty = analyzer.get_difficulty_level_from_metrics(metrics_obj)
+        print(f"  Score Composto: {metrics_obj.composite_score:.2f}")
+        print(f"  Nível Inferido: {difficulty}")
+        print(f"  Métricas Detalhadas: {metrics_obj}")
+
+    print("\nTeste com palavra vazia e definição:")
+    metrics_vazia = analyzer.infer_word_complexity_metrics("", "alguma definicao")
+    difficulty_vazia = analyzer.get_difficulty_level_from_metrics(metrics_vazia)
+    print(f"  Score Composto: {metrics_vazia.composite_score:.2f}, Nível: {difficulty_vazia}")
+
+    print("\nTeste com palavra e definição vazia:")
+    metrics_vazia_total = analyzer.infer_word_complexity_metrics("teste", "")
+    difficulty_vazia_total = analyzer.get_difficulty_level_from_metrics(metrics_vazia_total)
+    print(f"  Score Composto: {metrics_vazia_total.composite_score:.2f}, Nível: {difficulty_vazia_total}")
+
+    print("\nTeste com palavra e definição None:")
+    metrics_none = analyzer.infer_word_complexity_metrics("palavra", None)
+    difficulty_none = analyzer.get_difficulty_level_from_metrics(metrics_none)
     print(f"  Score Composto: {metrics_none.composite_score:.2f}, Nível: {difficulty_none}") 
\ No newline at end of file
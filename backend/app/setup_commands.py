@@ -0,0 +1,86 @@
+# backend/app/setup_commands.py
+"""
+Comandos de preparação do ambiente, executados explicitamente (fora do caminho de
+inicialização dos workers uvicorn).
+
+Uso (a partir da raiz do projeto):
+    python -m backend.app.setup_commands init-db        # Cria as tabelas do banco
+    python -m backend.app.setup_commands download-nltk  # Baixa os recursos do NLTK
+    python -m backend.app.setup_commands all            # Executa ambos
+    python -m backend.app.setup_commands rescore-words  # Recalcula a complexidade das palavras mestras
+"""
+import argparse
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+
+# Recursos do NLTK usados pelo textstat/WordComplexityAnalyzer
+NLTK_RESOURCES = (
+    ("tokenizers/punkt", "punkt"),
+    ("corpora/cmudict", "cmudict"),
+)
+
+
+def init_db() -> None:
+    """Cria as tabelas que ainda não existem no banco configurado."""
+    from . import models
+    from .database import engine
+
+    models.Base.metadata.create_all(bind=engine)
+    logger.info(f"Tabelas criadas/verificadas em {engine.url}")
+
+
+def download_nltk_resources() -> bool:
+    """Baixa os recursos do NLTK ausentes. Retorna False se algum download falhar."""
+    import nltk
+
+    ok = True
+    for resource_path, package in NLTK_RESOURCES:
+        try:
+            nltk.data.find(resource_path)
+            logger.info(f"Recurso NLTK '{package}' já disponível.")
+        except LookupError:
+            logger.info(f"Baixando recurso NLTK '{package}'...")
+            if not nltk.download(package, quiet=True):
+                logger.error(f"Falha ao baixar o recurso NLTK '{package}'.")
+                ok = False
+    return ok
+
+
+def rescore_words() -> int:
+    """
+    Recalcula as métricas de complexidade de todas as palavras mestras com o analisador atual
+    (por exemplo, após calibrar os coeficientes). Retorna quantas palavras foram atualizadas.
+    """
+    from . import crud
+    from .database import SessionLocal
+    from .services.word_complexity_analyzer import WordComplexityAnalyzer
+
+    db = SessionLocal()
+    try:
+        rescored = crud.rescore_master_words(db, WordComplexityAnalyzer())
+    finally:
+        db.close()
+    logger.info(f"Complexidade recalculada para {rescored} palavras mestras.")
+    return rescored
+
+
+def main(argv=None) -> int:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Comandos de preparação do ambiente")
+    parser.add_argument("command", choices=("init-db", "download-nltk", "all", "rescore-words"))
+    args = parser.parse_args(argv)
+
+    ok = True
+    if args.command in ("init-db", "all"):
+        init_db()
+    if args.command in ("download-nltk", "all"):
+        ok = download_nltk_resources()
+    if args.command == "rescore-words":
+        rescore_words()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,281 +1,442 @@
-import os
-from fastapi import APIRouter, HTTPException, Depends, Request
-from fastapi.background import BackgroundTasks
-from typing import Optional, Dict, Any, Callable
-import asyncio
-import logging
-
-# Importar schemas de schemas.py
-from . import schemas
-# Se o acima falhar em tempo de execução devido à forma como o FastAPI carrega, pode precisar de ajuste para o projeto
-# from app import schemas # Alternativa se estiver executando de um diretório pai
-
-from .services.word_complexity_analyzer import WordComplexityAnalyzer, ComplexityMetrics as ComplexityMetricsDataclass
-# As instâncias dos serviços de API serão injetadas
-
-class WordInfoService:
-
-    """
-    Serviço principal para obtenção e análise de palavras
-    Integra todas as APIs e análises 
-    """   
-    def __init__(self, dictionary_api_service: Any, image_api_service: Any, tts_api_service: Any, static_files_dir: str):
-        self.dictionary_api = dictionary_api_service
-        self.image_api = image_api_service
-        self.tts_service = tts_api_service
-        self.complexity_analyzer = WordComplexityAnalyzer() # WordComplexityAnalyzer é instanciado aqui
-        self.logger = logging.getLogger(__name__)
-        self.static_files_dir = static_files_dir
-        
-        self.complexity_cache: Dict[str, ComplexityMetricsDataclass] = {}
-        self._last_cache_hit = False # Para rastrear o hit do cache de complexidade
-        self.logger.info("WordInfoService inicializado.")
-
-    # Informações da request atual, a serem definidas pelo endpoint antes de chamar get_word_info
-    # Isso é um work-around. Idealmente, seriam passadas como argumentos ou via dependência mais robusta.
-    current_request_base_url: str = ""
-    current_app_url_path_for: Optional[Callable] = None 
-
-    async def get_word_info(self, word_text: str) -> schemas.WordInfoResponse:
-        """
-        Endpoint-facing method to get word info, including URL construction.
-        """
-        original_word_text = word_text # Manter o texto original para a resposta
-        normalized_word_text = word_text.strip().lower()
-        
-        try:
-            if not self._validate_word(normalized_word_text):
-                self.logger.warning(f"Palavra inválida fornecida: '{original_word_text}'")
-                raise HTTPException(status_code=400, detail=f"Palavra inválida: '{original_word_text}'. Deve ser alfabética e ter entre 2 e 30 caracteres.")
-            
-            self.logger.info(f"Iniciando processamento para: '{normalized_word_text}' (via endpoint)")
-            
-            # Chamada para o novo método interno para obter os dados base
-            word_data_internal = await self._get_word_info_data_internal(normalized_word_text)
-            
-            # Constrói a URL do áudio AQUI, usando as informações da request
-            audio_url = None
-            # Obter o nome do ficheiro de áudio de forma segura
-            audio_filename = word_data_internal.get('audio_filename')
-
-            # Verificar se o nome do ficheiro e as dependências da request estão disponíveis
-            if audio_filename and self.current_request_base_url and self.current_app_url_path_for:
-                 try:
-                      # Construir o caminho estático para o áudio
-                      audio_path = f'audio/{audio_filename}'
-                      # Construir a URL completa usando as informações da request e o caminho estático
-                      audio_url = f"{self.current_request_base_url.rstrip('/')}{self.current_app_url_path_for('static', path=audio_path)}"
-                      self.logger.info(f"Áudio URL para '{normalized_word_text}' (endpoint): {audio_url}")
-                 except Exception as e:
-                      self.logger.error(f"Erro ao construir URL de áudio para '{normalized_word_text}': {e}", exc_info=True)
-            elif audio_filename:
-                # Caso o nome do ficheiro exista mas as informações da request não
-                self.logger.warning(f"Não foi possível construir URL completa para o áudio '{audio_filename}' de '{normalized_word_text}' (request_base_url ou app_url_path_for não definidos no serviço)")
-
-            # Monta a resposta final para o endpoint
-            response = schemas.WordInfoResponse(
-                text=original_word_text,
-                definition=word_data_internal['definition'],
-                image_url=word_data_internal['image_url'],
-                audio_url=audio_url, # Usar a URL construída
-                inferred_complexity_score=word_data_internal['complexity_metrics'].composite_score,
-                complexity_metrics=schemas.ComplexityBreakdownSchema(
-                    lexical_length=word_data_internal['complexity_metrics'].lexical_length,
-                    syllabic_complexity=word_data_internal['complexity_metrics'].syllabic_complexity,
-                    morphological_density=word_data_internal['complexity_metrics'].morphological_density,
-                    semantic_abstraction=word_data_internal['complexity_metrics'].semantic_abstraction,
-                    definition_complexity=word_data_internal['complexity_metrics'].definition_complexity
-                ),
-                difficulty_level=self.complexity_analyzer.get_difficulty_level_from_metrics(word_data_internal['complexity_metrics']),
-                processing_metadata=schemas.ProcessingMetadataSchema(**word_data_internal['processing_metadata'])
-            )
-            
-            self.logger.info(f"Resposta endpoint completa para '{normalized_word_text}'.")
-            return response
-            
-        except HTTPException as he:
-            self.logger.error(f"HTTPException durante o processamento de '{original_word_text}' (endpoint): {he.detail}", exc_info=True)
-            raise he
-        except Exception as e:
-            self.logger.critical(f"Erro crítico não tratado no endpoint '{original_word_text}': {e}", exc_info=True)
-            raise HTTPException(status_code=500, detail=f"Erro interno no servidor ao processar a palavra '{original_word_text}'. Contate o suporte.")
-
-    async def _get_word_info_data_internal(self, normalized_word_text: str) -> Dict[str, Any]:
-        """
-        Obtém dados da palavra (definição, imagem URL, áudio filename, complexidade) para uso interno.
-        Não constrói URLs completas nem usa Request.
-        """
-        self.logger.info(f"Iniciando processamento interno para: '{normalized_word_text}'")
-
-        definition_task = self._get_definition_safe(normalized_word_text)
-        image_task = self._get_image_safe(normalized_word_text)
-        audio_base_path_str = await asyncio.to_thread(self._get_audio_base_path) # síncrono, em thread
-
-        results = await asyncio.gather(
-            definition_task,
-            image_task,
-            return_exceptions=True
-        )
-        
-        definition_res = results[0]
-        image_url_res = results[1]
-        
-        definition = "" 
-        if isinstance(definition_res, Exception):
-            self.logger.error(f"Erro (interno) ao obter definição para '{normalized_word_text}': {definition_res}", exc_info=isinstance(definition_res, Exception))
-        elif definition_res:
-            definition = definition_res
-
-        image_url = None
-        if isinstance(image_url_res, Exception):
-             self.logger.error(f"Erro (interno) ao obter imagem para '{normalized_word_text}': {image_url_res}", exc_info=isinstance(image_url_res, Exception))
-        elif image_url_res:
-             image_url = image_url_res
-
-        audio_filename = None
-        if audio_base_path_str: # Prossiga com áudio apenas se o path base foi obtido
-            try:
-                # Geração de áudio é assíncrona e usa o path base, retorna apenas o nome do arquivo
-                audio_filename = await self._generate_audio_safe(normalized_word_text, audio_base_path_str)
-                if audio_filename:
-                     self.logger.info(f"Áudio filename gerado para '{normalized_word_text}' (interno): {audio_filename}")
-
-            except Exception as e:
-                self.logger.error(f"Erro (interno) ao gerar áudio para '{normalized_word_text}': {e}", exc_info=True)
-
-        self.logger.debug(f"Analisando complexidade (interno) para '{normalized_word_text}' com definição: '{definition[:50]}...'")
-        complexity_analysis_metrics = self._analyze_complexity_cached(normalized_word_text, definition)
-
-        current_time = asyncio.get_event_loop().time() if asyncio.get_event_loop().is_running() else 0.0
-        processing_metadata_dict = {
-            'analysis_timestamp': current_time,
-            'definition_available': bool(definition and definition != "Definição não disponível."),
-            'image_available': bool(image_url),
-            'audio_available': bool(audio_filename), # Verifica se o filename foi gerado
-            'cache_hit': self._last_cache_hit, 
-            'complexity_method': 'neuropsychological_inference'
-        }
-
-        # Retorna um dicionário com os dados relevantes
-        return {
-            'text': normalized_word_text,
-            'definition': definition if definition else "Definição não disponível.",
-            'image_url': image_url, # Retorna a URL da imagem, se disponível (pode ser útil internamente)
-            'audio_filename': audio_filename, # Retorna apenas o nome do arquivo de áudio
-            'complexity_metrics': complexity_analysis_metrics,
-            'processing_metadata': processing_metadata_dict
-        }
-
-    def _get_audio_base_path(self) -> str:
-        audio_dir = os.path.join(self.static_files_dir, "audio")
-        if not os.path.exists(audio_dir):
-            try:
-                os.makedirs(audio_dir, exist_ok=True)
-                self.logger.info(f"Diretório de áudio criado ou já existente: {audio_dir}")
-            except OSError as e:
-                self.logger.error(f"Falha ao criar diretório de áudio {audio_dir}: {e}", exc_info=True)
-                raise
-        return audio_dir
-
-    def _validate_word(self, word: str) -> bool:
-        return bool(word and word.isalpha() and 2 <= len(word) <= 30)
-    
-    async def _get_definition_safe(self, word: str) -> str:
-        try:
-            result = await self.dictionary_api.get_word_info(word) 
-            return result.get('definition', '') if result else ''.strip()
-        except Exception as e:
-            self.logger.warning(f"Falha na API do dicionário para '{word}'. Erro: {e}", exc_info=True)
-            return ""
-    
-    async def _get_image_safe(self, word: str) -> Optional[str]:
-        try:
-            return await self.image_api.get_image_for_word(word)
-        except Exception as e:
-            self.logger.warning(f"Falha na API de imagens para '{word}'. Erro: {e}", exc_info=True)
-            return None
-    
-    async def _generate_audio_safe(self, word: str, audio_base_path: str) -> Optional[str]:
-        """Gera o áudio e retorna apenas o nome do arquivo."""
-        try:
-            # tts_service.generate_audio_from_text deve ser async e retornar o nome do arquivo
-            filename = await self.tts_service.generate_audio_from_text(word, audio_base_path)
-            return filename
-        except Exception as e:
-            self.logger.warning(f"Falha no TTS para '{word}'. Erro: {e}", exc_info=True)
-            return None
-
-    def _analyze_complexity_cached(self, word: str, definition: str) -> ComplexityMetricsDataclass:
-        definition_key_part = definition if definition else "<no_definition>"
-        cache_key = f"{word}:{hash(definition_key_part)}"
-        
-        cached_metrics = self.complexity_cache.get(cache_key)
-        if cached_metrics:
-            self.logger.debug(f"Cache HIT para complexidade de '{word}'")
-            self._last_cache_hit = True
-            return cached_metrics
-        
-        self.logger.debug(f"Cache MISS para complexidade de '{word}'. Analisando...")
-        self._last_cache_hit = False
-        metrics = self.complexity_analyzer.infer_word_complexity_metrics(word, definition)
-        self.complexity_cache[cache_key] = metrics
-        
-        if len(self.complexity_cache) > 1000:
-            try:
-                oldest_key = next(iter(self.complexity_cache))
-                del self.complexity_cache[oldest_key]
-                self.logger.info(f"Cache de complexidade atingiu o limite. Chave mais antiga removida: {oldest_key}")
-            except StopIteration:
-                pass
-        return metrics
-
-# Router FastAPI
-router = APIRouter(
-    prefix="/api/v1", # Adicionando um prefixo para este router
-    tags=["Word Information"]      # Agrupando endpoints na documentação Swagger/OpenAPI
-)
-
-# Instância global do serviço neste módulo, será configurada a partir de main.py
-# Esta abordagem com uma instância global pode ter implicações em testes e concorrência
-# se o estado (como current_request_base_url) não for gerenciado cuidadosamente.
-word_service_instance_local: Optional[WordInfoService] = None
-
-# Função para configurar a instância do serviço a partir de main.py
-def configure_word_info_service(instance: WordInfoService):
-    global word_service_instance_local
-    word_service_instance_local = instance
-    logging.info("Instância de WordInfoService configurada no router word_info_endpoint.")
-
-@router.get("/word_info/{word_text}", response_model=schemas.WordInfoResponse)
-async def get_word_info_endpoint_route(
-    word_text: str, 
-    request: Request, 
-    background_tasks: BackgroundTasks
-):
-    if not word_service_instance_local:
-        logging.critical("WordInfoService não inicializado antes da chamada do endpoint.")
-        raise HTTPException(status_code=503, detail="Serviço de informações de palavras não inicializado.")
-    
-    # Atualizar o serviço com informações da request atual
-    word_service_instance_local.current_request_base_url = str(request.base_url)
-    word_service_instance_local.current_app_url_path_for = request.app.url_path_for
-
-    result = await word_service_instance_local.get_word_info(word_text)
-    
-    background_tasks.add_task(
-        log_analytics_word_request, 
-        word_text,
-        result.inferred_complexity_score,
-        result.difficulty_level,
-        bool(result.definition and result.definition != "Definição não disponível."),
-        bool(result.image_url),
-        bool(result.audio_url)
-    )
-    return result
-
-async def log_analytics_word_request(word: str, complexity_score: float, level: str, def_ok: bool, img_ok: bool, aud_ok: bool):
-    logging.info(f"ANALYTICS: Palavra='{word}', Score={complexity_score:.2f}, Nível='{level}', DefOK={def_ok}, ImgOK={img_ok}, AudOK={aud_ok}")
-
-@router.get("/health", tags=["Word Information", "Health"])
-async def word_info_health_check():
-    return {"status": "WordInfoService router is operational"} 
\ No newline at end of file
+import os
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi.background import BackgroundTasks
+from typing import Optional, Dict, Any, Callable, List, Tuple
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+# Importar schemas de schemas.py
+from . import schemas
+# Se o acima falhar em tempo de execução devido à forma como o FastAPI carrega, pode precisar de ajuste para o projeto
+# from app import schemas # Alternativa se estiver executando de um diretório pai
+
+from .services.word_complexity_analyzer import WordComplexityAnalyzer, ComplexityMetrics as ComplexityMetricsDataclass
+from .services.lru_cache import LRUCache, stable_content_key
+from .services.stage_graph import Stage, StageGraph
+from .services.image_mirror import ImageMirror, MirroredImage, WordImages
+from .core.config import (
+    COMPLEXITY_CACHE_SIZE, WORD_INFO_ETAG_TTL_SECONDS, UPSTREAM_RESULT_CACHE_SIZE, UPSTREAM_RESULT_CACHE_TTL_SECONDS,
+    DEFINITION_STAGE_TIMEOUT_SECONDS, IMAGE_STAGE_TIMEOUT_SECONDS, AUDIO_STAGE_TIMEOUT_SECONDS,
+)
+from .core.http_cache import REVALIDATE_CACHE_CONTROL, compute_etag, etag_matches, not_modified_response
+from .core import metrics
+from .core.tracing import tracer
+# As instâncias dos serviços de API serão injetadas
+
+
+@dataclass(frozen=True)
+class StaticURLBuilder:
+    """URLs completas de /static com a origem e o root_path de uma request (um por request, nunca compartilhado)."""
+    base_url: str
+    url_path_for: Callable
+
+    @classmethod
+    def from_request(cls, request: Request) -> "StaticURLBuilder":
+        return cls(base_url=str(request.base_url), url_path_for=request.app.url_path_for)
+
+    def __call__(self, path: str) -> str:
+        return f"{self.base_url.rstrip('/')}{self.url_path_for('static', path=path)}"
+
+
+class WordInfoService:
+
+    """
+    Serviço principal para obtenção e análise de palavras
+    Integra todas as APIs e análises 
+    """   
+    def __init__(self, dictionary_api_service: Any, image_api_service: Any, tts_api_service: Any, static_files_dir: str, complexity_cache_size: int = COMPLEXITY_CACHE_SIZE, image_mirror: Optional[ImageMirror] = None):
+        self.dictionary_api = dictionary_api_service
+        self.image_api = image_api_service
+        self.tts_service = tts_api_service
+        self.complexity_analyzer = WordComplexityAnalyzer() # WordComplexityAnalyzer é instanciado aqui
+        self.logger = logging.getLogger(__name__)
+        self.static_files_dir = static_files_dir
+        self.image_mirror = image_mirror # Espelho local das imagens (None: URLs do Pixabay)
+        # Diretório de áudio resolvido (e criado) uma vez; sem ele, o áudio fica indisponível
+        try:
+            self.audio_base_path: Optional[str] = self._get_audio_base_path()
+        except OSError:
+            self.audio_base_path = None
+        
+        # Cache LRU com chaves estáveis (hash de conteúdo); o hit/miss é retornado por chamada
+        self.complexity_cache = LRUCache(maxsize=complexity_cache_size, name="complexity")
+        metrics.register_cache(self.complexity_cache.name, self.complexity_cache.stats)
+        # Resultados encontrados no dicionário e no Pixabay, por palavra normalizada (vazios e erros não entram)
+        self.definition_cache = LRUCache(maxsize=UPSTREAM_RESULT_CACHE_SIZE, name="definition", ttl_seconds=UPSTREAM_RESULT_CACHE_TTL_SECONDS)
+        self.image_cache = LRUCache(maxsize=UPSTREAM_RESULT_CACHE_SIZE, name="image", ttl_seconds=UPSTREAM_RESULT_CACHE_TTL_SECONDS)
+        for cache in (self.definition_cache, self.image_cache):
+            metrics.register_cache(cache.name, cache.stats)
+        self.logger.info("WordInfoService inicializado.")
+
+    async def get_word_info(self, word_text: str, static_urls: Optional[StaticURLBuilder] = None) -> schemas.WordInfoResponse:
+        """
+        Endpoint-facing method to get word info, including URL construction.
+        `static_urls` monta as URLs de áudio/imagem com a origem da request (sem ele, não há URL de áudio).
+        """
+        original_word_text = word_text # Manter o texto original para a resposta
+        normalized_word_text = word_text.strip().lower()
+        
+        try:
+            if not self._validate_word(normalized_word_text):
+                self.logger.warning(f"Palavra inválida fornecida: '{original_word_text}'")
+                raise HTTPException(status_code=400, detail=f"Palavra inválida: '{original_word_text}'. Deve ser alfabética e ter entre 2 e 30 caracteres.")
+            
+            self.logger.info(f"Iniciando processamento para: '{normalized_word_text}' (via endpoint)")
+            
+            # Chamada para o novo método interno para obter os dados base
+            word_data_internal = await self._get_word_info_data_internal(normalized_word_text)
+            response = self.build_word_info_response(original_word_text, word_data_internal, static_urls)
+            self.logger.info(f"Resposta endpoint completa para '{normalized_word_text}'.")
+            return response
+            
+        except HTTPException as he:
+            self.logger.error(f"HTTPException durante o processamento de '{original_word_text}' (endpoint): {he.detail}", exc_info=True)
+            raise he
+        except Exception as e:
+            self.logger.critical(f"Erro crítico não tratado no endpoint '{original_word_text}': {e}", exc_info=True)
+            raise HTTPException(status_code=500, detail=f"Erro interno no servidor ao processar a palavra '{original_word_text}'. Contate o suporte.")
+
+    def build_word_info_response(self, original_word_text: str, word_data_internal: Dict[str, Any],
+                                 static_urls: Optional[StaticURLBuilder] = None) -> schemas.WordInfoResponse:
+        """Resposta de /word a partir dos dados já enriquecidos (_get_word_info_data_internal), sem novo enriquecimento."""
+        normalized_word_text = word_data_internal['text']
+        # Constrói a URL do áudio AQUI, usando as informações da request
+        audio_url = None
+        # Obter o nome do ficheiro de áudio de forma segura
+        audio_filename = word_data_internal.get('audio_filename')
+
+        # Verificar se o nome do ficheiro e as informações da request estão disponíveis
+        if audio_filename and static_urls is not None:
+             try:
+                  # Construir a URL completa usando as informações da request e o caminho estático
+                  audio_url = static_urls(f'audio/{audio_filename}')
+                  self.logger.info(f"Áudio URL para '{normalized_word_text}' (endpoint): {audio_url}")
+             except Exception as e:
+                  self.logger.error(f"Erro ao construir URL de áudio para '{normalized_word_text}': {e}", exc_info=True)
+        elif audio_filename:
+            # Caso o nome do ficheiro exista mas as informações da request não
+            self.logger.warning(f"Não foi possível construir URL completa para o áudio '{audio_filename}' de '{normalized_word_text}' (sem as informações da request)")
+
+        # Imagens espelhadas localmente: URLs da própria origem no lugar das do Pixabay
+        image_url = word_data_internal['image_url']
+        image_thumbnail_url = None
+        image_alternate_urls: List[str] = []
+        if word_data_internal.get('image_filename') and static_urls is not None:
+            try:
+                image_url = static_urls(f"images/{word_data_internal['image_filename']}")
+                if word_data_internal.get('image_thumbnail_filename'):
+                    image_thumbnail_url = static_urls(f"images/{word_data_internal['image_thumbnail_filename']}")
+                image_alternate_urls = [static_urls(f"images/{filename}") for filename in word_data_internal.get('image_alternate_filenames', [])]
+            except Exception as e:
+                self.logger.error(f"Erro ao construir URLs das imagens espelhadas de '{normalized_word_text}': {e}", exc_info=True)
+
+        # Monta a resposta final para o endpoint
+        return schemas.WordInfoResponse(
+            text=original_word_text,
+            definition=word_data_internal['definition'],
+            image_url=image_url,
+            image_thumbnail_url=image_thumbnail_url,
+            image_alternate_urls=image_alternate_urls,
+            audio_url=audio_url, # Usar a URL construída
+            inferred_complexity_score=word_data_internal['complexity_metrics'].composite_score,
+            complexity_metrics=schemas.ComplexityBreakdownSchema(
+                lexical_length=word_data_internal['complexity_metrics'].lexical_length,
+                syllabic_complexity=word_data_internal['complexity_metrics'].syllabic_complexity,
+                morphological_density=word_data_internal['complexity_metrics'].morphological_density,
+                semantic_abstraction=word_data_internal['complexity_metrics'].semantic_abstraction,
+                definition_complexity=word_data_internal['complexity_metrics'].definition_complexity
+            ),
+            difficulty_level=self.complexity_analyzer.get_difficulty_level_from_metrics(word_data_internal['complexity_metrics']),
+            processing_metadata=schemas.ProcessingMetadataSchema(**word_data_internal['processing_metadata'])
+        )
+
+    async def _get_word_info_data_internal(self, normalized_word_text: str) -> Dict[str, Any]:
+        """
+        Obtém dados da palavra (definição, imagem URL, áudio filename, complexidade) para uso interno.
+        Não constrói URLs completas nem usa Request.
+        """
+        with tracer.span("word_info.enrich", word=normalized_word_text):
+            return await self._enrich_word(normalized_word_text)
+
+    def _enrichment_graph(self, word: str) -> StageGraph:
+        """
+        Etapas do enriquecimento: definição, imagem e áudio dependem só da palavra e rodam em
+        paralelo; a complexidade depende da definição. Cada etapa tem timeout próprio.
+        """
+        async def definition_stage(_inputs):
+            return await self._get_definition_safe(word)
+
+        async def image_stage(_inputs):
+            return await self._get_image_safe(word)
+
+        async def audio_stage(_inputs):
+            if not self.audio_base_path:
+                return None
+            return await self._generate_audio_safe(word, self.audio_base_path)
+
+        async def complexity_stage(inputs):
+            definition = inputs['definition'] or ""
+            self.logger.debug(f"Analisando complexidade (interno) para '{word}' com definição: '{definition[:50]}...'")
+            return self._analyze_complexity_cached(word, definition)
+
+        return StageGraph([
+            Stage('definition', definition_stage, timeout_seconds=DEFINITION_STAGE_TIMEOUT_SECONDS, default=""),
+            Stage('image', image_stage, timeout_seconds=IMAGE_STAGE_TIMEOUT_SECONDS),
+            Stage('audio', audio_stage, timeout_seconds=AUDIO_STAGE_TIMEOUT_SECONDS),
+            Stage('complexity', complexity_stage, depends_on=('definition',)),
+        ])
+
+    async def _enrich_word(self, normalized_word_text: str) -> Dict[str, Any]:
+        self.logger.info(f"Iniciando processamento interno para: '{normalized_word_text}'")
+
+        graph_result = await self._enrichment_graph(normalized_word_text).run()
+        if graph_result.incomplete:
+            self.logger.warning(f"Enriquecimento parcial de '{normalized_word_text}': etapas sem resultado {graph_result.incomplete}")
+
+        definition = graph_result.value('definition') or ""
+        word_images: Optional[WordImages] = graph_result.value('image')
+        chosen_image = word_images.chosen if word_images else None
+        image_url = chosen_image.source_url if chosen_image else None
+        audio_filename = graph_result.value('audio')
+        if audio_filename:
+            self.logger.info(f"Áudio filename gerado para '{normalized_word_text}' (interno): {audio_filename}")
+        if graph_result.stages['complexity'].ok:
+            complexity_analysis_metrics, complexity_cache_hit = graph_result.value('complexity')
+        else:
+            complexity_analysis_metrics, complexity_cache_hit = self._analyze_complexity_cached(normalized_word_text, definition)
+
+        current_time = asyncio.get_event_loop().time() if asyncio.get_event_loop().is_running() else 0.0
+        processing_metadata_dict = {
+            'analysis_timestamp': current_time,
+            'definition_available': bool(definition and definition != "Definição não disponível."),
+            'image_available': bool(image_url),
+            'audio_available': bool(audio_filename), # Verifica se o filename foi gerado
+            'cache_hit': complexity_cache_hit,
+            'complexity_method': 'neuropsychological_inference',
+            'incomplete_stages': graph_result.incomplete,
+        }
+
+        # Retorna um dicionário com os dados relevantes
+        return {
+            'text': normalized_word_text,
+            'definition': definition if definition else "Definição não disponível.",
+            'image_url': image_url, # Retorna a URL da imagem, se disponível (pode ser útil internamente)
+            'image_filename': chosen_image.filename if chosen_image else None, # Imagem espelhada em static/images
+            'image_thumbnail_filename': chosen_image.thumbnail if chosen_image else None,
+            'image_alternate_filenames': [image.filename for image in word_images.alternates] if word_images else [],
+            'audio_filename': audio_filename, # Retorna apenas o nome do arquivo de áudio
+            'complexity_metrics': complexity_analysis_metrics,
+            'processing_metadata': processing_metadata_dict
+        }
+
+    def _get_audio_base_path(self) -> str:
+        audio_dir = os.path.join(self.static_files_dir, "audio")
+        if not os.path.exists(audio_dir):
+            try:
+                os.makedirs(audio_dir, exist_ok=True)
+                self.logger.info(f"Diretório de áudio criado ou já existente: {audio_dir}")
+            except OSError as e:
+                self.logger.error(f"Falha ao criar diretório de áudio {audio_dir}: {e}", exc_info=True)
+                raise
+        return audio_dir
+
+    def _validate_word(self, word: str) -> bool:
+        return bool(word and word.isalpha() and 2 <= len(word) <= 30)
+    
+    # Os métodos *_safe registram a latência de cada backend externo com o resultado
+    # ('ok', 'empty' quando a API não devolve nada, 'error' em exceção)
+    async def _get_definition_safe(self, word: str) -> str:
+        with tracer.span("dictionary.definition", word=word, cache_hit=False) as span:
+            found, cached = self.definition_cache.get(word)
+            if found:
+                span.set_attribute('cache_hit', True)
+                span.set_attribute('found', True)
+                return cached
+            started_at = time.perf_counter()
+            try:
+                result = await self.dictionary_api.get_word_info(word) 
+                definition = result.get('definition', '') if result else ''.strip()
+                metrics.observe_upstream(metrics.DICTIONARY_BACKEND, started_at, 'ok' if definition else 'empty')
+                span.set_attribute('found', bool(definition))
+                if definition:
+                    self.definition_cache.put(word, definition)
+                return definition
+            except Exception as e:
+                metrics.observe_upstream(metrics.DICTIONARY_BACKEND, started_at, 'error')
+                metrics.upstream_errors.inc(metrics.DICTIONARY_BACKEND, type(e).__name__)
+                span.set_status("error")
+                self.logger.warning(f"Falha na API do dicionário para '{word}'. Erro: {e}", exc_info=True)
+                return ""
+    
+    async def _get_image_safe(self, word: str) -> Optional[WordImages]:
+        """Imagens da palavra: do espelho local, se já espelhada (sem consultar o Pixabay), ou da busca."""
+        with tracer.span("image.fetch", word=word, cache_hit=False) as span:
+            if self.image_mirror is not None:
+                mirrored = await self.image_mirror.lookup(word)
+                if mirrored is not None:
+                    span.set_attribute('cache_hit', True)
+                    span.set_attribute('found', True)
+                    return mirrored
+            found, cached = self.image_cache.get(word)
+            if found:
+                span.set_attribute('cache_hit', True)
+                span.set_attribute('found', True)
+                return cached
+            started_at = time.perf_counter()
+            try:
+                hits = await self.image_api.search_images(word)
+                metrics.observe_upstream(metrics.IMAGE_BACKEND, started_at, 'ok' if hits else 'empty')
+                span.set_attribute('found', bool(hits))
+                if not hits:
+                    return None
+                if self.image_mirror is not None:
+                    with tracer.span("image.mirror", word=word, images=len(hits)):
+                        word_images = await self.image_mirror.mirror(word, hits)
+                else:
+                    word_images = WordImages(word=word, images=[MirroredImage(source_url=hit['webformatURL'], tags=hit.get('tags', '')) for hit in hits])
+                # Com o espelho, o manifesto já responde às próximas consultas; o cache cobre a busca sem espelho
+                # e a busca cujos downloads falharam todos (as imagens seguem pelas URLs do Pixabay)
+                self.image_cache.put(word, word_images)
+                return word_images
+            except Exception as e:
+                metrics.observe_upstream(metrics.IMAGE_BACKEND, started_at, 'error')
+                metrics.upstream_errors.inc(metrics.IMAGE_BACKEND, type(e).__name__)
+                span.set_status("error")
+                self.logger.warning(f"Falha na API de imagens para '{word}'. Erro: {e}", exc_info=True)
+                return None
+    
+    async def _generate_audio_safe(self, word: str, audio_base_path: str) -> Optional[str]:
+        """Gera o áudio e retorna apenas o nome do arquivo."""
+        # O atributo cache_hit do span (áudio já existente em disco) é definido pelo tts_service
+        with tracer.span("tts.render", word=word) as span:
+            started_at = time.perf_counter()
+            try:
+                # tts_service.generate_audio_from_text deve ser async e retornar o nome do arquivo
+                filename = await self.tts_service.generate_audio_from_text(word, audio_base_path)
+                metrics.observe_upstream(metrics.TTS_BACKEND, started_at, 'ok' if filename else 'empty')
+                return filename
+            except Exception as e:
+                metrics.observe_upstream(metrics.TTS_BACKEND, started_at, 'error')
+                metrics.upstream_errors.inc(metrics.TTS_BACKEND, type(e).__name__)
+                span.set_status("error")
+                self.logger.warning(f"Falha no TTS para '{word}'. Erro: {e}", exc_info=True)
+                return None
+
+    def _analyze_complexity_cached(self, word: str, definition: str) -> Tuple[ComplexityMetricsDataclass, bool]:
+        """Retorna (métricas, cache_hit) para a palavra/definição."""
+        cache_key = stable_content_key(word, definition if definition else "<no_definition>")
+        evictions_before = self.complexity_cache.evictions
+
+        with tracer.span("complexity.analyze", word=word) as span:
+            complexity_metrics, cache_hit = self.complexity_cache.get_or_compute(
+                cache_key,
+                lambda: self.complexity_analyzer.infer_word_complexity_metrics(word, definition)
+            )
+            span.set_attribute('cache_hit', cache_hit)
+        if cache_hit:
+            self.logger.debug(f"Cache HIT para complexidade de '{word}'")
+        else:
+            self.logger.debug(f"Cache MISS para complexidade de '{word}'. Analisado.")
+            if self.complexity_cache.evictions > evictions_before:
+                self.logger.debug(f"Cache de complexidade atingiu o limite ({self.complexity_cache.maxsize}). Entrada menos recente removida.")
+        return complexity_metrics, cache_hit
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Estatísticas dos caches do serviço (tamanho, hits, misses, evicções, taxa de acerto)."""
+        return {
+            'complexity': self.complexity_cache.stats(),
+            'definition': self.definition_cache.stats(),
+            'image': self.image_cache.stats(),
+        }
+
+# Router FastAPI
+router = APIRouter(
+    prefix="/api/v1", # Adicionando um prefixo para este router
+    tags=["Word Information"]      # Agrupando endpoints na documentação Swagger/OpenAPI
+)
+
+# Instância global do serviço neste módulo, será configurada a partir de main.py.
+# Ela é compartilhada entre requests concorrentes: nada específico da request é guardado nela
+# (as URLs são montadas com um StaticURLBuilder por request).
+word_service_instance_local: Optional[WordInfoService] = None
+
+# Último ETag servido por (URL base, palavra normalizada): permite responder 304 sem refazer o enriquecimento
+word_info_etags = LRUCache(maxsize=COMPLEXITY_CACHE_SIZE, name="word_info_etag", ttl_seconds=WORD_INFO_ETAG_TTL_SECONDS)
+metrics.register_cache(word_info_etags.name, word_info_etags.stats)
+
+# Campos que mudam a cada chamada sem alterar o conteúdo (fora do ETag)
+_VOLATILE_FIELDS = {'processing_metadata': {'analysis_timestamp', 'cache_hit'}}
+
+
+def word_info_etag(result: schemas.WordInfoResponse) -> str:
+    return compute_etag(result.model_dump_json(exclude=_VOLATILE_FIELDS).encode("utf-8"))
+
+# Função para configurar a instância do serviço a partir de main.py
+def configure_word_info_service(instance: WordInfoService):
+    global word_service_instance_local
+    word_service_instance_local = instance
+    logging.info("Instância de WordInfoService configurada no router word_info_endpoint.")
+
+def get_configured_word_info_service() -> Optional[WordInfoService]:
+    """Instância configurada em app_config (None antes da configuração), para uso fora de requests."""
+    return word_service_instance_local
+
+def get_word_info_service() -> WordInfoService:
+    """Dependência dos routers: a instância configurada (503 se ainda não configurada)."""
+    if not word_service_instance_local:
+        logging.critical("WordInfoService não inicializado antes da chamada do endpoint.")
+        raise HTTPException(status_code=503, detail="Serviço de informações de palavras não inicializado.")
+    return word_service_instance_local
+
+def get_static_urls(request: Request) -> StaticURLBuilder:
+    """Dependência dos routers: montador de URLs de /static da request atual."""
+    return StaticURLBuilder.from_request(request)
+
+@router.get("/word_info/{word_text}", response_model=schemas.WordInfoResponse)
+async def get_word_info_endpoint_route(
+    word_text: str, 
+    request: Request, 
+    response: Response,
+    background_tasks: BackgroundTasks
+):
+    if not word_service_instance_local:
+        logging.critical("WordInfoService não inicializado antes da chamada do endpoint.")
+        raise HTTPException(status_code=503, detail="Serviço de informações de palavras não inicializado.")
+
+    # GET condicional: se o cliente já tem a versão atual, responde 304 sem processar a palavra
+    etag_key = (str(request.base_url), word_text.strip().lower())
+    found, known_etag = word_info_etags.get(etag_key)
+    if found and etag_matches(request, known_etag):
+        return not_modified_response(known_etag)
+    
+    result = await word_service_instance_local.get_word_info(word_text, StaticURLBuilder.from_request(request))
+
+    etag = word_info_etag(result)
+    word_info_etags.put(etag_key, etag)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
+    
+    background_tasks.add_task(
+        log_analytics_word_request, 
+        word_text,
+        result.inferred_complexity_score,
+        result.difficulty_level,
+        bool(result.definition and result.definition != "Definição não disponível."),
+        bool(result.image_url),
+        bool(result.audio_url)
+    )
+    return result
+
+async def log_analytics_word_request(word: str, complexity_score: float, level: str, def_ok: bool, img_ok: bool, aud_ok: bool):
+    logging.info(f"ANALYTICS: Palavra='{word}', Score={complexity_score:.2f}, Nível='{level}', DefOK={def_ok}, ImgOK={img_ok}, AudOK={aud_ok}")
+
+@router.get("/health", tags=["Word Information", "Health"])
+async def word_info_health_check():
+    response: Dict[str, Any] = {"status": "WordInfoService router is operational"}
+    if word_service_instance_local:
+        response["caches"] = {**word_service_instance_local.get_cache_stats(), 'word_info_etag': word_info_etags.stats()}
+    return response 
\ No newline at end of file
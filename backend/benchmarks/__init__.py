@@ -0,0 +1 @@
+# Scripts de benchmark de desempenho (executar a partir da raiz do projeto com `python -m backend.benchmarks.<script>`).
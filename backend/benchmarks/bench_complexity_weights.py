@@ -0,0 +1,90 @@
+# backend/benchmarks/bench_complexity_weights.py
+"""
+Benchmark do custo de inferência com os coeficientes aprendidos x pesos padrão.
+
+Os coeficientes aprendidos mudam apenas os valores do produto escalar (mais um intercepto),
+então o custo por palavra deve permanecer o mesmo. O script falha (código 1) se o
+analisador calibrado ficar mais lento que o padrão além da tolerância.
+
+Uso (a partir da raiz do projeto):
+    python -m backend.benchmarks.bench_complexity_weights [--size 20000] [--coefficients caminho.json]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+from backend.app.services.word_complexity_analyzer import SCORE_COMPONENTS, WordComplexityAnalyzer
+from backend.benchmarks.word_lists import generate_word_list
+
+
+def _best_of(repeats, func):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _sample_coefficients_file() -> str:
+    """Arquivo de coeficientes sintético, usado quando nenhum arquivo calibrado é informado."""
+    handle, path = tempfile.mkstemp(suffix=".json")
+    with os.fdopen(handle, "w", encoding="utf-8") as coefficients_file:
+        json.dump({
+            'version': 'benchmark',
+            'components': list(SCORE_COMPONENTS),
+            'weights': [0.18, 0.22, 0.2, 0.27, 0.13],
+            'intercept': -0.4,
+            'thresholds': [3.2, 6.8],
+        }, coefficients_file)
+    return path
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark: coeficientes aprendidos x pesos padrão")
+    parser.add_argument("--size", type=int, default=20000, help="Quantidade de palavras na lista")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--coefficients", default=None, help="Arquivo de coeficientes (padrão: sintético)")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Lentidão relativa máxima aceita")
+    args = parser.parse_args()
+
+    words = generate_word_list(args.size, args.seed)
+    coefficients_path = args.coefficients or _sample_coefficients_file()
+    try:
+        default_analyzer = WordComplexityAnalyzer(coefficients_path=None)
+        learned_analyzer = WordComplexityAnalyzer(coefficients_path=coefficients_path)
+    finally:
+        if not args.coefficients:
+            os.remove(coefficients_path)
+    if learned_analyzer.coefficients_version is None:
+        print(f"Não foi possível carregar os coeficientes de {coefficients_path}.")
+        return 2
+
+    print(f"Lista com {len(words)} palavras; coeficientes versão {learned_analyzer.coefficients_version}")
+    # Aquece as tabelas de memorização (sílabas) para medir apenas a inferência
+    default_analyzer.infer_batch(words)
+
+    failed = False
+    for label, make_call in (
+        ("infer_batch", lambda analyzer: lambda: analyzer.infer_batch(words)),
+        ("por palavra", lambda analyzer: lambda: [analyzer.infer_word_complexity_metrics(word, None) for word in words]),
+    ):
+        default_s = _best_of(args.repeats, make_call(default_analyzer))
+        learned_s = _best_of(args.repeats, make_call(learned_analyzer))
+        ratio = learned_s / default_s
+        print(f"{label:12s} padrão: {default_s / len(words) * 1e6:6.2f} µs/palavra | "
+              f"aprendido: {learned_s / len(words) * 1e6:6.2f} µs/palavra | razão: {ratio:.2f}")
+        if ratio > 1.0 + args.tolerance:
+            print(f"ERRO: inferência com coeficientes aprendidos mais lenta ({label}).")
+            failed = True
+    if not failed:
+        print("OK: custo de inferência inalterado.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
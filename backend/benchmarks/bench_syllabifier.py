@@ -0,0 +1,52 @@
+# backend/benchmarks/bench_syllabifier.py
+"""
+Benchmark do silabificador português contra o textstat.syllable_count.
+
+Uso (a partir da raiz do projeto):
+    python -m backend.benchmarks.bench_syllabifier [--size 50000]
+"""
+import argparse
+import time
+
+from backend.app.services import pt_syllabifier
+from backend.benchmarks.word_lists import generate_word_list
+
+
+def _time_it(func, words):
+    start = time.perf_counter()
+    result = func(words)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark: pt_syllabifier x textstat.syllable_count")
+    parser.add_argument("--size", type=int, default=50000, help="Quantidade de palavras na lista")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    words = generate_word_list(args.size, args.seed)
+    print(f"Lista com {len(words)} palavras ({len(set(words))} distintas)")
+
+    pt_syllabifier.count_syllables.cache_clear()
+    cold_s, counts = _time_it(pt_syllabifier.count_syllables_batch, words)
+    warm_s, _ = _time_it(pt_syllabifier.count_syllables_batch, words)
+    print(f"pt_syllabifier (frio):   {cold_s * 1000:9.1f} ms  ({cold_s / len(words) * 1e6:.2f} µs/palavra)")
+    print(f"pt_syllabifier (quente): {warm_s * 1000:9.1f} ms  ({warm_s / len(words) * 1e6:.2f} µs/palavra)")
+
+    try:
+        from textstat import syllable_count
+        syllable_count("teste")  # textstat depende do cmudict do NLTK
+    except Exception as e:
+        print(f"textstat indisponível ({type(e).__name__}); comparação ignorada.")
+        return
+
+    textstat_s, textstat_counts = _time_it(lambda ws: [syllable_count(w) for w in ws], words)
+    print(f"textstat.syllable_count: {textstat_s * 1000:9.1f} ms  ({textstat_s / len(words) * 1e6:.2f} µs/palavra)")
+    print(f"Aceleração (frio): {textstat_s / cold_s:.1f}x | (quente): {textstat_s / warm_s:.1f}x")
+
+    divergent = sum(1 for ours, theirs in zip(counts, textstat_counts) if ours != theirs)
+    print(f"Contagens divergentes do textstat: {divergent / len(words):.1%} (esperado: textstat usa regras do inglês)")
+
+
+if __name__ == "__main__":
+    main()
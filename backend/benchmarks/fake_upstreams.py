@@ -0,0 +1,296 @@
+# backend/benchmarks/fake_upstreams.py
+"""
+Servidores locais que substituem as APIs externas nos testes de desempenho:
+dicionario-aberto (`/word/{w}`, `/near/{w}`), Pixabay (`/api/` com `hits`, e as imagens)
+e o endpoint RPC do Google Translate usado pelo gTTS (resposta com o mp3 em base64).
+
+As respostas têm o mesmo formato das reais. Cada serviço tem um perfil configurável:
+latência (mediana + dispersão log-normal), taxa de erro (status HTTP configurável),
+taxa de "não encontrado" e distribuição do tamanho das respostas. O conteúdo de cada
+palavra é determinístico (derivado da própria palavra); latência e erros usam a semente.
+
+Uso (a partir da raiz do projeto):
+    python -m backend.benchmarks.fake_upstreams [--port 8765] [--latency-ms 80] [--error-rate 0.02]
+        [--pixabay "latency_ms=150,error_status=429"]
+
+e apontar a aplicação para ele (variáveis impressas na inicialização):
+    DICTIONARY_API_BASE_URL=http://127.0.0.1:8765/dicionario
+    PIXABAY_API_URL=http://127.0.0.1:8765/pixabay/api/   PIXABAY_API_KEY=fake
+    TTS_BASE_URL=http://127.0.0.1:8765/tts
+
+Em código, `FakeUpstreamServer` sobe o servidor numa thread (context manager); `BackgroundServer`
+faz o mesmo para qualquer aplicação ASGI.
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import struct
+import threading
+import time
+import urllib.parse
+import zlib
+from collections import Counter
+from dataclasses import dataclass, fields, replace
+from typing import Dict, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+
+SERVICES = ("dictionary", "pixabay", "tts")
+
+_DEFINITION_WORDS = [
+    "ação", "objeto", "lugar", "pessoa", "qualidade", "estado", "conjunto", "parte", "forma",
+    "modo", "relativo", "próprio", "utilizado", "pequeno", "grande", "casa", "trabalho", "tempo",
+    "movimento", "animal", "planta", "instrumento", "que", "de", "com", "para", "em", "ou",
+]
+
+
+@dataclass(frozen=True)
+class UpstreamProfile:
+    latency_ms: float = 50.0  # Mediana da latência
+    latency_sigma: float = 0.5  # Dispersão log-normal (0 = latência fixa)
+    error_rate: float = 0.0  # Fração de requisições que falham
+    error_status: int = 503
+    miss_rate: float = 0.1  # Fração de palavras sem resultado (dicionário vazio, zero hits)
+    min_size: int = 0  # Tamanho da resposta: palavras da definição / hits / KB do mp3 / px da imagem
+    max_size: int = 0  # 0 = padrão do serviço
+
+    def with_overrides(self, spec: Optional[str]) -> "UpstreamProfile":
+        """Aplica sobreposições no formato "campo=valor,campo=valor"."""
+        if not spec:
+            return self
+        types = {f.name: f.type for f in fields(self)}
+        changes = {}
+        for item in spec.split(","):
+            name, _, value = item.partition("=")
+            name = name.strip()
+            if name not in types:
+                raise ValueError(f"Campo de perfil desconhecido: {name}")
+            changes[name] = int(value) if types[name] in (int, "int") else float(value)
+        return replace(self, **changes)
+
+
+_DEFAULT_SIZES = {"dictionary": (4, 30), "pixabay": (1, 3), "tts": (3, 12), "image": (64, 320)}
+
+
+def _word_rng(service: str, word: str) -> random.Random:
+    digest = hashlib.blake2b(f"{service}\x1f{word}".encode("utf-8"), digest_size=8).digest()
+    return random.Random(int.from_bytes(digest, "big"))
+
+
+def _png(width: int, height: int, color: Tuple[int, int, int]) -> bytes:
+    """PNG RGB sólido (válido, sem dependências) para servir como imagem."""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff)
+    row = b"\x00" + bytes(color) * width
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(row * height))
+            + chunk(b"IEND", b""))
+
+
+class FakeUpstreams:
+    """Aplicação ASGI com os três serviços e contadores de requisições (`/__stats`)."""
+
+    def __init__(self, profiles: Optional[Dict[str, UpstreamProfile]] = None, seed: int = 42):
+        self.profiles = {service: UpstreamProfile() for service in SERVICES}
+        self.profiles.update(profiles or {})
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.requests = Counter()
+        self.errors = Counter()
+        self.app = self._build_app()
+
+    def _size_range(self, service: str, profile: UpstreamProfile) -> Tuple[int, int]:
+        low, high = _DEFAULT_SIZES[service]
+        return (profile.min_size or low, max(profile.max_size or high, profile.min_size or low))
+
+    async def _simulate(self, service: str, endpoint: str) -> Optional[Response]:
+        """Aplica latência e, conforme a taxa de erro, devolve a resposta de erro."""
+        profile = self.profiles[service]
+        with self._rng_lock:
+            delay = profile.latency_ms * self._rng.lognormvariate(0.0, profile.latency_sigma) if profile.latency_sigma > 0 else profile.latency_ms
+            failed = self._rng.random() < profile.error_rate
+        self.requests[endpoint] += 1
+        await asyncio.sleep(delay / 1000.0)
+        if failed:
+            self.errors[endpoint] += 1
+            if service == "pixabay" and profile.error_status == 429:
+                return PlainTextResponse("[ERROR 429] Too many requests", status_code=429)
+            return PlainTextResponse(f"[ERROR {profile.error_status}]", status_code=profile.error_status)
+        return None
+
+    def _is_miss(self, service: str, word: str) -> bool:
+        return _word_rng(f"{service}:miss", word).random() < self.profiles[service].miss_rate
+
+    def _definition(self, word: str) -> str:
+        rng = _word_rng("dictionary", word)
+        low, high = self._size_range("dictionary", self.profiles["dictionary"])
+        return " ".join(rng.choice(_DEFINITION_WORDS) for _ in range(rng.randint(low, high))).capitalize() + "."
+
+    def _entry(self, word: str, sense: int = 1) -> dict:
+        xml = (f'<entry id="{word}:{sense}" type="hom"><form><orth>{word}</orth></form>'
+               f'<sense ast="1"><gramGrp>s. f.</gramGrp><def>{self._definition(word)}</def></sense></entry>')
+        word_id = _word_rng("dictionary:id", word).randint(1, 10**6)
+        return {"word_id": word_id, "sense": sense, "word": word, "xml": xml, "preview": None,
+                "deleted": 0, "creator": "fake", "moderator": None, "timestamp": "2024-01-01 00:00:00"}
+
+    def _hits(self, request: Request, word: str, per_page: int) -> list:
+        rng = _word_rng("pixabay", word)
+        low, high = self._size_range("pixabay", self.profiles["pixabay"])
+        base = str(request.base_url).rstrip("/")
+        hits = []
+        for _ in range(min(per_page, rng.randint(low, high))):
+            image_id = rng.randint(10**5, 10**7)
+            width = rng.choice((640, 1280, 1920))
+            height = int(width * rng.uniform(0.5, 1.0))
+            image_url = f"{base}/pixabay/images/{image_id}"
+            hits.append({
+                "id": image_id, "pageURL": f"{base}/pixabay/photos/{word}-{image_id}/", "type": "photo",
+                "tags": f"{word}, exemplo", "previewURL": f"{image_url}_150.png", "previewWidth": 150,
+                "previewHeight": int(150 * height / width), "webformatURL": f"{image_url}_640.png",
+                "webformatWidth": 640, "webformatHeight": int(640 * height / width),
+                "largeImageURL": f"{image_url}_1280.png", "imageWidth": width, "imageHeight": height,
+                "imageSize": width * height // 4, "views": rng.randint(0, 10**5), "downloads": rng.randint(0, 10**4),
+                "collections": 0, "likes": rng.randint(0, 500), "comments": rng.randint(0, 50),
+                "user_id": rng.randint(1, 10**6), "user": "fake", "userImageURL": "",
+            })
+        return hits
+
+    def _build_app(self) -> FastAPI:
+        app = FastAPI(title="Servidores locais (dicionario-aberto, Pixabay, gTTS)")
+
+        @app.get("/dicionario/word/{word}")
+        async def dictionary_word(word: str):
+            error = await self._simulate("dictionary", "dictionary.word")
+            if error:
+                return error
+            return JSONResponse([] if self._is_miss("dictionary", word) else [self._entry(word)])
+
+        @app.get("/dicionario/near/{word}")
+        async def dictionary_near(word: str):
+            error = await self._simulate("dictionary", "dictionary.near")
+            if error:
+                return error
+            rng = _word_rng("dictionary:near", word)
+            return JSONResponse([word[:-1] + suffix for suffix in rng.sample(["a", "o", "as", "os", "ar"], 3)])
+
+        @app.get("/pixabay/api/")
+        async def pixabay_search(request: Request, q: str = "", key: str = "", per_page: int = 20):
+            error = await self._simulate("pixabay", "pixabay.search")
+            if error:
+                return error
+            if not key:
+                return PlainTextResponse("[ERROR 400] Invalid or missing API key (key).", status_code=400)
+            hits = [] if self._is_miss("pixabay", q) else self._hits(request, q, max(3, min(per_page, 200)))
+            return JSONResponse({"total": len(hits) * 17, "totalHits": len(hits), "hits": hits})
+
+        @app.get("/pixabay/images/{image_id}_{variant}.png")
+        async def pixabay_image(image_id: int, variant: int):
+            error = await self._simulate("pixabay", "pixabay.image")
+            if error:
+                return error
+            rng = _word_rng("image", str(image_id))
+            low, high = _DEFAULT_SIZES["image"]
+            side = min(variant, rng.randint(low, high))
+            color = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+            return Response(_png(side, max(1, int(side * 0.75)), color), media_type="image/png")
+
+        @app.post("/tts/_/TranslateWebserverUi/data/batchexecute")
+        async def tts_rpc(request: Request):
+            error = await self._simulate("tts", "tts.rpc")
+            if error:
+                return error
+            form = urllib.parse.parse_qs((await request.body()).decode("utf-8"))
+            text, lang = json.loads(json.loads(form["f.req"][0])[0][0][1])[:2]
+            rng = _word_rng("tts", f"{lang}:{text}")
+            low, high = self._size_range("tts", self.profiles["tts"])
+            audio = b"ID3\x04\x00\x00\x00\x00\x00\x00" + rng.randbytes(rng.randint(low, high) * 1024)
+            encoded = base64.b64encode(audio).decode("ascii")
+            # Mesmo envelope do batchexecute: prefixo anti-XSSI e o mp3 em base64 dentro de uma string JSON
+            line = json.dumps([["wrb.fr", "jQ1olc", json.dumps([encoded]), None, None, None, "generic"]], separators=(",", ":"))
+            return PlainTextResponse(f")]}}'\n\n{len(line)}\n{line}\n", media_type="application/json")
+
+        @app.get("/__stats")
+        async def stats():
+            return {"requests": dict(self.requests), "errors": dict(self.errors)}
+
+        return app
+
+    def env(self, base_url: str) -> Dict[str, str]:
+        """Variáveis de ambiente que apontam a aplicação para estes servidores."""
+        base_url = base_url.rstrip("/")
+        return {
+            "DICTIONARY_API_BASE_URL": f"{base_url}/dicionario",
+            "PIXABAY_API_URL": f"{base_url}/pixabay/api/",
+            "PIXABAY_API_KEY": "fake",
+            "TTS_BASE_URL": f"{base_url}/tts",
+        }
+
+
+class BackgroundServer:
+    """Sobe uma aplicação ASGI com uvicorn numa thread; use como context manager."""
+
+    def __init__(self, app, host: str = "127.0.0.1", port: int = 8765, name: str = "background-server"):
+        import uvicorn
+        self.base_url = f"http://{host}:{port}"
+        self.name = name
+        self._server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.run, name=self.name, daemon=True)
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError(f"Servidor {self.name} não iniciou.")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.should_exit = True
+        if self._thread:
+            self._thread.join(timeout=10)
+
+
+class FakeUpstreamServer(BackgroundServer):
+    """`FakeUpstreams` rodando numa thread."""
+
+    def __init__(self, upstreams: Optional[FakeUpstreams] = None, host: str = "127.0.0.1", port: int = 8765):
+        self.upstreams = upstreams or FakeUpstreams()
+        super().__init__(self.upstreams.app, host=host, port=port, name="fake-upstreams")
+
+    def env(self) -> Dict[str, str]:
+        return self.upstreams.env(self.base_url)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Servidores locais no lugar de dicionario-aberto, Pixabay e gTTS")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Mediana da latência (todos os serviços)")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Dispersão log-normal da latência")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--miss-rate", type=float, default=0.1)
+    for service in SERVICES:
+        parser.add_argument(f"--{service}", metavar="CAMPO=VALOR,...", help=f"Sobreposições do perfil de {service}")
+    args = parser.parse_args()
+
+    base_profile = UpstreamProfile(latency_ms=args.latency_ms, latency_sigma=args.latency_sigma,
+                                   error_rate=args.error_rate, miss_rate=args.miss_rate)
+    profiles = {service: base_profile.with_overrides(getattr(args, service)) for service in SERVICES}
+    upstreams = FakeUpstreams(profiles, seed=args.seed)
+    for name, value in upstreams.env(f"http://{args.host}:{args.port}").items():
+        print(f"{name}={value}")
+
+    import uvicorn
+    uvicorn.run(upstreams.app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
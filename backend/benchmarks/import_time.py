@@ -0,0 +1,99 @@
+# backend/benchmarks/import_time.py
+"""
+Benchmark de tempo de importação (cold start dos workers uvicorn).
+
+Executa `python -X importtime -c "import <módulo>"` em um subprocesso, soma o tempo
+cumulativo do módulo alvo e compara com o orçamento. Antes da medição, uma importação
+sem medição grava o bytecode do projeto (como nos workers já implantados): o resultado
+não depende de o código ter acabado de ser alterado. Também falha se bibliotecas
+pesadas (que devem ser carregadas apenas no primeiro uso) aparecerem no grafo de importação.
+
+Uso (a partir da raiz do projeto):
+    python -m backend.benchmarks.import_time [--module backend.app.main] [--budget-ms 1500] [--top 15]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Orçamento padrão para importar a aplicação completa (ms). Importação limpa de
+# backend.app.main (sem stubs, bytecode gravado): ~950 ms; sem bytecode, ~1450 ms.
+IMPORT_TIME_BUDGET_MS = 1500.0
+
+# Dependências pesadas que não podem ser importadas no caminho de inicialização
+LAZY_ONLY_MODULES = ("nltk", "textstat", "pandas", "sklearn", "joblib", "gtts", "numpy")
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+def measure_import(module: str) -> Tuple[Dict[str, float], List[Tuple[str, float, float]], str]:
+    """
+    Retorna (cumulativo por módulo em ms, linhas (módulo, self_ms, cumulativo_ms), stderr bruto).
+    """
+    # Importação preliminar: compila e grava o bytecode, que a medição reaproveita
+    warmup = subprocess.run([sys.executable, "-c", f"import {module}"], cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if warmup.returncode != 0:
+        raise RuntimeError(f"Falha ao importar '{module}':\n{warmup.stderr[-2000:]}")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    cumulative: Dict[str, float] = {}
+    rows: List[Tuple[str, float, float]] = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            name = name.strip()
+            self_ms = int(self_us) / 1000.0
+            cumulative_ms = int(cumulative_us) / 1000.0
+        except ValueError:
+            continue
+        rows.append((name, self_ms, cumulative_ms))
+        cumulative[name] = max(cumulative.get(name, 0.0), cumulative_ms)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Falha ao importar '{module}':\n{completed.stderr[-2000:]}")
+    return cumulative, rows, completed.stderr
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Orçamento de tempo de importação (python -X importtime)")
+    parser.add_argument("--module", default="backend.app.main", help="Módulo a importar")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_TIME_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15, help="Quantidade de módulos mais lentos a exibir")
+    args = parser.parse_args()
+
+    try:
+        cumulative, rows, _ = measure_import(args.module)
+    except RuntimeError as e:
+        print(e)
+        return 2
+
+    total_ms = cumulative.get(args.module, 0.0)
+    print(f"Importação de '{args.module}': {total_ms:.1f} ms (orçamento: {args.budget_ms:.0f} ms)")
+
+    # Considera apenas pacotes de primeiro nível para o ranking (o cumulativo já inclui os submódulos)
+    top_level = [row for row in rows if "." not in row[0].strip()]
+    print(f"\nTop {args.top} pacotes por tempo cumulativo:")
+    for name, _, cumulative_ms in sorted(top_level, key=lambda row: row[2], reverse=True)[:args.top]:
+        print(f"  {cumulative_ms:9.1f} ms  {name}")
+
+    eager_heavy = sorted(name for name in cumulative if name.split(".")[0] in LAZY_ONLY_MODULES and "." not in name)
+    failed = False
+    if eager_heavy:
+        print(f"\nERRO: módulos pesados importados na inicialização: {', '.join(eager_heavy)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"\nERRO: orçamento de importação excedido em {total_ms - args.budget_ms:.1f} ms")
+        failed = True
+    if not failed:
+        print("\nOK: dentro do orçamento.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+# backend/benchmarks/load_learning_loop.py
+"""
+Teste de carga ponta a ponta do ciclo de aprendizado.
+
+N alunos simultâneos fazem: cadastro → login → (/next_exercise/ → dados do exercício →
+/submit_exercise_result/ → relatório de progresso) × E exercícios.
+
+Por padrão, sobe tudo localmente: os servidores substitutos das APIs externas
+(fake_upstreams), um banco SQLite temporário com palavras mestras semeadas e a aplicação
+com uvicorn numa thread. Nesse modo, o motor do SQLAlchemy é instrumentado para medir o
+tempo das escritas e dos commits no SQLite (sob concorrência, dominado pela espera do lock
+do banco) e os erros "database is locked". Com --base-url, roda contra uma instância já
+em execução (sem as métricas do SQLite).
+
+Relata p50/p95/p99 por endpoint, vazão e as métricas do SQLite, e grava tudo em JSON
+(backend/benchmarks/results/ por padrão) para comparar execuções entre commits. Uma
+execução que não percorreu o ciclo (alguma etapa com erros ou que nunca rodou, ou nenhum
+exercício submetido) não é uma linha de base: o script falha (código 1) sem gravar o JSON.
+Os áudios gerados durante o teste vão para o diretório estático configurado da aplicação.
+
+Uso (a partir da raiz do projeto):
+    python -m backend.benchmarks.load_learning_loop [--students 20] [--exercises 5]
+        [--upstream-latency-ms 50] [--upstream-error-rate 0.0] [--output resultados.json]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from backend.benchmarks.fake_upstreams import (
+    SERVICES, BackgroundServer, FakeUpstreamServer, FakeUpstreams, UpstreamProfile,
+)
+from backend.benchmarks.reporting import latency_summary, run_metadata, write_results
+from backend.benchmarks.word_lists import generate_word_list
+
+# Endpoint com os dados de cada tipo de exercício (o ditado usa apenas a informação da palavra)
+PAYLOAD_PATHS = {
+    "MCQ_definition": "/api/v1/exercises/multiple_choice/{word}",
+    "MCQ_image": "/api/v1/exercises/multiple_choice_image/{word}",
+    "define_word": "/api/v1/exercises/define_word/{word}",
+    "complete_sentence": "/api/v1/exercises/complete_sentence/{word}",
+}
+# Etapas que toda execução válida precisa percorrer (dados do exercício e informação da
+# palavra dependem do tipo sorteado e do prefetch, então podem não aparecer)
+LOOP_STAGES = ("signup", "login", "next_exercise", "submit_exercise_result", "progress_report")
+
+
+class RequestRecorder:
+    """Latência e status por rótulo de endpoint."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+
+    async def call(self, label: str, request) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError as e:
+            self.latencies[label].append(time.perf_counter() - start)
+            self.statuses[label][type(e).__name__] += 1
+            return None
+        self.latencies[label].append(time.perf_counter() - start)
+        self.statuses[label][str(response.status_code)] += 1
+        return response
+
+    def summary(self, wall_s: float) -> Dict[str, Any]:
+        endpoints = {}
+        for label, samples in sorted(self.latencies.items()):
+            statuses = self.statuses[label]
+            errors = sum(count for status, count in statuses.items() if not status.startswith(("2", "3")))
+            endpoints[label] = {
+                **latency_summary(samples),
+                "throughput_rps": len(samples) / wall_s if wall_s else 0.0,
+                "errors": errors,
+                "statuses": dict(statuses),
+            }
+        return endpoints
+
+
+class SQLiteWriteTimer:
+    """Tempo das escritas (INSERT/UPDATE/DELETE) e dos commits no motor do SQLAlchemy."""
+
+    WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.write_samples: List[float] = []
+        self.commit_samples: List[float] = []
+        self.locked_errors = 0
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+
+        # O commit do DBAPI (onde o SQLite espera o lock exclusivo) não tem evento "depois"
+        do_commit = engine.dialect.do_commit
+
+        def timed_commit(dbapi_connection):
+            start = time.perf_counter()
+            try:
+                do_commit(dbapi_connection)
+            finally:
+                self.commit_samples.append(time.perf_counter() - start)
+
+        engine.dialect.do_commit = timed_commit
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(self.WRITE_PREFIXES):
+            context._bench_write_start = time.perf_counter()
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_bench_write_start", None)
+        if start is not None:
+            self.write_samples.append(time.perf_counter() - start)
+
+    def _handle_error(self, exception_context):
+        if "database is locked" in str(exception_context.original_exception):
+            self.locked_errors += 1
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "write_statements": latency_summary(self.write_samples),
+            "commits": latency_summary(self.commit_samples),
+            "total_write_wait_s": sum(self.write_samples) + sum(self.commit_samples),
+            "locked_errors": self.locked_errors,
+        }
+
+
+async def run_student(client: httpx.AsyncClient, recorder: RequestRecorder, student: int, run_id: str,
+                      exercises: int, think_ms: float, seed: int) -> int:
+    """Executa o ciclo de um aluno; retorna quantos exercícios foram submetidos."""
+    rng = random.Random(seed * 100003 + student)
+    username, password = f"aluno{student}{run_id}", "senha-de-carga"
+    await recorder.call("signup", client.post("/api/v1/users/", json={"username": username, "password": password}))
+    response = await recorder.call("login", client.post("/api/v1/auth/token", data={"username": username, "password": password}))
+    if response is None or response.status_code != 200:
+        return 0
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    prefetched: Dict[str, Dict[str, Any]] = {}
+    submitted = 0
+    for _ in range(exercises):
+        response = await recorder.call("next_exercise", client.get("/api/v1/exercises/next_exercise/", headers=headers))
+        if response is None or response.status_code != 200 or not response.json().get("suggested_word_text"):
+            break
+        suggestion = response.json()
+        word, exercise_type = suggestion["suggested_word_text"], suggestion["suggested_exercise_type"]
+
+        payload_path = PAYLOAD_PATHS.get(exercise_type)
+        if payload_path:
+            await recorder.call("exercise_payload", client.get(payload_path.format(word=word), headers=headers))
+
+        # Mesmo comportamento do cliente: usa a informação pré-carregada, se houver
+        word_info = (prefetched.get(word) or {}).get("word_info")
+        if not word_info:
+            response = await recorder.call("word_info", client.get(f"/api/v1/words/word/{word}"))
+            word_info = response.json() if response is not None and response.status_code == 200 else None
+        prefetched = {hint["word_text"]: hint for hint in suggestion.get("prefetch", [])}
+        if not word_info:
+            continue
+
+        await asyncio.sleep(rng.uniform(0, think_ms) / 1000.0)
+        submission = {
+            "word_text": word,
+            "exercise_type": exercise_type,
+            "accuracy": 1.0 if rng.random() < 0.7 else 0.0,
+            "time_taken_seconds": round(rng.lognormvariate(2.0, 0.5), 2),
+            "word_complexity_score": word_info["inferred_complexity_score"],
+            "complexity_metrics": word_info["complexity_metrics"],
+        }
+        response = await recorder.call("submit_exercise_result", client.post("/api/v1/exercises/submit_exercise_result/", json=submission, headers=headers))
+        if response is not None and response.status_code == 200:
+            submitted += 1
+        await recorder.call("progress_report", client.get("/api/v1/progress/me/report/", headers=headers))
+    return submitted
+
+
+async def run_load(base_url: str, students: int, exercises: int, think_ms: float, seed: int) -> Dict[str, Any]:
+    recorder = RequestRecorder()
+    run_id = str(int(time.time()))
+    limits = httpx.Limits(max_connections=students, max_keepalive_connections=students)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        start = time.perf_counter()
+        submitted = await asyncio.gather(*(
+            run_student(client, recorder, student, run_id, exercises, think_ms, seed) for student in range(students)
+        ))
+        wall_s = time.perf_counter() - start
+    endpoints = recorder.summary(wall_s)
+    total_requests = sum(len(samples) for samples in recorder.latencies.values())
+    return {
+        "wall_time_s": wall_s,
+        "total_requests": total_requests,
+        "throughput_rps": total_requests / wall_s if wall_s else 0.0,
+        "exercises_submitted": sum(submitted),
+        "exercises_per_second": sum(submitted) / wall_s if wall_s else 0.0,
+        "endpoints": endpoints,
+    }
+
+
+def seed_master_words(count: int, seed: int) -> int:
+    """Cria as tabelas e insere `count` palavras mestras (pool de palavras novas da seleção)."""
+    from backend.app import models
+    from backend.app.database import SessionLocal
+    from backend.app.setup_commands import init_db
+
+    init_db()
+    rng = random.Random(seed)
+    words = [word for word in dict.fromkeys(generate_word_list(count * 20, seed)) if word.isalpha() and 2 <= len(word) <= 30][:count]
+    db = SessionLocal()
+    try:
+        db.add_all(models.MasterWord(
+            word_text=word,
+            composite_score=rng.uniform(1.0, 9.0),
+            syntactic_complexity=rng.uniform(0.0, 1.0),
+            semantic_abstraction=rng.uniform(0.0, 1.0),
+            morphological_density=rng.uniform(0.0, 1.0),
+        ) for word in words)
+        db.commit()
+    finally:
+        db.close()
+    return len(words)
+
+
+def loop_problems(load: Dict[str, Any]) -> List[str]:
+    """Motivos pelos quais a execução não percorreu o ciclo de aprendizado (vazio se percorreu)."""
+    endpoints = load["endpoints"]
+    problems = [f"etapa '{stage}' nunca rodou" for stage in LOOP_STAGES if not endpoints.get(stage, {}).get("count")]
+    problems += [
+        f"etapa '{label}' com {stats['errors']} erro(s) {stats['statuses']}"
+        for label, stats in endpoints.items() if stats["errors"]
+    ]
+    if not load["exercises_submitted"]:
+        problems.append("nenhum exercício submetido")
+    return problems
+
+
+def print_report(results: Dict[str, Any]) -> None:
+    load = results["load"]
+    print(f"\n{load['total_requests']} requisições em {load['wall_time_s']:.1f} s "
+          f"({load['throughput_rps']:.1f} req/s, {load['exercises_per_second']:.2f} exercícios/s)")
+    print(f"{'endpoint':24s} {'n':>6s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'erros':>6s}")
+    for label, stats in load["endpoints"].items():
+        print(f"{label:24s} {stats['count']:6d} {stats['p50_ms']:9.1f} {stats['p95_ms']:9.1f} "
+              f"{stats['p99_ms']:9.1f} {stats['errors']:6d}")
+    sqlite = results.get("sqlite")
+    if sqlite:
+        print(f"SQLite: escritas p95 {sqlite['write_statements']['p95_ms']:.1f} ms, "
+              f"commits p95 {sqlite['commits']['p95_ms']:.1f} ms, "
+              f"tempo total em escrita/commit {sqlite['total_write_wait_s']:.2f} s, "
+              f"'database is locked': {sqlite['locked_errors']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Teste de carga ponta a ponta do ciclo de aprendizado")
+    parser.add_argument("--students", type=int, default=20, help="Alunos simultâneos")
+    parser.add_argument("--exercises", type=int, default=5, help="Exercícios por aluno")
+    parser.add_argument("--think-ms", type=float, default=200.0, help="Tempo máximo de \"resolução\" entre dados e submissão")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--base-url", help="Instância já em execução (sem métricas do SQLite)")
+    parser.add_argument("--port", type=int, default=8790, help="Porta da aplicação local")
+    parser.add_argument("--upstream-port", type=int, default=8791)
+    parser.add_argument("--upstream-latency-ms", type=float, default=50.0)
+    parser.add_argument("--upstream-error-rate", type=float, default=0.0)
+    for service in SERVICES:
+        parser.add_argument(f"--{service}", metavar="CAMPO=VALOR,...", help=f"Sobreposições do perfil de {service}")
+    parser.add_argument("--master-words", type=int, default=300)
+    parser.add_argument("--bcrypt-rounds", type=int, default=None, help="Custo do bcrypt na aplicação local")
+    parser.add_argument("--output", help="Arquivo JSON de resultados")
+    args = parser.parse_args()
+
+    results: Dict[str, Any] = {"meta": run_metadata("load_learning_loop", vars(args))}
+    if args.base_url:
+        results["load"] = asyncio.run(run_load(args.base_url, args.students, args.exercises, args.think_ms, args.seed))
+    else:
+        base_profile = UpstreamProfile(latency_ms=args.upstream_latency_ms, error_rate=args.upstream_error_rate)
+        upstreams = FakeUpstreams({service: base_profile.with_overrides(getattr(args, service)) for service in SERVICES}, seed=args.seed)
+        with FakeUpstreamServer(upstreams, port=args.upstream_port) as upstream_server, tempfile.TemporaryDirectory() as tmp:
+            # A configuração é lida na importação: o ambiente precisa estar pronto antes de importar a aplicação
+            os.environ.update(upstream_server.env())
+            os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'carga.db')}"
+            os.environ.setdefault("PASSWORD_HASH_MAX_PENDING", str(max(64, args.students)))
+            if args.bcrypt_rounds:
+                os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+            print(f"Palavras mestras semeadas: {seed_master_words(args.master_words, args.seed)}")
+
+            from backend.app.database import engine
+            from backend.app.main import app
+
+            sqlite_timer = SQLiteWriteTimer(engine)
+            with BackgroundServer(app, port=args.port, name="app") as app_server:
+                results["load"] = asyncio.run(run_load(app_server.base_url, args.students, args.exercises, args.think_ms, args.seed))
+            results["sqlite"] = sqlite_timer.summary()
+            results["upstreams"] = {"requests": dict(upstreams.requests), "errors": dict(upstreams.errors)}
+            engine.dispose()
+
+    print_report(results)
+    problems = loop_problems(results["load"])
+    if problems:
+        print(f"\nERRO: o ciclo de aprendizado não foi percorrido ({'; '.join(problems)}); resultados não gravados.")
+        return 1
+    print(f"\nResultados gravados em {write_results(results, args.output, 'load_learning_loop')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
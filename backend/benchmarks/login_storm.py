@@ -0,0 +1,83 @@
+# backend/benchmarks/login_storm.py
+"""
+Benchmark de "tempestade de logins": N alunos fazendo login ao mesmo tempo.
+
+Compara a verificação bcrypt síncrona no event loop (comportamento antigo de
+`crud.authenticate_user` dentro do endpoint async) com a verificação no executor
+dedicado (`security.verify_and_update_password`). Em paralelo, uma tarefa "heartbeat"
+simula as demais requisições e mede o maior atraso do event loop.
+
+Uso (a partir da raiz do projeto):
+    python -m backend.benchmarks.login_storm [--logins 30] [--rounds 12]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+HEARTBEAT_INTERVAL_S = 0.005
+
+
+async def _heartbeat(stop: asyncio.Event, lags: list) -> None:
+    while not stop.is_set():
+        expected = time.perf_counter() + HEARTBEAT_INTERVAL_S
+        await asyncio.sleep(HEARTBEAT_INTERVAL_S)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def _storm(login, logins: int):
+    stop = asyncio.Event()
+    lags: list = []
+    heartbeat = asyncio.create_task(_heartbeat(stop, lags))
+    await asyncio.sleep(HEARTBEAT_INTERVAL_S * 2)
+    start = time.perf_counter()
+    results = await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await heartbeat
+    return elapsed, max(lags, default=0.0), results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark: pico de logins simultâneos")
+    parser.add_argument("--logins", type=int, default=30)
+    parser.add_argument("--rounds", type=int, default=12, help="Custo do bcrypt (BCRYPT_ROUNDS)")
+    parser.add_argument("--max-lag-ms", type=float, default=50.0, help="Atraso máximo aceito do event loop no modo executor")
+    args = parser.parse_args()
+
+    # O custo precisa estar no ambiente antes de importar a configuração
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    os.environ.setdefault("PASSWORD_HASH_MAX_PENDING", str(max(64, args.logins)))
+    from backend.app.core import security
+
+    password = "senha-de-teste"
+    hashed = security.get_password_hash(password)
+
+    async def blocking_login():
+        return security.verify_password(password, hashed)
+
+    async def offloaded_login():
+        valid, _ = await security.verify_and_update_password(password, hashed)
+        return valid
+
+    print(f"{args.logins} logins simultâneos, bcrypt rounds={args.rounds}, "
+          f"workers={security.PASSWORD_HASH_WORKERS}")
+    failed = False
+    for label, login in (("síncrono (antigo)", blocking_login), ("executor dedicado", offloaded_login)):
+        elapsed, max_lag, results = asyncio.run(_storm(login, args.logins))
+        if not all(results):
+            print(f"ERRO: verificação falhou no modo {label}.")
+            failed = True
+        print(f"{label:18s} total: {elapsed * 1000:8.1f} ms | "
+              f"maior atraso do event loop: {max_lag * 1000:8.1f} ms")
+        if login is offloaded_login and max_lag * 1000 > args.max_lag_ms:
+            print(f"ERRO: event loop bloqueado por mais de {args.max_lag_ms:.0f} ms com o executor.")
+            failed = True
+    if not failed:
+        print("OK: logins não bloqueiam o event loop.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+# backend/benchmarks/microbench.py
+"""
+Microbenchmarks da seleção, do scoring e da análise de complexidade, com limites de regressão.
+
+Casos medidos (µs por operação):
+- complexity.infer_word_complexity_metrics: por palavra, sobre uma lista de palavras
+- scoring.<método>: cada método do ScoringService, por candidato
+- selection.select_next_exercise[N]: por chamada, para usuários com N registros de histórico
+- crud.get_user_progress_report_data[N]: por chamada, para os mesmos usuários
+
+A seleção e o relatório rodam contra um banco SQLite temporário semeado com palavras
+mestras e usuários com 10/100/10000 registros de UserProgress (configurável). A informação
+das palavras vem de um serviço pré-calculado pelo WordComplexityAnalyzer (equivalente a
+um cache quente), para medir só a seleção, sem rede.
+
+Os limites ficam em backend/benchmarks/thresholds.json: o script falha (código 1) se algum
+caso ficar mais lento que baseline_us * max_ratio. Os baselines dependem da máquina;
+--update-baseline regrava o arquivo com as medições atuais.
+
+Uso (a partir da raiz do projeto):
+    python -m backend.benchmarks.microbench [--history-sizes 10,100,10000] [--only selection]
+        [--update-baseline] [--output resultados.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.benchmarks.reporting import run_metadata, write_results
+from backend.benchmarks.word_lists import generate_word_list
+
+THRESHOLDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thresholds.json")
+DEFAULT_MAX_RATIO = 2.0
+EXERCISE_TYPES = ('MCQ_definition', 'dictation', 'MCQ_image', 'define_word', 'complete_sentence')
+
+
+def measure(func: Callable[[], Any], operations: int, repeats: int, min_time_s: float) -> float:
+    """Melhor tempo por operação (µs) entre `repeats` rodadas de pelo menos `min_time_s` cada."""
+    start = time.perf_counter()
+    func()  # Aquecimento e calibração do número de chamadas por rodada
+    elapsed = time.perf_counter() - start
+    number = max(1, int(min_time_s / elapsed)) if elapsed > 0 else 1000
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best / operations * 1e6
+
+
+class PrecomputedWordInfoService:
+    """Substituto do WordInfoService com as métricas de complexidade já calculadas (cache quente)."""
+
+    def __init__(self, analyzer, words: List[str]):
+        batch = analyzer.infer_batch(words)
+        # Mesmo formato de WordInfoService._get_word_info_data_internal (dicionário com as métricas do analisador)
+        self._word_info = {
+            word: {
+                'text': word,
+                'definition': f"Definição de {word}.",
+                'image_url': f"https://example.invalid/{word}.jpg",
+                'complexity_metrics': batch.to_metrics(index),
+            }
+            for index, word in enumerate(words)
+        }
+
+    async def _get_word_info_data_internal(self, word_text: str):
+        return self._word_info.get(word_text)
+
+
+def seed_database(history_sizes: List[int], vocabulary: List[str], seed: int) -> Dict[int, int]:
+    """Cria as tabelas, as palavras mestras e um usuário por tamanho de histórico. Retorna {tamanho: user_id}."""
+    from backend.app import models
+    from backend.app.database import SessionLocal
+    from backend.app.setup_commands import init_db
+
+    init_db()
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    users = {}
+    db = SessionLocal()
+    try:
+        db.add_all(models.MasterWord(
+            word_text=word,
+            composite_score=rng.uniform(1.0, 9.0),
+            syntactic_complexity=rng.uniform(0.0, 1.0),
+            semantic_abstraction=rng.uniform(0.0, 1.0),
+            morphological_density=rng.uniform(0.0, 1.0),
+        ) for word in vocabulary)
+        for size in history_sizes:
+            user = models.User(username=f"bench_{size}", hashed_password="-")
+            db.add(user)
+            db.flush()
+            users[size] = user.id
+            # Cada palavra aparece nos cinco tipos de exercício (chave composta usuário, palavra, tipo)
+            pairs = [(word, exercise_type) for word in vocabulary for exercise_type in EXERCISE_TYPES][:size]
+            rows = []
+            for word, exercise_type in pairs:
+                total = rng.randint(1, 12)
+                # ~20% dos registros com baixa acurácia ou vencidos para revisão (pool de reforço)
+                needs_review = rng.random() < 0.2
+                correct = rng.randint(0, total // 2 - 1) if needs_review and total >= 2 else total
+                last_seen = now - timedelta(days=rng.uniform(4, 30) if needs_review else rng.uniform(0, 2))
+                rows.append({
+                    "user_id": user.id, "word_text": word, "exercise_type": exercise_type,
+                    "correct_attempts": correct, "total_attempts": total,
+                    "average_time_seconds": rng.uniform(2.0, 20.0), "last_seen_on_word": last_seen,
+                })
+            db.bulk_insert_mappings(models.UserProgress, rows)
+        db.commit()
+    finally:
+        db.close()
+    return users
+
+
+def build_cases(args, vocabulary: List[str], words: List[str]) -> Dict[str, Callable[[], float]]:
+    """Casos de benchmark: nome -> função que mede e devolve µs por operação."""
+    from backend.app import schemas
+    from backend.app.crud import (
+        create_initial_cognitive_state, get_user_cognitive_state, get_user_progress_list, get_user_progress_report_data,
+    )
+    from backend.app.database import SessionLocal
+    from backend.app.services.exercise_selection_service import ExerciseSelectionService, exercise_difficulty
+    from backend.app.services.scoring_service import ScoringService
+    from backend.app.services.word_complexity_analyzer import WordComplexityAnalyzer
+
+    analyzer = WordComplexityAnalyzer()
+    word_info_service = PrecomputedWordInfoService(analyzer, vocabulary)
+    users = seed_database(args.history_sizes, vocabulary, args.seed)
+    db = SessionLocal()
+    loop = asyncio.new_event_loop()
+    run = lambda func, operations: measure(func, operations, args.repeats, args.min_time)
+
+    cases: Dict[str, Callable[[], float]] = {
+        "complexity.infer_word_complexity_metrics":
+            lambda: run(lambda: [analyzer.infer_word_complexity_metrics(word, None) for word in words], len(words)),
+    }
+
+    # Scoring: candidatos de todas as palavras x tipos contra o estado e o histórico do maior usuário
+    scoring_user = users[max(users)]
+    user_state = get_user_cognitive_state(db, scoring_user) or create_initial_cognitive_state(db, scoring_user)
+    user_history = get_user_progress_list(db, scoring_user, limit=20)
+    progress_by_key = {(p.word_text, p.exercise_type): p for p in user_history}
+    candidates = []
+    for word in vocabulary[:200]:
+        metrics = word_info_service._word_info[word]['complexity_metrics']
+        for exercise_type in EXERCISE_TYPES:
+            candidates.append(schemas.ExerciseCandidate(
+                word_text=word, exercise_type=exercise_type,
+                word_complexity_score=metrics.composite_score,
+                complexity_metrics=metrics,
+                difficulty=exercise_difficulty(exercise_type, metrics.composite_score),
+            ))
+    scoring = ScoringService(weights=ExerciseSelectionService(db, analyzer, word_info_service).weights)
+    cases.update({
+        "scoring.calculate_learning_efficiency": lambda: run(lambda: [
+            scoring.calculate_learning_efficiency(c, user_state, progress_by_key.get((c.word_text, c.exercise_type)))
+            for c in candidates], len(candidates)),
+        "scoring.calculate_engagement_factor": lambda: run(lambda: [
+            scoring.calculate_engagement_factor(c, user_history, user_state) for c in candidates], len(candidates)),
+        "scoring.calculate_frustration_risk": lambda: run(lambda: [
+            scoring.calculate_frustration_risk(c, user_history, user_state) for c in candidates], len(candidates)),
+    })
+
+    selection = ExerciseSelectionService(db, analyzer, word_info_service)
+
+    def select_for(user_id: int) -> Callable[[], float]:
+        def call():
+            random.seed(args.seed)  # Amostragem de palavras novas usa o random global
+            return loop.run_until_complete(selection.select_next_exercise(user_id))
+        return lambda: run(call, 1)
+
+    for size, user_id in users.items():
+        cases[f"selection.select_next_exercise[{size}]"] = select_for(user_id)
+        cases[f"crud.get_user_progress_report_data[{size}]"] = (
+            lambda user_id=user_id: run(lambda: get_user_progress_report_data(db, user_id), 1))
+    return cases
+
+
+def check_thresholds(measured: Dict[str, float], thresholds: Dict[str, Any]) -> List[str]:
+    """Casos acima de baseline_us * max_ratio (o max_ratio do caso tem precedência sobre o global)."""
+    failures = []
+    default_ratio = thresholds.get("max_ratio", DEFAULT_MAX_RATIO)
+    for name, value_us in measured.items():
+        case = thresholds.get("cases", {}).get(name)
+        if not case:
+            continue
+        limit_us = case["baseline_us"] * case.get("max_ratio", default_ratio)
+        if value_us > limit_us:
+            failures.append(f"{name}: {value_us:.1f} µs > limite {limit_us:.1f} µs")
+    return failures
+
+
+def load_thresholds(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {"max_ratio": DEFAULT_MAX_RATIO, "cases": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baselines(path: str, thresholds: Dict[str, Any], measured: Dict[str, float]) -> None:
+    cases = thresholds.setdefault("cases", {})
+    for name, value_us in measured.items():
+        cases.setdefault(name, {})["baseline_us"] = round(value_us, 2)
+    thresholds["cases"] = dict(sorted(cases.items()))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(thresholds, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Microbenchmarks de seleção, scoring e complexidade")
+    parser.add_argument("--words", type=int, default=2000, help="Palavras na lista do analisador de complexidade")
+    parser.add_argument("--vocabulary", type=int, default=2000, help="Palavras mestras no banco (limita o maior histórico a 5x)")
+    parser.add_argument("--history-sizes", type=lambda value: [int(v) for v in value.split(",")], default=[10, 100, 10000],
+                        help="Tamanhos do histórico dos usuários semeados (separados por vírgula)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="Duração mínima de cada rodada (s)")
+    parser.add_argument("--only", default=None, help="Roda apenas os casos cujo nome contém este texto")
+    parser.add_argument("--thresholds", default=THRESHOLDS_PATH, help="Arquivo de limites de regressão")
+    parser.add_argument("--update-baseline", action="store_true", help="Regrava os baselines com as medições atuais")
+    parser.add_argument("--output", help="Arquivo JSON de resultados")
+    args = parser.parse_args()
+
+    vocabulary = [word for word in dict.fromkeys(generate_word_list(args.vocabulary * 20, args.seed))
+                  if word.isalpha() and 2 <= len(word) <= 30][:args.vocabulary]
+    words = generate_word_list(args.words, args.seed + 1)
+    thresholds = load_thresholds(args.thresholds)
+
+    measured: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # A configuração é lida na importação: o banco temporário precisa ser definido antes de importar a aplicação
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'microbench.db')}"
+        cases = build_cases(args, vocabulary, words)
+        for name, case in cases.items():
+            if args.only and args.only not in name:
+                continue
+            measured[name] = case()
+            baseline = thresholds.get("cases", {}).get(name, {}).get("baseline_us")
+            ratio = f" | razão: {measured[name] / baseline:.2f}" if baseline else ""
+            print(f"{name:50s} {measured[name]:12.2f} µs/op{ratio}")
+        from backend.app.database import engine
+        engine.dispose()
+
+    results = {"meta": run_metadata("microbench", vars(args)), "cases_us": measured}
+    print(f"\nResultados gravados em {write_results(results, args.output, 'microbench')}")
+    if args.update_baseline:
+        save_baselines(args.thresholds, thresholds, measured)
+        print(f"Baselines atualizados em {args.thresholds}")
+        return 0
+
+    failures = check_thresholds(measured, thresholds)
+    for failure in failures:
+        print(f"ERRO: regressão de desempenho em {failure}")
+    if not failures:
+        print("OK: todos os casos dentro dos limites.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
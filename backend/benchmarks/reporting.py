@@ -0,0 +1,62 @@
+# backend/benchmarks/reporting.py
+"""Estatísticas e gravação em JSON dos resultados dos benchmarks (comparáveis entre commits)."""
+import json
+import os
+import platform
+import subprocess
+import time
+from typing import Any, Dict, Optional, Sequence
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Percentil por posição mais próxima (nearest-rank) de uma lista já ordenada."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(-(-q * len(sorted_values) // 100)))  # ceil(q/100 * n)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def latency_summary(samples_s: Sequence[float]) -> Dict[str, float]:
+    """Resumo em milissegundos: contagem, média, p50/p95/p99 e máximo."""
+    values = sorted(samples_s)
+    count = len(values)
+    return {
+        "count": count,
+        "mean_ms": (sum(values) / count * 1000) if count else 0.0,
+        "p50_ms": percentile(values, 50) * 1000,
+        "p95_ms": percentile(values, 95) * 1000,
+        "p99_ms": percentile(values, 99) * 1000,
+        "max_ms": (values[-1] * 1000) if count else 0.0,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_metadata(name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "benchmark": name,
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": parameters,
+    }
+
+
+def write_results(results: Dict[str, Any], output: Optional[str], name: str) -> str:
+    """Grava o JSON (por padrão em backend/benchmarks/results/<nome>-<commit>-<hora>.json) e retorna o caminho."""
+    if not output:
+        meta = results.get("meta", {})
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{name}-{meta.get('commit') or 'local'}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    return output
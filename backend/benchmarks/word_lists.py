@@ -0,0 +1,26 @@
+# backend/benchmarks/word_lists.py
+"""Geração determinística de listas de palavras pseudo-portuguesas para os benchmarks."""
+import random
+from typing import List
+
+_ONSETS = ["", "b", "c", "d", "f", "g", "l", "m", "n", "p", "r", "s", "t", "v",
+           "ch", "lh", "nh", "br", "cr", "pr", "tr", "gr", "pl", "cl", "qu", "gu"]
+_NUCLEI = ["a", "e", "i", "o", "u", "á", "é", "í", "ó", "ú", "â", "ê", "ô",
+           "ai", "ei", "oi", "au", "eu", "ou", "ão", "õe"]
+_CODAS = ["", "", "", "r", "s", "l", "n", "m"]
+_SUFFIXES = ["", "", "ção", "mente", "dade", "ismo", "ista", "oso", "ável", "izar"]
+_PREFIXES = ["", "", "", "des", "re", "in", "pre", "super", "trans", "contra"]
+
+
+def generate_word_list(size: int = 50000, seed: int = 42) -> List[str]:
+    """Gera `size` palavras (com repetições, como em um corpus real) a partir de um inventário silábico."""
+    rng = random.Random(seed)
+    vocabulary_size = max(1, size // 5)
+    vocabulary = []
+    for _ in range(vocabulary_size):
+        syllables = [rng.choice(_ONSETS) + rng.choice(_NUCLEI) + rng.choice(_CODAS)
+                     for _ in range(rng.randint(1, 5))]
+        vocabulary.append(rng.choice(_PREFIXES) + "".join(syllables) + rng.choice(_SUFFIXES))
+    # Distribuição com cauda longa: poucas palavras muito frequentes, muitas raras
+    weights = [1.0 / (rank + 1) for rank in range(vocabulary_size)]
+    return rng.choices(vocabulary, weights=weights, k=size)